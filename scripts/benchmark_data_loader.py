@@ -0,0 +1,514 @@
+"""
+Benchmark and equivalence check for the vectorized data_loader stages and
+filter helpers.
+
+Runs each vectorized stage and the loop-based implementation it replaced on
+synthetic data, checks that the outputs are identical (values, dtypes, row
+order and index) and reports the speedup.
+
+Usage:
+    python scripts/benchmark_data_loader.py [--scale 10] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from data_loader import (
+    add_scenario_continuity,
+    blackfill_not_established_status,
+    distinct_count_per_group,
+    fill_inactive_status,
+    transpose_gp_data,
+)
+from helpers.dtype_optimizer import optimize_dtypes
+from helpers.geocode_locations import add_coordinates_from_cache
+from helpers.gp_membership import (
+    INSTRUMENTS,
+    OBJECTIVES,
+    attribute_counts,
+    encode_membership,
+    is_yes,
+)
+from helpers.option_catalog import option_catalog
+from helpers.row_selection import RowSelection
+from helpers.token_index import apply_multi_value_filter
+
+
+# ---------------------------------------------------------------------------
+# Former loop-based implementations
+# ---------------------------------------------------------------------------
+
+
+def legacy_scenario_continuity(df):
+    """Per-citation / per-scenario loop formerly in load_energyprojections_data."""
+    df_continuous = []
+
+    for citation in df["citation"].unique():
+        citation_data = df[df["citation"] == citation].copy()
+
+        historical_data = citation_data[citation_data["label"] == "Historical"].copy()
+
+        if not historical_data.empty:
+            valid_historical = historical_data[historical_data["energy_demand"].notna()]
+            if not valid_historical.empty:
+                last_historical = valid_historical.loc[
+                    valid_historical["year"].idxmax()
+                ].copy()
+            else:
+                continue
+
+            scenario_labels = citation_data[citation_data["label"] != "Historical"][
+                "label"
+            ].unique()
+
+            for scenario in scenario_labels:
+                scenario_data = citation_data[citation_data["label"] == scenario].copy()
+
+                if not scenario_data.empty:
+                    if last_historical["year"] not in scenario_data["year"].values:
+                        continuity_point = last_historical.copy()
+                        continuity_point["label"] = scenario
+
+                        scenario_data = pd.concat(
+                            [pd.DataFrame([continuity_point]), scenario_data],
+                            ignore_index=True,
+                        )
+                        scenario_data = scenario_data.sort_values("year")
+
+                    df_continuous.append(scenario_data)
+
+        df_continuous.append(historical_data)
+
+        non_historical_citations = citation_data[citation_data["label"] != "Historical"]
+        if historical_data.empty and not non_historical_citations.empty:
+            df_continuous.append(non_historical_citations)
+
+    return pd.concat(df_continuous, ignore_index=True)
+
+
+def legacy_fill_inactive_status(df):
+    """Per-company loop formerly in fill_inactive_status."""
+    all_years = sorted(df["year"].unique())
+    filled_rows = []
+
+    for company, company_data in df.groupby("company"):
+        inactive_rows = company_data[company_data["reports_pue"] == "company inactive"]
+
+        if not inactive_rows.empty:
+            first_row = inactive_rows.sort_values("year").iloc[0]
+            first_inactive_year = first_row["year"]
+
+            successor = first_row.get("successor_entity", "")
+            status_date = first_row.get("status_effective_date", "")
+            if status_date and hasattr(status_date, "strftime"):
+                status_date = status_date.strftime("%Y-%m-%d")
+
+            existing_years = set(company_data["year"])
+
+            for year in all_years:
+                if year > first_inactive_year and year not in existing_years:
+                    filled_rows.append(
+                        {
+                            "company": company,
+                            "year": year,
+                            "reports_pue": "company inactive",
+                            "reports_wue": "company inactive",
+                            "successor_entity": successor,
+                            "status_effective_date": status_date,
+                        }
+                    )
+
+    if filled_rows:
+        return pd.concat([df, pd.DataFrame(filled_rows)], ignore_index=True)
+
+    return df
+
+
+def legacy_blackfill_not_established_status(df):
+    """Per-company loop formerly in blackfill_not_established_status."""
+    all_years = sorted(df["year"].unique())
+    filled_rows = []
+
+    df.loc[
+        df["year"] < df["year_founded"], ["reports_pue", "reports_wue"]
+    ] = "company not established"
+
+    for company, company_data in df.groupby("company"):
+        year_founded = int(company_data["year_founded"].iloc[0])
+
+        existing_years = set(company_data["year"])
+
+        for year in all_years:
+            if year < year_founded and year not in existing_years:
+                filled_rows.append(
+                    {
+                        "company": company,
+                        "year": year,
+                        "reports_pue": "company not established",
+                        "reports_wue": "company not established",
+                    }
+                )
+
+    if filled_rows:
+        return pd.concat([df, pd.DataFrame(filled_rows)], ignore_index=True)
+
+    return df
+
+
+GP_LOCATION_COLUMNS = [
+    "policy_id",
+    "jurisdiction_level",
+    "city",
+    "county",
+    "state_province",
+    "country",
+    "country_iso_code",
+    "state_iso_code",
+    "supranational_policy_area",
+    "region",
+    "order_type",
+    "status",
+]
+
+
+def legacy_gp_long(df):
+    """Instrument x objective melt formerly in load_gp_data."""
+    long_df = df.melt(
+        id_vars=[col for col in df.columns if col not in INSTRUMENTS],
+        value_vars=INSTRUMENTS,
+        var_name="instrument",
+        value_name="has_instrument",
+    )
+    long_df = long_df.melt(
+        id_vars=[col for col in long_df.columns if col not in OBJECTIVES],
+        value_vars=OBJECTIVES,
+        var_name="objective",
+        value_name="has_objective",
+    )
+    return long_df.drop_duplicates()
+
+
+def legacy_transpose_gp_data(df):
+    """transpose_gp_data as it ran on the melted policy data."""
+    latest_metadata = df.groupby("policy_id")["version"].last().reset_index()
+    amendment_df = pd.merge(
+        df, latest_metadata, on=["policy_id", "version"], how="inner"
+    )
+
+    obj_long = amendment_df[amendment_df["has_objective"] == "Yes"].copy()
+    obj_long = obj_long.drop_duplicates(subset=GP_LOCATION_COLUMNS + ["objective"])
+    obj_long["attr_type"] = "Objective"
+    obj_long["attr_value"] = obj_long["objective"]
+
+    inst_long = amendment_df[amendment_df["has_instrument"] == "Yes"].copy()
+    inst_long = inst_long.drop_duplicates(subset=GP_LOCATION_COLUMNS + ["instrument"])
+    inst_long["attr_type"] = "Instrument"
+    inst_long["attr_value"] = inst_long["instrument"]
+
+    transposed_df = pd.concat([obj_long, inst_long], ignore_index=True)
+    transposed_df["unique_per_attr"] = transposed_df.groupby(
+        GP_LOCATION_COLUMNS[1:] + ["objective", "attr_value"], dropna=False
+    )["policy_id"].transform("nunique")
+    transposed_df = transposed_df.drop(
+        ["instrument", "has_instrument", "objective", "has_objective"], axis=1
+    )
+    transposed_df["deduped_policy_count"] = (
+        ~transposed_df["policy_id"].duplicated()
+    ).astype(int)
+    transposed_df = add_coordinates_from_cache(transposed_df, level="state")
+    return add_coordinates_from_cache(transposed_df, level="city")
+
+
+def legacy_gp_attribute_counts(long_df, kind):
+    """Distinct policies per instrument / objective from the melted data."""
+    names = INSTRUMENTS if kind == "instrument" else OBJECTIVES
+    held = long_df[is_yes(long_df[f"has_{kind}"])]
+    counts = held.groupby(kind)["policy_id"].nunique()
+    counts = counts.reindex(names, fill_value=0).rename(None)
+    counts.index.name = None
+    return counts
+
+
+def legacy_multi_value_filter(df, column, selected_values):
+    """One case-insensitive substring scan per selected value."""
+    mask = pd.Series([False] * len(df), index=df.index)
+    for value in selected_values:
+        mask = mask | df[column].str.contains(value, case=False, na=False, regex=False)
+    return df[mask]
+
+
+def legacy_chained_filter(df, units, from_year, to_year):
+    """Full-frame copy, then one boolean-indexed frame per filter."""
+    filtered = df.copy()
+    filtered = filtered[filtered["units"] == units]
+    filtered = filtered[filtered["year"] >= from_year]
+    filtered = filtered[filtered["year"] <= to_year]
+    return filtered[filtered["energy_demand"].notna()]
+
+
+def legacy_multi_value_options(df, column):
+    """Split and sort the distinct comma-separated values on every call."""
+    all_values = set()
+    for value_str in df[column].dropna().unique():
+        all_values.update(v.strip() for v in str(value_str).split(","))
+    return [{"label": val, "value": val} for val in sorted(all_values) if val]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+
+def make_projections(n_citations, seed=0):
+    """Long-format studies sheet after the year melt (one row per point)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_citations):
+        citation = f"Study{i}({2010 + i % 15})"
+        units = "TWh" if i % 4 else "GW"
+        region = ["Global", "US", "Europe", "China"][i % 4]
+        has_history = i % 7 != 0
+        last_year = int(rng.integers(2015, 2024))
+        if has_history:
+            for year in range(last_year - int(rng.integers(3, 12)), last_year + 1):
+                rows.append((citation, "Historical", year, rng.random() * 100, units, region))
+        labels = ["Lower scenario", "Upper scenario", "Baseline", "Efficiency"]
+        for label in labels[: int(rng.integers(1, 5))]:
+            # some scenarios already contain the last historical year
+            start = last_year if rng.random() < 0.3 else last_year + 1
+            for year in range(start, 2051, int(rng.integers(1, 6))):
+                rows.append((citation, label, year, rng.random() * 500, units, region))
+        if i % 11 == 0:
+            # unlabelled rows
+            rows.append((citation, np.nan, 2030, rng.random(), units, region))
+    df = pd.DataFrame(
+        rows,
+        columns=["citation", "label", "year", "energy_demand", "units", "region"],
+    )
+    df["year"] = pd.to_numeric(df["year"]).astype(float)
+    # shuffle so citations and labels are interleaved as in the sheet melt
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def make_reporting_status(n_companies, seed=0):
+    """Companies reporting_status sheet merged with the companies summary."""
+    rng = np.random.default_rng(seed)
+    statuses = ["yes", "no reporting evident", "not yet released", np.nan]
+    rows = []
+    for i in range(n_companies):
+        company = f"Company {i:05d}"
+        year_founded = int(rng.choice([2000, 2000, 2012, 2016, 2019]))
+        inactive_from = int(rng.integers(2016, 2024)) if i % 9 == 0 else None
+        successor = f"Company {i + 1:05d}" if inactive_from and i % 2 else np.nan
+        status_date = (
+            pd.Timestamp(f"{inactive_from}-06-30") if inactive_from else pd.NaT
+        )
+        for year in range(2010, 2025):
+            if rng.random() < 0.25:
+                continue  # year missing from the sheet
+            if inactive_from and year >= inactive_from:
+                if year > inactive_from and rng.random() < 0.7:
+                    continue
+                pue = wue = "company inactive"
+            else:
+                pue, wue = rng.choice(statuses, 2)
+            rows.append(
+                (company, year, pue, wue, year_founded, "active",
+                 successor if inactive_from else np.nan,
+                 status_date if inactive_from else pd.NaT)
+            )
+        if inactive_from and not any(r[0] == company and r[1] == inactive_from for r in rows):
+            rows.append(
+                (company, inactive_from, "company inactive", "company inactive",
+                 year_founded, "inactive", successor, status_date)
+            )
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "company", "year", "reports_pue", "reports_wue", "year_founded",
+            "entity_status", "successor_entity", "status_effective_date",
+        ],
+    )
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def make_policies(n_policies, seed=0):
+    """Policy_Eval sheet: one row per policy version with Yes/No flag columns."""
+    rng = np.random.default_rng(seed)
+    countries = ["United States", "Ireland", "Germany", "Singapore", "Japan", "Chile"]
+    rows = []
+    for i in range(n_policies):
+        country = countries[i % len(countries)]
+        level = ["National", "State", "City"][i % 3]
+        state = f"State {i % 17}" if level != "National" else np.nan
+        city = f"City {i % 41}" if level == "City" else np.nan
+        for version in range(1, int(rng.integers(1, 4)) + 1):
+            row = {
+                "policy_id": f"P{i:05d}",
+                "version": f"v{version}",
+                "authors": f"Author {i % 50}",
+                "jurisdiction_level": level,
+                "city": city,
+                "county": np.nan,
+                "state_province": state,
+                "country": country,
+                "country_iso_code": country[:2].upper(),
+                "state_iso_code": np.nan if pd.isna(state) else f"S{i % 17}",
+                "supranational_policy_area": "EU" if country in ("Ireland", "Germany") else np.nan,
+                "region": "Europe" if country in ("Ireland", "Germany") else "Other",
+                "order_type": rng.choice(["Legislation", "Executive order"]),
+                "status": rng.choice(["Enacted", "Introduced", "Killed"]),
+            }
+            for name in INSTRUMENTS + OBJECTIVES:
+                row[name] = rng.choice(["Yes", "No", "No", np.nan])
+            rows.append(row)
+    df = pd.DataFrame(rows)
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def best_time(func, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def quiet(func):
+    """Wrap func so its console output (loader reports) is suppressed."""
+
+    def wrapper(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+
+    return wrapper
+
+
+def compare(name, legacy_func, new_func, data, repeat):
+    expected, legacy_time = best_time(legacy_func, data, repeat=repeat)
+    actual, new_time = best_time(new_func, data, repeat=repeat)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(actual, expected)
+    else:
+        pd.testing.assert_frame_equal(actual, expected)
+    print(
+        f"{name:<28} rows={len(data):>8,}  loop={legacy_time:8.3f}s  "
+        f"vectorized={new_time:8.3f}s  speedup={legacy_time / new_time:6.1f}x  (identical)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=10, help="synthetic data size multiplier")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions")
+    args = parser.parse_args()
+
+    projections = make_projections(60 * args.scale)
+    compare(
+        "scenario continuity",
+        lambda df: legacy_scenario_continuity(df).sort_values(["citation", "label", "year"]),
+        lambda df: add_scenario_continuity(df).sort_values(["citation", "label", "year"]),
+        projections,
+        args.repeat,
+    )
+    compare(
+        "chained row filters",
+        lambda df: legacy_chained_filter(df, "TWh", 2020, 2040),
+        lambda df: (
+            RowSelection(df)
+            .equals("units", "TWh")
+            .between("year", 2020, 2040)
+            .notna("energy_demand")
+            .take()
+        ),
+        projections,
+        args.repeat,
+    )
+
+    reporting_status = make_reporting_status(300 * args.scale)
+    compare(
+        "inactive status fill",
+        legacy_fill_inactive_status,
+        fill_inactive_status,
+        reporting_status,
+        args.repeat,
+    )
+    filled = fill_inactive_status(reporting_status)
+    compare(
+        "not established backfill",
+        lambda df: legacy_blackfill_not_established_status(df.copy()),
+        lambda df: blackfill_not_established_status(df.copy()),
+        filled,
+        args.repeat,
+    )
+
+    policies = make_policies(200 * args.scale)
+    long_policies = legacy_gp_long(policies)
+    compact_policies = encode_membership(policies).drop_duplicates()
+    print(
+        f"{'gp policy rows':<28} melted={len(long_policies):,} "
+        f"({long_policies.memory_usage(deep=True).sum() / 1e6:.1f} MB)  "
+        f"bitmask={len(compact_policies):,} "
+        f"({compact_policies.memory_usage(deep=True).sum() / 1e6:.1f} MB)"
+    )
+    compare(
+        "gp instrument counts",
+        lambda df: legacy_gp_attribute_counts(legacy_gp_long(df), "instrument"),
+        lambda df: attribute_counts(encode_membership(df), "instrument").rename(None),
+        policies,
+        args.repeat,
+    )
+    compare(
+        "gp transpose",
+        quiet(lambda df: optimize_dtypes(legacy_transpose_gp_data(legacy_gp_long(df)))),
+        quiet(lambda df: transpose_gp_data(encode_membership(df).drop_duplicates())),
+        policies,
+        args.repeat,
+    )
+    transposed = quiet(transpose_gp_data)(compact_policies)
+    attr_keys = GP_LOCATION_COLUMNS[1:] + ["attr_value"]
+    compare(
+        "gp unique_per_attr",
+        lambda df: df.groupby(attr_keys, dropna=False)["policy_id"].transform("nunique"),
+        lambda df: distinct_count_per_group(df, attr_keys, "policy_id"),
+        transposed,
+        args.repeat,
+    )
+    selected_countries = ["Germany", "Chile", "japan"]
+    compare(
+        "multi-value filter",
+        lambda df: legacy_multi_value_filter(df, "country", selected_countries),
+        lambda df: apply_multi_value_filter(df, "country", selected_countries),
+        transposed,
+        args.repeat,
+    )
+    compare(
+        "dropdown options",
+        lambda df: pd.DataFrame(
+            legacy_multi_value_options(df[df["status"] == df["status"].iloc[0]], "country")
+        ),
+        lambda df: pd.DataFrame(
+            option_catalog(df).options(
+                "country", "multi", RowSelection(df).equals("status", df["status"].iloc[0]).mask
+            )
+        ),
+        transposed,
+        args.repeat,
+    )
@@ -0,0 +1,77 @@
+"""
+Build script to write the prebuilt data bundle.
+
+Runs every loader and derived builder once (pue/wue merge, policy transpose
+with coordinates, KPI aggregates) and writes the results to a new folder
+under data/bundle/ with a manifest. Start the app with DCEWM_DATA_BUNDLE=1
+to serve from the latest bundle without parsing any workbook.
+
+Run this script when:
+- Data files are added or updated
+- The geocoding cache has been refreshed
+
+Usage:
+    python scripts/build_data_bundle.py [--output DIR] [--rebuild]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the prebuilt data bundle.")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Folder holding the bundles (default: data/bundle/)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore loader snapshots and parse every workbook",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.rebuild:
+        os.environ["DCEWM_SNAPSHOT_CACHE"] = "0"
+
+    from data_loader import create_dataset_registry, update_metadata
+    from helpers.data_bundle import write_bundle
+    from helpers.logging_config import configure_logging
+    from helpers.snapshot_cache import fingerprint_sources
+
+    configure_logging()
+
+    print("Updating metadata...")
+    update_metadata()
+
+    print("\nLoading datasets...")
+    datasets = create_dataset_registry()
+    datasets.warm()
+    values = {name: datasets.get(name) for name in datasets.names()}
+
+    source_files = sorted(
+        {source for name in datasets.names() for source in datasets.sources(name)}
+    )
+    sources = fingerprint_sources(source_files)
+
+    print("\nWriting bundle...")
+    bundle_dir = write_bundle(values, sources=sources, root=args.output)
+
+    written = [name for name, value in values.items() if not isinstance(value, tuple)]
+    size = sum(f.stat().st_size for f in bundle_dir.iterdir())
+    print("\nData bundle complete!")
+    print(f"Bundle: {bundle_dir}")
+    print(
+        f"{len(written)} dataset(s) from {len(source_files)} workbook(s), "
+        f"{size / 1e6:.2f} MB on disk"
+    )
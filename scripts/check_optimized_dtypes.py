@@ -0,0 +1,169 @@
+"""
+Check that the reporting trends processing works on dtype-optimized frames.
+
+optimize_dtypes() turns low-cardinality string columns (company names,
+reporting statuses) into categoricals. Operations such as .map() and
+groupby().sum() behave differently on categoricals, so this script runs the
+tab 2/4/5 filtering and weighted sorting and the reporting figures on
+synthetic frames, before and after optimize_dtypes(), and checks that both
+give the same rows in the same order.
+
+Each status column is also checked with statuses left out, so the status
+weights map one-to-one onto the statuses present.
+
+Usage:
+    python scripts/check_optimized_dtypes.py [--companies 40] [--seed 0]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from callbacks.reporting_trends import (
+    rt_tab2_callback,
+    rt_tab4_callback,
+    rt_tab5_callback,
+)
+from figures.reporting_trends.energy_reporting_heatmap import (
+    create_energy_reporting_heatmap,
+)
+from figures.reporting_trends.pue_wue_reporting_heatmap import (
+    create_pue_wue_reporting_heatmap_plot,
+)
+from figures.reporting_trends.reporting_barchart import create_reporting_bar_plot
+from helpers.dtype_optimizer import optimize_dtypes
+
+ENERGY_STATUSES = list(rt_tab2_callback._TAB2_STATUS_TO_DATA.values())
+PUE_WUE_STATUSES = list(rt_tab4_callback._PW_STATUS_TO_DATA.values())
+YEARS = list(range(2015, 2025))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check reporting trends processing on optimized dtypes."
+    )
+    parser.add_argument("--companies", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def make_reporting(rng, companies, statuses):
+    """One row per company and year, with the given reporting statuses."""
+    names = [f"Company {i:03d}" for i in range(companies)]
+    rows = pd.MultiIndex.from_product([names, YEARS]).to_frame(index=False)
+    rows.columns = ["company_name", "reported_data_year"]
+    rows["reporting_status"] = rng.choice(statuses, len(rows))
+    rows["reporting_scope"] = rng.choice(
+        ["Data Center Electricity Use", "Company Wide Electricity Use"], len(rows)
+    )
+    return rows
+
+
+def make_pue_wue(rng, companies, statuses):
+    """One row per company and year, with the given PUE/WUE statuses."""
+    names = [f"Company {i:03d}" for i in range(companies)]
+    rows = pd.MultiIndex.from_product([names, YEARS]).to_frame(index=False)
+    rows.columns = ["company_name", "year"]
+    rows["reports_pue"] = rng.choice(statuses, len(rows))
+    rows["reports_wue"] = rng.choice(statuses, len(rows))
+    return rows
+
+
+def filter_states(status_key, statuses):
+    for sort_by in ("reporting_status", "company_name"):
+        for sort_order in ("asc", "desc"):
+            yield {
+                "from_year": YEARS[1],
+                "to_year": YEARS[-2],
+                status_key: statuses,
+                "sort_by": sort_by,
+                "sort_order": sort_order,
+            }
+
+
+def same_result(plain, optimized):
+    """Rows, order and sort scores agree (dtypes may differ)."""
+    if list(plain.index) != list(optimized.index):
+        return False
+    if "total_company_score" in plain.columns:
+        return np.allclose(
+            plain["total_company_score"].to_numpy(dtype=float),
+            optimized["total_company_score"].to_numpy(dtype=float),
+        )
+    return True
+
+
+def check(name, process, frame, status_key, ui_statuses, figure):
+    optimized = optimize_dtypes(frame.copy(), name, verbose=False)
+    checked = 0
+    for filter_data in filter_states(status_key, ui_statuses):
+        plain_result = process(frame, filter_data)
+        optimized_result = process(optimized, filter_data)
+        assert same_result(plain_result, optimized_result), (name, filter_data)
+        figure(optimized_result, optimized)
+        checked += 1
+    print(f"{name:<40} {checked} filter states OK")
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    tab2_statuses = list(rt_tab2_callback._TAB2_STATUS_TO_DATA)
+    pw_statuses = list(rt_tab4_callback._PW_STATUS_TO_DATA)
+
+    # all statuses present, then with statuses left out
+    energy_variants = [ENERGY_STATUSES, ENERGY_STATUSES[2:]]
+    pue_wue_variants = [
+        PUE_WUE_STATUSES,
+        [s for s in PUE_WUE_STATUSES if s != "company inactive"],
+        [s for s in PUE_WUE_STATUSES if s not in ("company inactive", "pending")],
+    ]
+
+    for i, statuses in enumerate(energy_variants):
+        reporting = make_reporting(rng, args.companies, statuses)
+        check(
+            f"tab 2 energy reporting (variant {i})",
+            rt_tab2_callback.get_processed_reporting_data,
+            reporting,
+            "tab2_reporting_status",
+            tab2_statuses,
+            lambda result, full: create_energy_reporting_heatmap(result, full),
+        )
+        create_reporting_bar_plot(optimize_dtypes(reporting.copy(), verbose=False))
+
+    for i, statuses in enumerate(pue_wue_variants):
+        pue_wue = make_pue_wue(rng, args.companies, statuses)
+        check(
+            f"tab 4 PUE reporting (variant {i})",
+            rt_tab4_callback.get_processed_reporting_data,
+            pue_wue,
+            "pw_status",
+            pw_statuses,
+            lambda result, full: create_pue_wue_reporting_heatmap_plot(
+                result, full, reporting_column="reports_pue"
+            ),
+        )
+        check(
+            f"tab 5 WUE reporting (variant {i})",
+            rt_tab5_callback.get_processed_reporting_data,
+            pue_wue,
+            "pw_status",
+            pw_statuses,
+            lambda result, full: create_pue_wue_reporting_heatmap_plot(
+                result, full, reporting_column="reports_wue"
+            ),
+        )
+
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
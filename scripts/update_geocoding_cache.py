@@ -20,14 +20,17 @@ sys.path.insert(0, str(project_root / "src"))
 from data_loader import load_gp_data, transpose_gp_data
 from helpers.geocode_locations import update_location_cache, load_cache
 from helpers.geojson_cache import download_geojson
+from helpers.logging_config import configure_logging
 
 if __name__ == "__main__":
+    configure_logging()
+
     # Download/update GeoJSON cache
     print("Checking GeoJSON cache...")
     download_geojson()
 
     print("\nLoading global policies data...")
-    globalpolicies_df = load_gp_data()
+    _, globalpolicies_df = load_gp_data()
 
     print("Transposing data...")
     gp_transposed_df = transpose_gp_data(globalpolicies_df)
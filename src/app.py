@@ -3,28 +3,32 @@ import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
+import logging
 import os
+from contextlib import nullcontext
+
 import dash
 from dash import Dash, dcc, html, Input, Output, callback
 from dash.dependencies import Input, Output, State
 import dash_bootstrap_components as dbc
 
 from helpers.export_json_for_quarto import export_json_for_quarto
-
-from data_loader import (
-    load_pue_data,
-    load_wue_data,
-    create_pue_wue_data,
-    load_pue_wue_companies_data,
-    load_energyprojections_data,
-    load_gp_data,
-    transpose_gp_data,
-    load_reporting_data,
-    load_energy_use_data,
-    load_company_profile_data,
-    update_metadata,
+from helpers.dataset_registry import lazy_loading_enabled, parallel_loading_enabled
+from helpers.data_watcher import DataWatcher, data_watch_enabled
+from helpers.data_bundle import create_bundle_registry, data_bundle_enabled
+from helpers.filter_cache import register_filter_cache_endpoint
+from helpers.figure_cache import register_figure_cache_endpoint
+from helpers.logging_config import configure_logging, get_logger
+from helpers.snapshot_cache import snapshots_enabled
+from helpers.startup_profiler import (
+    StartupProfiler,
+    memory_tracing_enabled,
+    profile_endpoint_enabled,
+    profiling_enabled,
+    register_profile_endpoint,
 )
 
+
 from pages.pue_wue.pue_wue_page import create_pue_wue_page
 from pages.pue_wue.pue_methods_page import create_pue_methodology_page
 from pages.pue_wue.wue_methods_page import create_wue_methodology_page
@@ -92,7 +96,29 @@ from callbacks.reporting_trends.rt_tab5_callback import (
 from components.kpi_data_cards import create_kpi_cards
 
 
+logger = get_logger(__name__)
+
+
+def _profile_phase(profiler, name):
+    """Time a startup step when profiling is enabled."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+
 def create_app():
+    # Leveled logging through a background queue (DCEWM_LOG_LEVEL, DCEWM_LOG_LEVELS)
+    configure_logging()
+
+    # Record per-loader timings and memory (opt in with DCEWM_PROFILE_STARTUP=1)
+    profiler = StartupProfiler() if profiling_enabled() else None
+    bundle_mode = data_bundle_enabled()
+    profile_settings = {
+        "data_bundle": bundle_mode,
+        "lazy_load": lazy_loading_enabled(),
+        "parallel_load": parallel_loading_enabled(),
+        "snapshot_cache": snapshots_enabled(),
+        "memory_tracing": memory_tracing_enabled(),
+    }
+
     # Get absolute path to assets folder
     assets_path = os.path.abspath(
         os.path.join(os.path.dirname(__file__), "..", "assets")
@@ -117,92 +143,103 @@ def create_app():
         assets_url_path="assets",  # Explicitly set the assets URL path
     )
 
-    # Load data
-    pue_df = load_pue_data()
-    wue_df = load_wue_data()
-    pue_wue_df = create_pue_wue_data(pue_df, wue_df)
-    pue_wue_companies_df = load_pue_wue_companies_data()
-    print("Companies", pue_wue_companies_df[pue_wue_companies_df["company_name"].isin(["LY Corporation", "SDC SpaceNet", "Quantum Switch Tamasuk","Quantum Switch"])][["company_name","year_founded", "year","reports_pue", "reports_wue"]])
-    energyprojections_df = load_energyprojections_data()
-    waterprojections_df = (
-        load_energyprojections_data()
-    )  # TO DO: replace with the function to load water projections dataset
-    gp_base_df, globalpolicies_df = load_gp_data()
-    gp_transposed_df = transpose_gp_data(globalpolicies_df)
-    reporting_df = load_reporting_data()
-    print("Test-Tets: Reporting_df")
-    print(reporting_df["reporting_status"].unique())
-    print(reporting_df[reporting_df["reporting_status"] == "Pending Data Submission"].head(10))
-    energy_use_df = load_energy_use_data()
-    company_profile_df = load_company_profile_data()
-
-    # Update last modified timestamp for each imported dataset
-    update_metadata()
-
-    # Export Datasets metadata to quarto parameters
-    export_json_for_quarto()
+    # Load data: each dataset is loaded once and shared through the registry.
+    # Callbacks and pages fetch datasets by name when they run, so in lazy mode
+    # (DCEWM_LAZY_LOAD=1) each page's datasets load on its first request.
+    if bundle_mode:
+        # prebuilt frames from scripts/build_data_bundle.py; the workbook
+        # loaders (and openpyxl, pyjanitor, geopy) are never imported
+        datasets = create_bundle_registry(profiler=profiler)
+    else:
+        from data_loader import create_dataset_registry, update_metadata
 
-    # DELETE
-    # Read and print metadata to check
-    import json
-    from pathlib import Path
+        datasets = create_dataset_registry(profiler=profiler)
+    if not lazy_loading_enabled():
+        # independent workbooks are parsed in parallel; bundle frames are
+        # cheap enough to read in this process
+        with _profile_phase(profiler, "load datasets"):
+            datasets.warm(parallel=False if bundle_mode else None)
+        if logger.isEnabledFor(logging.DEBUG):
+            pue_wue_companies_df = datasets.get("pue_wue_companies")
+            logger.debug("Companies\n%s", pue_wue_companies_df[pue_wue_companies_df["company_name"].isin(["LY Corporation", "SDC SpaceNet", "Quantum Switch Tamasuk","Quantum Switch"])][["company_name","year_founded", "year","reports_pue", "reports_wue"]])
+            reporting_df = datasets.get("reporting")
+            logger.debug("Reporting statuses: %s", reporting_df["reporting_status"].unique())
+            logger.debug("Pending data submissions\n%s", reporting_df[reporting_df["reporting_status"] == "Pending Data Submission"].head(10))
 
-    json_path = Path("data") / "dependencies" / "metadata.json"
+    with _profile_phase(profiler, "update metadata"):
+        # Update last modified timestamp for each imported dataset
+        # (the bundle build updates it in bundle mode)
+        if not bundle_mode:
+            update_metadata()
 
-    with open(json_path, "r") as f:
-        metadata = json.load(f)
+        # Export Datasets metadata to quarto parameters
+        export_json_for_quarto()
 
-    # Pretty-print
-    import pprint
+    # Reload affected datasets in the background when workbooks in data/ change
+    if data_watch_enabled() and not bundle_mode:
 
-    pprint.pprint(metadata)
+        def reload_changed_workbooks(changed_files):
+            names = datasets.datasets_for_sources(changed_files)
+            logger.info("Data files changed: %s, reloading: %s", changed_files, names)
+            if names:
+                datasets.reload(names)
+            update_metadata()
+            export_json_for_quarto()
+
+        data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        DataWatcher(data_dir, reload_changed_workbooks).start()
+
+    # DELETE
+    # Read and log metadata to check
+    if logger.isEnabledFor(logging.DEBUG):
+        import json
+        import pprint
+        from pathlib import Path
+
+        json_path = Path("data") / "dependencies" / "metadata.json"
+
+        with open(json_path, "r") as f:
+            metadata = json.load(f)
+
+        logger.debug("Metadata:\n%s", pprint.pformat(metadata))
 
     # Initialize callbacks
-    register_pue_wue_callbacks(app, pue_wue_df)
-    register_energy_projections_callbacks(app, energyprojections_df)
-    register_water_projections_callbacks(app, waterprojections_df)
-    register_gp_page_callbacks(app, gp_base_df, globalpolicies_df)
-    register_gp_tab1_callbacks(app, globalpolicies_df)
-    # Use the transposed dataframe (with attr_type/attr_value) for Tab 2 callbacks
-    register_gp_tab2_callbacks(app, gp_transposed_df)
-    register_gp_tab3_callbacks(app, gp_transposed_df)
-    # Company Reporting Trends page callbacks
-    register_rt_page_callbacks(app, reporting_df, pue_wue_companies_df)
-    # Centralized filter callbacks for Reporting Trends (all tabs)
-    register_rt_filter_callbacks(app)
-    register_rt_tab1_callbacks(app, reporting_df)
-    register_rt_tab2_callbacks(app, reporting_df, pue_wue_companies_df)
-    register_rt_tab3_callbacks(app, reporting_df, pue_wue_companies_df)
-    register_rt_tab4_callbacks(app, pue_wue_companies_df)
-    register_rt_tab5_callbacks(app, reporting_df, pue_wue_companies_df)
-
-    # Company Profile page callbacks (new tab-based structure)
-    cp_companies = sorted(energy_use_df["company_name"].unique())
-    cp_default_company = cp_companies[0] if cp_companies else None
-    register_cp_page_callbacks(app, cp_companies, cp_default_company, energy_use_df)
-    register_cp_filter_callbacks(app)
-    register_cp_tab1_callbacks(app, company_profile_df)
-    register_cp_tab2_callbacks(app, energy_use_df)
-    register_cp_tab3_callbacks(app, energy_use_df)
+    with _profile_phase(profiler, "register callbacks"):
+        register_pue_wue_callbacks(app, datasets)
+        register_energy_projections_callbacks(app, datasets)
+        register_water_projections_callbacks(app, datasets)
+        register_gp_page_callbacks(app, datasets)
+        register_gp_tab1_callbacks(app, datasets)
+        # Use the transposed dataframe (with attr_type/attr_value) for Tab 2 callbacks
+        register_gp_tab2_callbacks(app, datasets)
+        register_gp_tab3_callbacks(app, datasets)
+        # Company Reporting Trends page callbacks
+        register_rt_page_callbacks(app, datasets)
+        # Centralized filter callbacks for Reporting Trends (all tabs)
+        register_rt_filter_callbacks(app)
+        register_rt_tab1_callbacks(app, datasets)
+        register_rt_tab2_callbacks(app, datasets)
+        register_rt_tab3_callbacks(app, datasets)
+        register_rt_tab4_callbacks(app, datasets)
+        register_rt_tab5_callbacks(app, datasets)
+
+        # Company Profile page callbacks (new tab-based structure)
+        register_cp_page_callbacks(app, datasets)
+        register_cp_filter_callbacks(app)
+        register_cp_tab1_callbacks(app, datasets)
+        register_cp_tab2_callbacks(app, datasets)
+        register_cp_tab3_callbacks(app, datasets)
 
     # URL Routing
     app.layout = html.Div(
         [dcc.Location(id="url", refresh=False), html.Div(id="page-content")]
     )
 
-    # Create the data sources dictionary for KPI cards
-    kpi_data_sources = {
-        "pue": pue_df,
-        "wue": wue_df,
-        "company_name": pue_wue_df,
-        "energy_projections_studies": energyprojections_df,  # TO DO: add water projections studies to the KPIs count
-    }
-
     @app.callback(Output("page-content", "children"), Input("url", "pathname"))
     def display_page(pathname):
-        print(f"\nRouting request for pathname: '{pathname}'")  # Debug print
+        logger.debug("Routing request for pathname: '%s'", pathname)
         if pathname == "/pue-wue":
-            return create_pue_wue_page(app, pue_wue_df)
+            return create_pue_wue_page(app, datasets.get("pue_wue"))
         elif pathname == "/pue-methodology":
             return create_pue_methodology_page()
         elif pathname == "/wue-methodology":
@@ -212,23 +249,31 @@ def create_app():
         elif pathname == "/wue-data":
             return create_wue_data_page()
         elif pathname == "/energy-projections":
-            return create_energy_projections_page(app, energyprojections_df)
+            return create_energy_projections_page(
+                app, datasets.get("energyprojections")
+            )
         elif pathname == "/energy-projections-methodology":
             return create_energy_projections_methodology_page()
         elif pathname == "/energy-projections-data":
             return create_energy_projections_data_page()
         elif pathname == "/water-projections":
-            return create_water_projections_page(app, waterprojections_df)
+            return create_water_projections_page(
+                app, datasets.get("waterprojections")
+            )
         elif pathname == "/water-projections-methodology":
             return create_water_projections_methodology_page()
         elif pathname == "/water-projections-data":
             return create_water_projections_data_page()
         elif pathname == "/global-policies":
-            return create_gp_page(app, globalpolicies_df)
+            return create_gp_page(app, datasets.get("globalpolicies"))
         elif pathname == "/reporting-trends":
-            return create_rt_page(app, reporting_df, pue_wue_companies_df)
+            return create_rt_page(
+                app, datasets.get("reporting"), datasets.get("pue_wue_companies")
+            )
         elif pathname == "/company-profile":
-            return create_cp_page(app, company_profile_df, energy_use_df)
+            return create_cp_page(
+                app, datasets.get("company_profile"), datasets.get("energy_use")
+            )
         elif pathname == "/about":
             return create_about_page()
         elif pathname == "/companies":
@@ -238,8 +283,9 @@ def create_app():
         elif pathname == "/data-centers-101":
             return create_data_centers_101_page()
         else:
-            print(f"No route match, defaulting to home page")  # Debug print
-            return create_home_page(kpi_data_sources)
+            logger.debug("No route match, defaulting to home page")
+            # KPI values are precomputed with the datasets
+            return create_home_page({"kpis": datasets.get("kpis")})
 
     # Navbar toggle callback
     @app.callback(
@@ -252,6 +298,17 @@ def create_app():
             return not is_open
         return is_open
 
+    if profiler is not None:
+        profiler.write(settings=profile_settings)
+        logger.info("Startup profile:\n%s", profiler.summary())
+        # loaders that run later (lazy mode, reloads) show up in the live report
+        if profile_endpoint_enabled():
+            register_profile_endpoint(app.server, profiler, profile_settings)
+
+    if profile_endpoint_enabled():
+        register_filter_cache_endpoint(app.server)
+        register_figure_cache_endpoint(app.server)
+
     return app
 
 
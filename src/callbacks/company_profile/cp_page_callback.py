@@ -13,13 +13,12 @@ _cp_page_callbacks_registered = False
 ID_PREFIX = "cp-"
 
 
-def register_cp_page_callbacks(app, companies, default_company, energy_use_df):
+def register_cp_page_callbacks(app, datasets):
     """Registers the tab-switching callback for the Company Profile page.
 
     Args:
         app: Dash app instance
-        companies: sorted list of company names for the dropdown
-        default_company: initially selected company
+        datasets: DatasetRegistry providing the "energy_use" dataset
     """
     global _cp_page_callbacks_registered
 
@@ -55,6 +54,9 @@ def register_cp_page_callbacks(app, companies, default_company, energy_use_df):
     ):
         """Dynamically loads and returns the content for the selected tab."""
 
+        energy_use_df = datasets.get("energy_use")
+        companies = sorted(energy_use_df["company_name"].unique())
+        default_company = companies[0] if companies else None
         ctx = callback_context
         if not ctx.triggered:
             active_tab = current_tab or "tab-1"
@@ -13,7 +13,7 @@ ID_PREFIX = "cp-"
 _registered = False
 
 
-def register_cp_tab1_callbacks(app, company_profile_df):
+def register_cp_tab1_callbacks(app, datasets):
     """Register callbacks for Tab 1 - Reporting Profile AG Grids."""
     global _registered
     if _registered:
@@ -33,6 +33,8 @@ def register_cp_tab1_callbacks(app, company_profile_df):
         if active_tab is not None and active_tab != "tab-1":
             raise PreventUpdate
 
+        company_profile_df = datasets.get("company_profile")
+
         company = filter_data.get("company") if filter_data else None
 
         if not company:
@@ -37,7 +37,7 @@ def create_empty_chart(message):
     }
 
 
-def register_cp_tab2_callbacks(app, energy_use_df):
+def register_cp_tab2_callbacks(app, datasets):
     """Register callbacks for Tab 2 - Energy Trends chart."""
     global _registered
     if _registered:
@@ -58,6 +58,8 @@ def register_cp_tab2_callbacks(app, energy_use_df):
         if active_tab is not None and active_tab != "tab-2":
             raise PreventUpdate
 
+        energy_use_df = datasets.get("energy_use")
+
         company = filter_data.get("company") if filter_data else None
 
         try:
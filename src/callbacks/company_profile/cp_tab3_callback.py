@@ -35,7 +35,7 @@ def create_empty_chart(message):
     }
 
 
-def register_cp_tab3_callbacks(app, energy_use_df):
+def register_cp_tab3_callbacks(app, datasets):
     """Register callbacks for Tab 3 - Energy Comparison chart."""
     global _registered
     if _registered:
@@ -56,6 +56,8 @@ def register_cp_tab3_callbacks(app, energy_use_df):
         if active_tab is not None and active_tab != "tab-3":
             raise PreventUpdate
 
+        energy_use_df = datasets.get("energy_use")
+
         store = filter_data or {}
         company = store.get("company")
         year = store.get("year")
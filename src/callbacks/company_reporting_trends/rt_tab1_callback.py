@@ -5,6 +5,7 @@ import json
 from datetime import datetime
 from charts.reporting_barchart import create_reporting_bar_plot
 from components.excel_export import create_filtered_excel_download
+from helpers.row_selection import RowSelection
 from components.figure_card import create_figure_card
 
 
@@ -36,19 +37,8 @@ def get_rt_last_modified_date():
 
 
 def filter_data_by_year_range(df, from_year, to_year):
-    """Filter dataframe by year range"""
-    if df.empty:
-        return df
-
-    filtered_df = df.copy()
-
-    if from_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] >= from_year]
-
-    if to_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] <= to_year]
-
-    return filtered_df
+    """Filter dataframe by year range (both bounds in one mask, one slice)"""
+    return RowSelection(df).between("reported_data_year", from_year, to_year).take()
 
 
 # ID prefix for this page's components
@@ -14,7 +14,7 @@ _gp_callbacks_registered = False
 ID_PREFIX = "gp-"
 
 
-def register_gp_page_callbacks(app, gp_base_df, globalpolicies_df):
+def register_gp_page_callbacks(app, datasets):
     """Registers all callbacks related to the Global Policies page."""
     global _gp_callbacks_registered
 
@@ -55,15 +55,15 @@ def register_gp_page_callbacks(app, gp_base_df, globalpolicies_df):
             # Extract tab value from button ID (e.g., 'gp-tab-btn-tab-1' -> 'tab-1')
             active_tab = button_id.replace(f"{ID_PREFIX}tab-btn-", "")
 
-        # Render content based on active tab
+        # Render content based on active tab; only its dataset is loaded
         if active_tab == "tab-1":
-            content = create_gp_tab1(app, globalpolicies_df)
+            content = create_gp_tab1(app, datasets.get("globalpolicies"))
         elif active_tab == "tab-2":
-            content = create_gp_tab2(app, globalpolicies_df)
+            content = create_gp_tab2(app, datasets.get("globalpolicies"))
         elif active_tab == "tab-3":
-            content = create_gp_tab3(app, globalpolicies_df)
+            content = create_gp_tab3(app, datasets.get("globalpolicies"))
         elif active_tab == "tab-4":
-            content = create_gp_tab4(app, gp_base_df)
+            content = create_gp_tab4(app, datasets.get("gp_base"))
         else:
             content = html.Div("Select a tab to view the data visualization.")
 
@@ -1,34 +1,34 @@
 import dash
 from pathlib import Path
 from dash import Dash, Input, Output, State, callback, dcc, html, callback_context
-import pandas as pd
 import json
 from datetime import datetime
 from figures.global_policies.gp_stacked_area_chart import (
+    GP_STACKED_AREA_COLUMNS,
     create_gp_stacked_area_plot,
 )
 from components.excel_export import create_filtered_excel_download
 from pages.global_policies.gp_tab1 import create_chart_row
+from helpers.figure_cache import get_figure_cache
+from helpers.gp_membership import MASK_COLUMNS, has_any, present_attributes
+from helpers.logging_config import get_logger
+from helpers.option_catalog import option_catalog, warm_option_catalog
+from helpers.row_selection import RowSelection
 
+logger = get_logger(__name__)
 
-def apply_multi_value_filter(df, column, selected_values):
-    """Helper function to apply multi-value string matching filter"""
-    if not selected_values:
-        return df
 
-    mask = pd.Series([False] * len(df), index=df.index)
-    for value in selected_values:
-        mask = mask | df[column].str.contains(value, case=False, na=False, regex=False)
-    return df[mask]
-
-
-def get_multi_value_options(df, column):
-    """Extract unique values from multi-value fields"""
-    all_values = set()
-    for value_str in df[column].dropna().unique():
-        values = [v.strip() for v in str(value_str).split(",")]
-        all_values.update(values)
-    return [{"label": val, "value": val} for val in sorted(all_values) if val]
+# Filter columns whose options come from the dataset's option catalog
+GP_OPTION_COLUMNS = {
+    "jurisdiction_level": "single",
+    "region": "multi",
+    "country": "multi",
+    "state_province": "multi",
+    "county": "multi",
+    "city": "multi",
+    "order_type": "multi",
+    "status": "multi",
+}
 
 
 def get_gp_last_modified_date():
@@ -70,67 +70,30 @@ def get_gp_last_modified_date():
         return None
 
 
-def _get_instrument_options_with_disabled(full_df, filtered_df):
-    """Get all instrument options with disabled state for items not in filtered data"""
-    # Get all possible instrument values from full dataset (where has_instrument is True)
-    full_has_instrument_true = (
-        (full_df["has_instrument"] == True)
-        | (full_df["has_instrument"] == 1)
-        | (full_df["has_instrument"].astype(str).str.upper().isin(["YES", "TRUE", "1"]))
-    )
-    all_instruments = set(
-        full_df[full_has_instrument_true]["instrument"].dropna().unique()
-    )
-
-    # Get available instrument values from filtered dataset
-    available_instruments = set(filtered_df["instrument"].dropna().unique())
-
-    # Create options with disabled state
-    options = []
-    for val in sorted(all_instruments):
-        if val and str(val).strip():
-            options.append(
-                {
-                    "label": str(val),
-                    "value": val,
-                    "disabled": val
-                    not in available_instruments,  # Disable if not available
-                }
-            )
-    return options
-
+def _get_attribute_options_with_disabled(kind, df, mask):
+    """Get all instrument or objective options with disabled state for items not in the masked rows"""
+    # Get all possible values held by any policy in the full dataset
+    all_values = present_attributes(df, kind)
 
-def _get_objective_options_with_disabled(full_df, filtered_df):
-    """Get all objective options with disabled state for items not in filtered data"""
-    # Get all possible objective values from full dataset (where has_objective is True)
-    full_has_objective_true = (
-        (full_df["has_objective"] == True)
-        | (full_df["has_objective"] == 1)
-        | (full_df["has_objective"].astype(str).str.upper().isin(["YES", "TRUE", "1"]))
-    )
-    all_objectives = set(
-        full_df[full_has_objective_true]["objective"].dropna().unique()
+    # Get available values from the masked rows (only the bitmask column is read)
+    available_values = present_attributes(
+        RowSelection(df).where(mask).take([MASK_COLUMNS[kind]]), kind
     )
 
-    # Get available objective values from filtered dataset
-    available_objectives = set(filtered_df["objective"].dropna().unique())
-
     # Create options with disabled state
     options = []
-    for val in sorted(all_objectives):
-        if val and str(val).strip():
-            options.append(
-                {
-                    "label": str(val),
-                    "value": val,
-                    "disabled": val
-                    not in available_objectives,  # Disable if not available
-                }
-            )
+    for val in sorted(all_values):
+        options.append(
+            {
+                "label": str(val),
+                "value": val,
+                "disabled": val not in available_values,  # Disable if not available
+            }
+        )
     return options
 
 
-def filter_data(
+def select_rows(
     df,
     gp_jurisdiction_level,
     gp_region,
@@ -143,71 +106,34 @@ def filter_data(
     gp_instrument,
     gp_objective,
 ):
-    """Filter dataframe based on all selections"""
-    filtered_df = df.copy()
+    """Return the RowSelection of all filter selections (nothing is copied)"""
+    selection = RowSelection(df)
 
     # Standard single-value filters
-    if gp_jurisdiction_level:
-        filtered_df = filtered_df[
-            filtered_df["jurisdiction_level"].isin(gp_jurisdiction_level)
-        ]
-    if gp_order_type:
-        filtered_df = filtered_df[filtered_df["order_type"].isin(gp_order_type)]
-    if gp_status:
-        filtered_df = filtered_df[filtered_df["status"].isin(gp_status)]
-
-    # Multi-value location fields (using apply_multi_value_filter if available, or simple isin)
-    if gp_region:
-        filtered_df = filtered_df[filtered_df["region"].isin(gp_region)]
-    if gp_country:
-        filtered_df = filtered_df[filtered_df["country"].isin(gp_country)]
-    if gp_state_province:
-        filtered_df = filtered_df[filtered_df["state_province"].isin(gp_state_province)]
-    if gp_county:
-        filtered_df = filtered_df[filtered_df["county"].isin(gp_county)]
-    if gp_city:
-        filtered_df = filtered_df[filtered_df["city"].isin(gp_city)]
-
-    # Instrument and Objective filters - need to check both the column value AND has_instrument/has_objective
-    # Since data is pivoted, we need to get policy_ids that match, then filter the full dataframe
+    selection.isin("jurisdiction_level", gp_jurisdiction_level)
+    selection.isin("order_type", gp_order_type)
+    selection.isin("status", gp_status)
+
+    # Location fields (simple isin)
+    selection.isin("region", gp_region)
+    selection.isin("country", gp_country)
+    selection.isin("state_province", gp_state_province)
+    selection.isin("county", gp_county)
+    selection.isin("city", gp_city)
+
+    # Instrument and Objective filters - policies are kept if any of their rows
+    # hold one of the selected instruments (and one of the selected objectives)
     matching_policy_ids = None
 
     if gp_instrument:
-        # Filter to rows where instrument matches AND has_instrument value "yes"
-        # Convert has_instrument to string and check for truthy values
-        has_instrument_true = (
-            (filtered_df["has_instrument"] == True)
-            | (filtered_df["has_instrument"] == 1)
-            | (
-                filtered_df["has_instrument"]
-                .astype(str)
-                .str.upper()
-                .isin(["YES", "TRUE", "1"])
-            )
-        )
-        instrument_mask = (
-            filtered_df["instrument"].isin(gp_instrument) & has_instrument_true
-        )
+        instrument_mask = selection.mask & has_any(df, "instrument", gp_instrument)
         # Get unique policy_ids that match the instrument filter
-        matching_policy_ids = set(filtered_df[instrument_mask]["policy_id"].unique())
+        matching_policy_ids = set(df["policy_id"][instrument_mask].unique())
 
     if gp_objective:
-        # Filter to rows where objective matches AND has_objective indicates "yes"
-        has_objective_true = (
-            (filtered_df["has_objective"] == True)
-            | (filtered_df["has_objective"] == 1)
-            | (
-                filtered_df["has_objective"]
-                .astype(str)
-                .str.upper()
-                .isin(["YES", "TRUE", "1"])
-            )
-        )
-        objective_mask = (
-            filtered_df["objective"].isin(gp_objective) & has_objective_true
-        )
+        objective_mask = selection.mask & has_any(df, "objective", gp_objective)
         # Get unique policy_ids that match the objective filter
-        objective_policy_ids = set(filtered_df[objective_mask]["policy_id"].unique())
+        objective_policy_ids = set(df["policy_id"][objective_mask].unique())
 
         # If instrument filter was also applied, intersect the sets (policies must match BOTH)
         # Otherwise, just use the objective policy_ids
@@ -218,19 +144,16 @@ def filter_data(
 
     # Apply the policy_id filter if instrument or objective filters were used
     if matching_policy_ids is not None:
-        filtered_df = filtered_df[filtered_df["policy_id"].isin(matching_policy_ids)]
+        selection.where(df["policy_id"].isin(matching_policy_ids))
 
-    # # Multi-value address fields
-    # filtered_df = apply_multi_value_filter(filtered_df, "region", region)
-    # filtered_df = apply_multi_value_filter(filtered_df, "country", country)
-    # filtered_df = apply_multi_value_filter(filtered_df, "state_province", state)
-    # filtered_df = apply_multi_value_filter(filtered_df, "county", county)
-    # filtered_df = apply_multi_value_filter(filtered_df, "city", city)
+    return selection
 
-    return filtered_df
 
+def register_gp_tab1_callbacks(app, datasets):
+    warm_option_catalog(datasets, "globalpolicies", GP_OPTION_COLUMNS)
+    # rendered figures are reused per (dataset version, selections)
+    figure_cache = get_figure_cache()
 
-def register_gp_tab1_callbacks(app, df):
     # Update all filters and handle clearing
     @app.callback(
         [
@@ -291,55 +214,32 @@ def register_gp_tab1_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-1":
             raise dash.exceptions.PreventUpdate
 
+        df = datasets.get("globalpolicies")
+
         ctx = dash.callback_context
 
+        catalog = option_catalog(df)
+
         # Handle clear button click
         if ctx.triggered:
             trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
             if trigger_id == "gp_clear-filters-btn":
                 # Return all options and cleared values
-                base_df = df.copy()
-                # For clear, show all instruments/objectives as enabled
-                # Create filtered dataframes with all instruments/objectives available
-                all_instrument_df = base_df[
-                    (base_df["has_instrument"] == True)
-                    | (base_df["has_instrument"] == 1)
-                    | (
-                        base_df["has_instrument"]
-                        .astype(str)
-                        .str.upper()
-                        .isin(["YES", "TRUE", "1"])
-                    )
-                ]
-                all_objective_df = base_df[
-                    (base_df["has_objective"] == True)
-                    | (base_df["has_objective"] == 1)
-                    | (
-                        base_df["has_objective"]
-                        .astype(str)
-                        .str.upper()
-                        .isin(["YES", "TRUE", "1"])
-                    )
-                ]
+                all_rows = RowSelection(df).mask
                 return (
-                    [
-                        {"label": str(val), "value": val}
-                        for val in sorted(
-                            base_df["jurisdiction_level"].dropna().unique()
-                        )
-                    ],
-                    get_multi_value_options(base_df, "region"),
-                    get_multi_value_options(base_df, "country"),
-                    get_multi_value_options(base_df, "state_province"),
-                    get_multi_value_options(base_df, "county"),
-                    get_multi_value_options(base_df, "city"),
-                    get_multi_value_options(base_df, "order_type"),
-                    get_multi_value_options(base_df, "status"),
+                    catalog.options("jurisdiction_level"),
+                    catalog.options("region", "multi"),
+                    catalog.options("country", "multi"),
+                    catalog.options("state_province", "multi"),
+                    catalog.options("county", "multi"),
+                    catalog.options("city", "multi"),
+                    catalog.options("order_type", "multi"),
+                    catalog.options("status", "multi"),
                     {},
                     {},
                     # Get all instrument/objective options (all enabled when cleared)
-                    _get_instrument_options_with_disabled(df, all_instrument_df),
-                    _get_objective_options_with_disabled(df, all_objective_df),
+                    _get_attribute_options_with_disabled("instrument", df, all_rows),
+                    _get_attribute_options_with_disabled("objective", df, all_rows),
                     [],  # Clear instrument
                     [],  # Clear objective
                     None,  # Clear jurisdiction_level
@@ -352,113 +252,57 @@ def register_gp_tab1_callbacks(app, df):
                     None,  # Clear status
                 )
 
-        # Start with full data for each filter's options
-        base_df = df.copy()
-
         # Jurisdiction level options (no dependencies)
-        gp_jurisdiction_level_opts = [
-            {"label": str(val), "value": val}
-            for val in sorted(base_df["jurisdiction_level"].dropna().unique())
-        ]
+        gp_jurisdiction_level_opts = catalog.options("jurisdiction_level")
 
         # Apply jurisdiction level filter first to all subsequent filters
-        if gp_jurisdiction_level:
-            base_df = base_df[base_df["jurisdiction_level"].isin(gp_jurisdiction_level)]
+        cascade = RowSelection(df).isin("jurisdiction_level", gp_jurisdiction_level)
 
         # Location filters: depend on jurisdiction level + higher level locations
-        region_df = base_df.copy()
-        gp_region_opts = get_multi_value_options(region_df, "region")
-
-        country_df = base_df.copy()
-        country_df = apply_multi_value_filter(country_df, "region", gp_region)
-        gp_country_opts = get_multi_value_options(country_df, "country")
-
-        state_df = base_df.copy()
-        state_df = apply_multi_value_filter(state_df, "region", gp_region)
-        state_df = apply_multi_value_filter(state_df, "country", gp_country)
-        gp_state_province_opts = get_multi_value_options(state_df, "state_province")
-
-        county_df = base_df.copy()
-        county_df = apply_multi_value_filter(county_df, "region", gp_region)
-        county_df = apply_multi_value_filter(county_df, "country", gp_country)
-        county_df = apply_multi_value_filter(
-            county_df, "state_province", gp_state_province
-        )
-        gp_county_opts = get_multi_value_options(county_df, "county")
-
-        city_df = base_df.copy()
-        city_df = apply_multi_value_filter(city_df, "region", gp_region)
-        city_df = apply_multi_value_filter(city_df, "country", gp_country)
-        city_df = apply_multi_value_filter(city_df, "state_province", gp_state_province)
-        city_df = apply_multi_value_filter(city_df, "county", gp_county)
-        gp_city_opts = get_multi_value_options(city_df, "city")
-
-        # Order type filter: depend on previously selected filters
-        order_type_df = base_df.copy()
-        # Apply all location filters to climate data
-        order_type_df = apply_multi_value_filter(order_type_df, "region", gp_region)
-        order_type_df = apply_multi_value_filter(order_type_df, "country", gp_country)
-        order_type_df = apply_multi_value_filter(
-            order_type_df, "state_province", gp_state_province
-        )
-        order_type_df = apply_multi_value_filter(order_type_df, "county", gp_county)
-        order_type_df = apply_multi_value_filter(order_type_df, "city", gp_city)
-        gp_order_type_opts = get_multi_value_options(order_type_df, "order_type")
-
-        status_df = base_df.copy()
-        # Apply all location filters to climate data
-        status_df = apply_multi_value_filter(status_df, "region", gp_region)
-        status_df = apply_multi_value_filter(status_df, "country", gp_country)
-        status_df = apply_multi_value_filter(
-            status_df, "state_province", gp_state_province
+        gp_region_opts = catalog.options("region", "multi", cascade.mask)
+
+        cascade.multi_value("region", gp_region)
+        gp_country_opts = catalog.options("country", "multi", cascade.mask)
+
+        cascade.multi_value("country", gp_country)
+        gp_state_province_opts = catalog.options(
+            "state_province", "multi", cascade.mask
         )
-        status_df = apply_multi_value_filter(status_df, "county", gp_county)
-        status_df = apply_multi_value_filter(status_df, "city", gp_city)
-        gp_status_opts = get_multi_value_options(status_df, "status")
-
-        instrument_df = base_df.copy()
-        # Apply jurisdiction level filter first
-        if gp_jurisdiction_level:
-            instrument_df = instrument_df[
-                instrument_df["jurisdiction_level"].isin(gp_jurisdiction_level)
-            ]
-        # Apply status and order_type filters (single-value filters, use .isin())
-        if gp_status:
-            instrument_df = instrument_df[instrument_df["status"].isin(gp_status)]
-        if gp_order_type:
-            instrument_df = instrument_df[
-                instrument_df["order_type"].isin(gp_order_type)
-            ]
-        # Apply location filters
-        if gp_region:
-            instrument_df = instrument_df[instrument_df["region"].isin(gp_region)]
-        if gp_country:
-            instrument_df = instrument_df[instrument_df["country"].isin(gp_country)]
-        if gp_state_province:
-            instrument_df = instrument_df[
-                instrument_df["state_province"].isin(gp_state_province)
-            ]
-        if gp_county:
-            instrument_df = instrument_df[instrument_df["county"].isin(gp_county)]
-        if gp_city:
-            instrument_df = instrument_df[instrument_df["city"].isin(gp_city)]
-        # Filter to only rows where has_instrument is True/Yes/1
-        has_instrument_true = (
-            (instrument_df["has_instrument"] == True)
-            | (instrument_df["has_instrument"] == 1)
-            | (
-                instrument_df["has_instrument"]
-                .astype(str)
-                .str.upper()
-                .isin(["YES", "TRUE", "1"])
-            )
+
+        cascade.multi_value("state_province", gp_state_province)
+        gp_county_opts = catalog.options("county", "multi", cascade.mask)
+
+        cascade.multi_value("county", gp_county)
+        gp_city_opts = catalog.options("city", "multi", cascade.mask)
+
+        # Order type and status filters: depend on jurisdiction level + all locations
+        cascade.multi_value("city", gp_city)
+        gp_order_type_opts = catalog.options("order_type", "multi", cascade.mask)
+        gp_status_opts = catalog.options("status", "multi", cascade.mask)
+
+        # Instrument and objective filters: depend on every other filter
+        # (single-value matching, use .isin())
+        attribute_rows = (
+            RowSelection(df)
+            .isin("jurisdiction_level", gp_jurisdiction_level)
+            .isin("status", gp_status)
+            .isin("order_type", gp_order_type)
+            .isin("region", gp_region)
+            .isin("country", gp_country)
+            .isin("state_province", gp_state_province)
+            .isin("county", gp_county)
+            .isin("city", gp_city)
+            .mask
         )
-        instrument_df = instrument_df[has_instrument_true]
-        # Get unique instrument values that are valid for current filters
-        valid_instrument_values = set(instrument_df["instrument"].dropna().unique())
 
         # Get all instrument options with disabled state
-        gp_instrument_opts = _get_instrument_options_with_disabled(df, instrument_df)
+        gp_instrument_opts = _get_attribute_options_with_disabled(
+            "instrument", df, attribute_rows
+        )
+        # Instrument values held by policies that match the current filters
+        valid_instrument_values = {
+            opt["value"] for opt in gp_instrument_opts if not opt["disabled"]
+        }
 
         # Check if current instrument selections are still valid, clear if not
         if gp_instrument:
@@ -469,47 +313,14 @@ def register_gp_tab1_callbacks(app, df):
         else:
             gp_instrument_value = []
 
-        objective_df = base_df.copy()
-        # Apply jurisdiction level filter first
-        if gp_jurisdiction_level:
-            objective_df = objective_df[
-                objective_df["jurisdiction_level"].isin(gp_jurisdiction_level)
-            ]
-        # Apply status and order_type filters (single-value filters, use .isin())
-        if gp_status:
-            objective_df = objective_df[objective_df["status"].isin(gp_status)]
-        if gp_order_type:
-            objective_df = objective_df[objective_df["order_type"].isin(gp_order_type)]
-        # Apply location filters
-        if gp_region:
-            objective_df = objective_df[objective_df["region"].isin(gp_region)]
-        if gp_country:
-            objective_df = objective_df[objective_df["country"].isin(gp_country)]
-        if gp_state_province:
-            objective_df = objective_df[
-                objective_df["state_province"].isin(gp_state_province)
-            ]
-        if gp_county:
-            objective_df = objective_df[objective_df["county"].isin(gp_county)]
-        if gp_city:
-            objective_df = objective_df[objective_df["city"].isin(gp_city)]
-        # Filter to only rows where has_objective is True/Yes/1
-        has_objective_true = (
-            (objective_df["has_objective"] == True)
-            | (objective_df["has_objective"] == 1)
-            | (
-                objective_df["has_objective"]
-                .astype(str)
-                .str.upper()
-                .isin(["YES", "TRUE", "1"])
-            )
-        )
-        objective_df = objective_df[has_objective_true]
-        # Get unique objective values that are valid for current filters
-        valid_objective_values = set(objective_df["objective"].dropna().unique())
-
         # Get all objective options with disabled state
-        gp_objective_opts = _get_objective_options_with_disabled(df, objective_df)
+        gp_objective_opts = _get_attribute_options_with_disabled(
+            "objective", df, attribute_rows
+        )
+        # Objective values held by policies that match the current filters
+        valid_objective_values = {
+            opt["value"] for opt in gp_objective_opts if not opt["disabled"]
+        }
 
         # Check if current objective selections are still valid, clear if not
         if gp_objective:
@@ -590,6 +401,8 @@ def register_gp_tab1_callbacks(app, df):
         if active_tab != "tab-1":
             raise dash.exceptions.PreventUpdate
 
+        df, version = datasets.get_with_version("globalpolicies")
+
         ctx = dash.callback_context
 
         if ctx.triggered:
@@ -597,13 +410,12 @@ def register_gp_tab1_callbacks(app, df):
 
             if trigger_id == "gp_clear-filters-btn":
                 # Show all data when cleared
-                filtered_df = df.copy()
+                selection = RowSelection(df)
                 filters_applied = False
 
             elif trigger_id == "gp_apply-filters-btn":
                 # Apply current filter states
-                filtered_df = filter_data(
-                    df,
+                selections = [
                     gp_jurisdiction_level,
                     gp_region,
                     gp_country,
@@ -614,35 +426,33 @@ def register_gp_tab1_callbacks(app, df):
                     gp_status,
                     gp_instrument,
                     gp_objective,
-                )
-                filters_applied = any(
-                    [
-                        gp_jurisdiction_level,
-                        gp_region,
-                        gp_country,
-                        gp_state_province,
-                        gp_county,
-                        gp_city,
-                        gp_order_type,
-                        gp_status,
-                        gp_instrument,
-                        gp_objective,
-                    ]
-                )
+                ]
+                selection = select_rows(df, *selections)
+                filters_applied = any(selections)
             else:
                 # Initial load or other trigger
-                filtered_df = df.copy()
+                selection = RowSelection(df)
                 filters_applied = False
         else:
             # Initial load - show all data
-            filtered_df = df.copy()
+            selection = RowSelection(df)
             filters_applied = False
 
-        # Create the chart figure
-        gp_stacked_area_fig = create_gp_stacked_area_plot(
-            filtered_df=filtered_df,
-            full_df=df,
-            filters_applied=filters_applied,
+        # Create the chart figure; it depends only on the selections
+        gp_stacked_area_fig = figure_cache.figure(
+            create_gp_stacked_area_plot,
+            version,
+            {
+                "selections": selections if filters_applied else None,
+                "filters_applied": filters_applied,
+                # the x axis runs to the current year
+                "year": datetime.now().year,
+            },
+            lambda: create_gp_stacked_area_plot(
+                filtered_df=selection.take(GP_STACKED_AREA_COLUMNS),
+                full_df=RowSelection(df).take(GP_STACKED_AREA_COLUMNS),
+                filters_applied=filters_applied,
+            ),
         )
 
         # Create chart component using create_chart_row
@@ -744,9 +554,7 @@ def register_gp_tab1_callbacks(app, df):
         root_dir = Path(__file__).parent.parent.parent.parent
         input_path = root_dir / "data" / "DCEWM-GlobalPolicies.xlsx"
 
-        # Debug print
-        print(f"Looking for file at: {input_path}")
-        print(f"File exists: {input_path.exists()}")
+        logger.debug("Looking for file at: %s (exists: %s)", input_path, input_path.exists())
 
         return create_filtered_excel_download(
             input_path=input_path,
@@ -10,27 +10,19 @@ from figures.global_policies.gp_treemap_chart import (
 )
 from components.excel_export import create_filtered_excel_download
 from pages.global_policies.gp_tab1 import create_chart_row
+from helpers.logging_config import get_logger
+from helpers.option_catalog import option_catalog, warm_option_catalog
+from helpers.row_selection import RowSelection
 
-def apply_multi_value_filter(df, column, selected_values):
-    """Helper function to apply multi-value string matching filter"""
-    if not selected_values:
-        return df
-
-    mask = pd.Series([False] * len(df), index=df.index)
-    for value in selected_values:
-        mask = mask | df[column].str.contains(value, case=False, na=False, regex=False)
-    return df[mask]
-
-def get_options(df, column):
-    """Get unique values from a dataframe column as dropdown options"""
-    if column not in df.columns:
-        return []
-    unique_values = df[column].dropna().unique()
-    return [
-        {"label": str(val), "value": val}
-        for val in sorted(unique_values)
-        if val is not None and str(val).strip()
-    ]
+logger = get_logger(__name__)
+
+# Filter columns whose options come from the dataset's option catalog
+GP_TRANSPOSED_OPTION_COLUMNS = {
+    "jurisdiction_level": "single",
+    "order_type": "single",
+    "status": "single",
+    "attr_value": "single",
+}
 
 def get_gp_last_modified_date():
     """Get the last modified date for DCEWM-GlobalPolicies.xlsx from metadata.json"""
@@ -64,7 +56,9 @@ def get_gp_last_modified_date():
         traceback.print_exc()
         return None
 
-def register_gp_tab2_callbacks(app, df):
+def register_gp_tab2_callbacks(app, datasets):
+    warm_option_catalog(datasets, "gp_transposed", GP_TRANSPOSED_OPTION_COLUMNS)
+
     # Update all filters and handle clearing
     @app.callback(
         [
@@ -104,39 +98,29 @@ def register_gp_tab2_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-2":
             raise dash.exceptions.PreventUpdate
 
+        df = datasets.get("gp_transposed")
+
         ctx = dash.callback_context
 
+        catalog = option_catalog(df)
+        is_instrument = RowSelection(df).equals("attr_type", "Instrument").mask
+        is_objective = RowSelection(df).equals("attr_type", "Objective").mask
+
         # Handle clear button click
         if ctx.triggered:
             trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
             if trigger_id == "gp_tab2_clear-filters-btn":
-                # Return all options and cleared values using stacked_df
-                #stacked_df = preprocess_treemap_data(df)
-                stacked_df = df.copy()
+                # Return all options and cleared values
                 # Get all instrument and objective options (all enabled when cleared)
-                all_instruments = set(
-                    stacked_df[stacked_df["attr_type"] == "Instrument"]["attr_value"]
-                    .dropna()
-                    .unique()
+                instrument_opts = catalog.flagged_options(
+                    "attr_value", is_instrument, within=is_instrument
                 )
-                all_objectives = set(
-                    stacked_df[stacked_df["attr_type"] == "Objective"]["attr_value"]
-                    .dropna()
-                    .unique()
+                objective_opts = catalog.flagged_options(
+                    "attr_value", is_objective, within=is_objective
                 )
-                instrument_opts = [
-                    {"label": str(val), "value": val, "disabled": False}
-                    for val in sorted(all_instruments)
-                    if val and str(val).strip()
-                ]
-                objective_opts = [
-                    {"label": str(val), "value": val, "disabled": False}
-                    for val in sorted(all_objectives)
-                    if val and str(val).strip()
-                ]
                 return (
-                    get_options(stacked_df, "order_type"),
-                    get_options(stacked_df, "status"),
+                    catalog.options("order_type"),
+                    catalog.options("status"),
                     {},  # Clear instrument style
                     {},  # Clear objective style
                     instrument_opts,  # All instrument options
@@ -147,46 +131,24 @@ def register_gp_tab2_callbacks(app, df):
                     None,  # Clear status value
                 )
 
-        # Preprocess data once to get stacked_df structure
-        # stacked_df = preprocess_treemap_data(df)
-        stacked_df = df.copy()
+        # Order type filter: no dependencies
+        gp_tab2_order_type_opts = catalog.options("order_type")
 
-        # Order type filter: depend on previously selected filters
-        order_type_df = stacked_df.copy()
-        gp_tab2_order_type_opts = get_options(order_type_df, "order_type")
+        # Status filter: depends on order type
+        selection = RowSelection(df).isin("order_type", gp_tab2_order_type)
+        gp_tab2_status_opts = catalog.options("status", mask=selection.mask)
 
-        status_df = stacked_df.copy()
-        if gp_tab2_order_type:
-            status_df = status_df[status_df["order_type"].isin(gp_tab2_order_type)]
-        gp_tab2_status_opts = get_options(status_df, "status")
+        # Instrument and objective filters: depend on status and order type
+        selection.isin("status", gp_tab2_status)
 
-        # Filter stacked_df for instrument options
-        instrument_df = stacked_df.copy()
-        # Apply status and order_type filters
-        if gp_tab2_status:
-            instrument_df = instrument_df[instrument_df["status"].isin(gp_tab2_status)]
-        if gp_tab2_order_type:
-            instrument_df = instrument_df[
-                instrument_df["order_type"].isin(gp_tab2_order_type)
-            ]
-        # Filter to only rows where attr_type is Instrument
-        instrument_df = instrument_df[instrument_df["attr_type"] == "Instrument"]
-        # Get unique instrument values that are valid for current filters
-        valid_instrument_values = set(instrument_df["attr_value"].dropna().unique())
-
-        # Get all instrument options with disabled state (use full stacked_df for all options)
-        all_instrument_df = stacked_df[stacked_df["attr_type"] == "Instrument"]
-        all_instruments = set(all_instrument_df["attr_value"].dropna().unique())
-        gp_tab2_instrument_opts = []
-        for val in sorted(all_instruments):
-            if val and str(val).strip():
-                gp_tab2_instrument_opts.append(
-                    {
-                        "label": str(val),
-                        "value": val,
-                        "disabled": val not in valid_instrument_values,
-                    }
-                )
+        # Get all instrument options with disabled state for the ones not
+        # valid under the current filters
+        gp_tab2_instrument_opts = catalog.flagged_options(
+            "attr_value", selection.mask & is_instrument, within=is_instrument
+        )
+        valid_instrument_values = {
+            opt["value"] for opt in gp_tab2_instrument_opts if not opt["disabled"]
+        }
 
         # Check if current instrument selections are still valid, clear if not
         if gp_tab2_instrument:
@@ -197,33 +159,13 @@ def register_gp_tab2_callbacks(app, df):
         else:
             gp_tab2_instrument_value = []
 
-        # Filter stacked_df for objective options
-        objective_df = stacked_df.copy()
-        # Apply status and order_type filters
-        if gp_tab2_status:
-            objective_df = objective_df[objective_df["status"].isin(gp_tab2_status)]
-        if gp_tab2_order_type:
-            objective_df = objective_df[
-                objective_df["order_type"].isin(gp_tab2_order_type)
-            ]
-        # Filter to only rows where attr_type is Objective
-        objective_df = objective_df[objective_df["attr_type"] == "Objective"]
-        # Get unique objective values that are valid for current filters
-        valid_objective_values = set(objective_df["attr_value"].dropna().unique())
-
-        # Get all objective options with disabled state (use full stacked_df for all options)
-        all_objective_df = stacked_df[stacked_df["attr_type"] == "Objective"]
-        all_objectives = set(all_objective_df["attr_value"].dropna().unique())
-        gp_tab2_objective_opts = []
-        for val in sorted(all_objectives):
-            if val and str(val).strip():
-                gp_tab2_objective_opts.append(
-                    {
-                        "label": str(val),
-                        "value": val,
-                        "disabled": val not in valid_objective_values,
-                    }
-                )
+        # Get all objective options with disabled state
+        gp_tab2_objective_opts = catalog.flagged_options(
+            "attr_value", selection.mask & is_objective, within=is_objective
+        )
+        valid_objective_values = {
+            opt["value"] for opt in gp_tab2_objective_opts if not opt["disabled"]
+        }
 
         # Check if current objective selections are still valid, clear if not
         if gp_tab2_objective:
@@ -283,6 +225,8 @@ def register_gp_tab2_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-2":
             raise dash.exceptions.PreventUpdate
 
+        df = datasets.get("gp_transposed")
+
         ctx = dash.callback_context
 
         if ctx.triggered:
@@ -518,9 +462,9 @@ def register_gp_tab2_callbacks(app, df):
         policy_ids_map = treemap_store.get("policy_ids_map", {})
         policy_metadata = treemap_store.get("policy_metadata", {})
 
-        print(f"\n=== TREEMAP CLICK ===")
-        print(f"Clicked: {clicked_node_id}")
-        print(f"Currently expanded: {expanded_leaf}")
+        logger.debug(
+            "Treemap click: %s (currently expanded: %s)", clicked_node_id, expanded_leaf
+        )
 
         # Make a copy of the figure to modify
         new_figure = copy.deepcopy(current_figure)
@@ -540,12 +484,12 @@ def register_gp_tab2_callbacks(app, df):
 
         # Toggle logic: if clicking the same leaf that's already expanded, collapse it
         if expanded_leaf and clicked_node_id == expanded_leaf:
-            print(f"DEBUG: Toggling OFF (same leaf clicked again)")
+            logger.debug("Toggling off (same leaf clicked again)")
             return new_figure, None
 
         # If not a final leaf, return clean labels and clear any expanded state
         if not is_final_leaf:
-            print(f"DEBUG: Not a final leaf, clearing expanded state")
+            logger.debug("Not a final leaf, clearing expanded state")
             return new_figure, None
 
         # Final leaf node - build policy details and update label
@@ -583,7 +527,7 @@ def register_gp_tab2_callbacks(app, df):
             labels = list(new_figure["data"][0]["labels"])
             labels[idx] = cell_content
             new_figure["data"][0]["labels"] = labels
-            print(f"DEBUG: Expanded leaf {clicked_node_id}")
+            logger.debug("Expanded leaf %s", clicked_node_id)
 
         # Return figure with policy details and store the expanded leaf ID
         return new_figure, clicked_node_id
@@ -598,9 +542,7 @@ def register_gp_tab2_callbacks(app, df):
         root_dir = Path(__file__).parent.parent.parent.parent
         input_path = root_dir / "data" / "DCEWM-GlobalPolicies.xlsx"
 
-        # Debug print
-        print(f"Looking for file at: {input_path}")
-        print(f"File exists: {input_path.exists()}")
+        logger.debug("Looking for file at: %s (exists: %s)", input_path, input_path.exists())
 
         return create_filtered_excel_download(
             input_path=input_path,
@@ -1,7 +1,6 @@
 import dash
 from pathlib import Path
 from dash import Input, Output, State, html
-import pandas as pd
 import json
 from datetime import datetime
 from figures.global_policies.gp_choropleth_map import (
@@ -9,33 +8,13 @@ from figures.global_policies.gp_choropleth_map import (
 )
 from components.excel_export import create_filtered_excel_download
 from pages.global_policies.gp_tab3 import create_chart_row
+from helpers.figure_cache import get_figure_cache
 from helpers.geojson_cache import get_geojson
+from helpers.option_catalog import option_catalog
+from helpers.row_selection import RowSelection
 import numpy as np
 
 
-def apply_multi_value_filter(df, column, selected_values):
-    """Helper function to apply multi-value string matching filter"""
-    if not selected_values:
-        return df
-
-    mask = pd.Series([False] * len(df), index=df.index)
-    for value in selected_values:
-        mask = mask | df[column].str.contains(value, case=False, na=False, regex=False)
-    return df[mask]
-
-
-def get_options(df, column):
-    """Get unique values from a dataframe column as dropdown options"""
-    if column not in df.columns:
-        return []
-    unique_values = df[column].dropna().unique()
-    return [
-        {"label": str(val), "value": val}
-        for val in sorted(unique_values)
-        if val is not None and str(val).strip()
-    ]
-
-
 def get_gp_last_modified_date():
     """Get the last modified date for DCEWM-GlobalPolicies.xlsx from metadata.json"""
     try:
@@ -69,7 +48,10 @@ def get_gp_last_modified_date():
         return None
 
 
-def register_gp_tab3_callbacks(app, df):
+def register_gp_tab3_callbacks(app, datasets):
+    # rendered figures are reused per (dataset version, selections)
+    figure_cache = get_figure_cache()
+
     # Update all filters and handle clearing
     @app.callback(
         [
@@ -113,39 +95,30 @@ def register_gp_tab3_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-3":
             raise dash.exceptions.PreventUpdate
 
+        df = datasets.get("gp_transposed")
+
         ctx = dash.callback_context
 
+        catalog = option_catalog(df)
+        is_instrument = RowSelection(df).equals("attr_type", "Instrument").mask
+        is_objective = RowSelection(df).equals("attr_type", "Objective").mask
+
         # Handle clear button click
         if ctx.triggered:
             trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
             if trigger_id == "gp_tab3_clear-filters-btn":
-                # Return all options and cleared values using map_df
-                map_df = df.copy()
+                # Return all options and cleared values
                 # Get all instrument and objective options (all enabled when cleared)
-                all_instruments = set(
-                    map_df[map_df["attr_type"] == "Instrument"]["attr_value"]
-                    .dropna()
-                    .unique()
+                instrument_opts = catalog.flagged_options(
+                    "attr_value", is_instrument, within=is_instrument
                 )
-                all_objectives = set(
-                    map_df[map_df["attr_type"] == "Objective"]["attr_value"]
-                    .dropna()
-                    .unique()
+                objective_opts = catalog.flagged_options(
+                    "attr_value", is_objective, within=is_objective
                 )
-                instrument_opts = [
-                    {"label": str(val), "value": val, "disabled": False}
-                    for val in sorted(all_instruments)
-                    if val and str(val).strip()
-                ]
-                objective_opts = [
-                    {"label": str(val), "value": val, "disabled": False}
-                    for val in sorted(all_objectives)
-                    if val and str(val).strip()
-                ]
                 return (
-                    get_options(map_df, "jurisdiction_level"),
-                    get_options(map_df, "order_type"),
-                    get_options(map_df, "status"),
+                    catalog.options("jurisdiction_level"),
+                    catalog.options("order_type"),
+                    catalog.options("status"),
                     {},  # Clear instrument style
                     {},  # Clear objective style
                     instrument_opts,  # All instrument options
@@ -157,82 +130,37 @@ def register_gp_tab3_callbacks(app, df):
                     None,  # Clear status value
                 )
 
-        # Preprocess data once to get map_df structure
-        map_df = df.copy()
-        # calculate total policies count per region
-        map_df["unique_per_country"] = map_df.groupby(
-            [
-                "country",
-                "country_iso_code",
-            ],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        map_df["unique_per_state"] = map_df.groupby(
-            ["country", "country_iso_code", "state_iso_code"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        city_policy_sum = map_df.groupby(
-            ["country", "country_iso_code", "state_iso_code", "city"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        # Add total count per city to the rows where city is not empty/null
-        map_df["unique_per_city"] = np.where(
-            (map_df["city"].notna()) & (map_df["city"] != ""), city_policy_sum, np.nan
-        )
-
         # Jurisdiction level filter: no dependencies
-        jurisdiction_level_df = map_df.copy()
-        gp_tab3_jurisdiction_level_opts = get_options(
-            jurisdiction_level_df, "jurisdiction_level"
+        gp_tab3_jurisdiction_level_opts = catalog.options("jurisdiction_level")
+
+        # Order type filter: depends on jurisdiction level
+        selection = RowSelection(df)
+        if gp_tab3_jurisdiction_level_opts:
+            selection.isin("jurisdiction_level", gp_tab3_jurisdiction_level)
+        gp_tab3_order_type_opts = catalog.options("order_type", mask=selection.mask)
+
+        # Status filter: depends on order type only
+        status_rows = RowSelection(df).isin("order_type", gp_tab3_order_type).mask
+        gp_tab3_status_opts = catalog.options("status", mask=status_rows)
+
+        # Instrument and objective filters: depend on jurisdiction level,
+        # status and order type
+        attribute_rows = (
+            RowSelection(df)
+            .isin("jurisdiction_level", gp_tab3_jurisdiction_level)
+            .isin("status", gp_tab3_status)
+            .isin("order_type", gp_tab3_order_type)
+            .mask
         )
 
-        # Order type filter: depend on previously selected filters
-        order_type_df = map_df.copy()
-        if gp_tab3_jurisdiction_level and gp_tab3_jurisdiction_level_opts:
-            order_type_df = order_type_df[
-                order_type_df["jurisdiction_level"].isin(gp_tab3_jurisdiction_level)
-            ]
-        gp_tab3_order_type_opts = get_options(order_type_df, "order_type")
-
-        status_df = map_df.copy()
-        if gp_tab3_order_type:
-            status_df = status_df[status_df["order_type"].isin(gp_tab3_order_type)]
-        gp_tab3_status_opts = get_options(status_df, "status")
-
-        # Filter map_df for instrument options
-        instrument_df = map_df.copy()
-        # Apply status and order_type filters
-        if gp_tab3_jurisdiction_level:
-            instrument_df = instrument_df[
-                instrument_df["jurisdiction_level"].isin(gp_tab3_jurisdiction_level)
-            ]
-        if gp_tab3_status:
-            instrument_df = instrument_df[instrument_df["status"].isin(gp_tab3_status)]
-        if gp_tab3_order_type:
-            instrument_df = instrument_df[
-                instrument_df["order_type"].isin(gp_tab3_order_type)
-            ]
-        # Filter to only rows where attr_type is Instrument
-        instrument_df = instrument_df[instrument_df["attr_type"] == "Instrument"]
-        # Get unique instrument values that are valid for current filters
-        valid_instrument_values = set(instrument_df["attr_value"].dropna().unique())
-
-        # Get all instrument options with disabled state (use full map_df for all options)
-        all_instrument_df = map_df[map_df["attr_type"] == "Instrument"]
-        all_instruments = set(all_instrument_df["attr_value"].dropna().unique())
-        gp_tab3_instrument_opts = []
-        for val in sorted(all_instruments):
-            if val and str(val).strip():
-                gp_tab3_instrument_opts.append(
-                    {
-                        "label": str(val),
-                        "value": val,
-                        "disabled": val not in valid_instrument_values,
-                    }
-                )
+        # Get all instrument options with disabled state for the ones not
+        # valid under the current filters
+        gp_tab3_instrument_opts = catalog.flagged_options(
+            "attr_value", attribute_rows & is_instrument, within=is_instrument
+        )
+        valid_instrument_values = {
+            opt["value"] for opt in gp_tab3_instrument_opts if not opt["disabled"]
+        }
 
         # Check if current instrument selections are still valid, clear if not
         if gp_tab3_instrument:
@@ -243,37 +171,13 @@ def register_gp_tab3_callbacks(app, df):
         else:
             gp_tab3_instrument_value = []
 
-        # Filter map_df for objective options
-        objective_df = map_df.copy()
-        # Apply status and order_type filters
-        if gp_tab3_jurisdiction_level:
-            objective_df = objective_df[
-                objective_df["jurisdiction_level"].isin(gp_tab3_jurisdiction_level)
-            ]
-        if gp_tab3_status:
-            objective_df = objective_df[objective_df["status"].isin(gp_tab3_status)]
-        if gp_tab3_order_type:
-            objective_df = objective_df[
-                objective_df["order_type"].isin(gp_tab3_order_type)
-            ]
-        # Filter to only rows where attr_type is Objective
-        objective_df = objective_df[objective_df["attr_type"] == "Objective"]
-        # Get unique objective values that are valid for current filters
-        valid_objective_values = set(objective_df["attr_value"].dropna().unique())
-
-        # Get all objective options with disabled state (use full map_df for all options)
-        all_objective_df = map_df[map_df["attr_type"] == "Objective"]
-        all_objectives = set(all_objective_df["attr_value"].dropna().unique())
-        gp_tab3_objective_opts = []
-        for val in sorted(all_objectives):
-            if val and str(val).strip():
-                gp_tab3_objective_opts.append(
-                    {
-                        "label": str(val),
-                        "value": val,
-                        "disabled": val not in valid_objective_values,
-                    }
-                )
+        # Get all objective options with disabled state
+        gp_tab3_objective_opts = catalog.flagged_options(
+            "attr_value", attribute_rows & is_objective, within=is_objective
+        )
+        valid_objective_values = {
+            opt["value"] for opt in gp_tab3_objective_opts if not opt["disabled"]
+        }
 
         # Check if current objective selections are still valid, clear if not
         if gp_tab3_objective:
@@ -336,6 +240,8 @@ def register_gp_tab3_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-3":
             raise dash.exceptions.PreventUpdate
 
+        df, version = datasets.get_with_version("gp_transposed")
+
         ctx = dash.callback_context
 
         if ctx.triggered:
@@ -363,103 +269,121 @@ def register_gp_tab3_callbacks(app, df):
             # Initial load - show all data
             filters_applied = False
 
-        # Preprocess data once
-        map_df = df.copy()
+        def build_map_fig():
+            # Preprocess data once
+            map_df = df.copy()
 
-        # Apply filters
-        filtered_map_df = map_df.copy()
-        if gp_tab3_jurisdiction_level:
-            filtered_map_df = filtered_map_df[
-                filtered_map_df["jurisdiction_level"].isin(gp_tab3_jurisdiction_level)
-            ]
-        if gp_tab3_order_type:
-            filtered_map_df = filtered_map_df[
-                filtered_map_df["order_type"].isin(gp_tab3_order_type)
-            ]
-        if gp_tab3_status:
-            filtered_map_df = filtered_map_df[
-                filtered_map_df["status"].isin(gp_tab3_status)
-            ]
-        if gp_tab3_instrument:
-            # Find all policy_ids that have the selected instruments
-            # Keep ALL rows (both Instrument and Objective) for those policies
-            instrument_policy_ids = filtered_map_df[
-                (filtered_map_df["attr_type"] == "Instrument")
-                & filtered_map_df["attr_value"].isin(gp_tab3_instrument)
-            ]["policy_id"].unique()
-            filtered_map_df = filtered_map_df[
-                filtered_map_df["policy_id"].isin(instrument_policy_ids)
-            ]
-        if gp_tab3_objective:
-            # Find all policy_ids that have the selected objectives
-            # Keep ALL rows (both Instrument and Objective) for those policies
-            objective_policy_ids = filtered_map_df[
-                (filtered_map_df["attr_type"] == "Objective")
-                & filtered_map_df["attr_value"].isin(gp_tab3_objective)
-            ]["policy_id"].unique()
-            filtered_map_df = filtered_map_df[
-                filtered_map_df["policy_id"].isin(objective_policy_ids)
-            ]
+            # Apply filters
+            filtered_map_df = map_df.copy()
+            if gp_tab3_jurisdiction_level:
+                filtered_map_df = filtered_map_df[
+                    filtered_map_df["jurisdiction_level"].isin(gp_tab3_jurisdiction_level)
+                ]
+            if gp_tab3_order_type:
+                filtered_map_df = filtered_map_df[
+                    filtered_map_df["order_type"].isin(gp_tab3_order_type)
+                ]
+            if gp_tab3_status:
+                filtered_map_df = filtered_map_df[
+                    filtered_map_df["status"].isin(gp_tab3_status)
+                ]
+            if gp_tab3_instrument:
+                # Find all policy_ids that have the selected instruments
+                # Keep ALL rows (both Instrument and Objective) for those policies
+                instrument_policy_ids = filtered_map_df[
+                    (filtered_map_df["attr_type"] == "Instrument")
+                    & filtered_map_df["attr_value"].isin(gp_tab3_instrument)
+                ]["policy_id"].unique()
+                filtered_map_df = filtered_map_df[
+                    filtered_map_df["policy_id"].isin(instrument_policy_ids)
+                ]
+            if gp_tab3_objective:
+                # Find all policy_ids that have the selected objectives
+                # Keep ALL rows (both Instrument and Objective) for those policies
+                objective_policy_ids = filtered_map_df[
+                    (filtered_map_df["attr_type"] == "Objective")
+                    & filtered_map_df["attr_value"].isin(gp_tab3_objective)
+                ]["policy_id"].unique()
+                filtered_map_df = filtered_map_df[
+                    filtered_map_df["policy_id"].isin(objective_policy_ids)
+                ]
 
-        map_geo_df = filtered_map_df.copy()
-
-        # Calculate unique policy counts per geographic level for filtered data
-        # This needs to be done on both dataframes before passing to chart
-        # Calculate on filtered_map_df first (used for country-level choropleth)
-        filtered_map_df["unique_per_country"] = filtered_map_df.groupby(
-            ["country", "country_iso_code"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        filtered_map_df["unique_per_state"] = filtered_map_df.groupby(
-            ["country", "country_iso_code", "state_iso_code"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        city_policy_sum = filtered_map_df.groupby(
-            ["country", "country_iso_code", "state_iso_code", "city"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        # Add total count per city to the rows where city is not empty/null
-        filtered_map_df["unique_per_city"] = np.where(
-            (filtered_map_df["city"].notna()) & (filtered_map_df["city"] != ""),
-            city_policy_sum,
-            np.nan,
-        )
+            map_geo_df = filtered_map_df.copy()
+
+            # Calculate unique policy counts per geographic level for filtered data
+            # This needs to be done on both dataframes before passing to chart
+            # Calculate on filtered_map_df first (used for country-level choropleth)
+            filtered_map_df["unique_per_country"] = filtered_map_df.groupby(
+                ["country", "country_iso_code"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            filtered_map_df["unique_per_state"] = filtered_map_df.groupby(
+                ["country", "country_iso_code", "state_iso_code"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            city_policy_sum = filtered_map_df.groupby(
+                ["country", "country_iso_code", "state_iso_code", "city"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            # Add total count per city to the rows where city is not empty/null
+            filtered_map_df["unique_per_city"] = np.where(
+                (filtered_map_df["city"].notna()) & (filtered_map_df["city"] != ""),
+                city_policy_sum,
+                np.nan,
+            )
 
-        # Calculate on map_geo_df as well (used for bubble locations and sizes)
-        # Since map_geo_df is a copy of filtered_map_df, we can safely copy the calculated columns
-        # But to be safe, recalculate to ensure alignment after geocoding
-        map_geo_df["unique_per_country"] = map_geo_df.groupby(
-            ["country", "country_iso_code"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        map_geo_df["unique_per_state"] = map_geo_df.groupby(
-            ["country", "country_iso_code", "state_iso_code"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        city_policy_sum_geo = map_geo_df.groupby(
-            ["country", "country_iso_code", "state_iso_code", "city"],
-            dropna=False,
-        )["deduped_policy_count"].transform("sum")
-
-        map_geo_df["unique_per_city"] = np.where(
-            (map_geo_df["city"].notna()) & (map_geo_df["city"] != ""),
-            city_policy_sum_geo,
-            np.nan,
-        )
+            # Calculate on map_geo_df as well (used for bubble locations and sizes)
+            # Since map_geo_df is a copy of filtered_map_df, we can safely copy the calculated columns
+            # But to be safe, recalculate to ensure alignment after geocoding
+            map_geo_df["unique_per_country"] = map_geo_df.groupby(
+                ["country", "country_iso_code"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            map_geo_df["unique_per_state"] = map_geo_df.groupby(
+                ["country", "country_iso_code", "state_iso_code"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            city_policy_sum_geo = map_geo_df.groupby(
+                ["country", "country_iso_code", "state_iso_code", "city"],
+                dropna=False,
+            )["deduped_policy_count"].transform("sum")
+
+            map_geo_df["unique_per_city"] = np.where(
+                (map_geo_df["city"].notna()) & (map_geo_df["city"] != ""),
+                city_policy_sum_geo,
+                np.nan,
+            )
+
+            # Get GeoJSON (from cache if available, otherwise URL)
+            geojson_data = get_geojson()
 
-        # Get GeoJSON (from cache if available, otherwise URL)
-        geojson_data = get_geojson()
+            # Create the chart figure (pass filtered_df for policy metadata display)
+            return create_gp_choropleth_map(
+                filtered_df=filtered_map_df,
+                filtered_geo_df=map_geo_df,
+                geojson=geojson_data,
+            )
 
-        # Create the chart figure (pass filtered_df for policy metadata display)
-        gp_choropleth_map_fig = create_gp_choropleth_map(
-            filtered_df=filtered_map_df,
-            filtered_geo_df=map_geo_df,
-            geojson=geojson_data,
+        # The map depends only on the selections; cached figures skip the
+        # filtering and aggregation above
+        gp_choropleth_map_fig = figure_cache.figure(
+            create_gp_choropleth_map,
+            version,
+            {
+                "selections": [
+                    gp_tab3_jurisdiction_level,
+                    gp_tab3_order_type,
+                    gp_tab3_status,
+                    gp_tab3_instrument,
+                    gp_tab3_objective,
+                ]
+            },
+            build_map_fig,
         )
 
         # Create chart component using create_chart_row
@@ -1,35 +1,41 @@
 import dash
 from pathlib import Path
 from dash import Input, Output, State # Dash, callback, dcc, html, callback_context
-import pandas as pd
-from figures.pue_wue.pue_chart import create_pue_scatter_plot
-from figures.pue_wue.wue_chart import create_wue_scatter_plot
-from figures.pue_wue.pue_wue_chart import create_pue_wue_scatter_plot
+from figures.pue_wue.pue_chart import PUE_CHART_COLUMNS, create_pue_scatter_plot
+from figures.pue_wue.wue_chart import WUE_CHART_COLUMNS, create_wue_scatter_plot
+from figures.pue_wue.pue_wue_chart import (
+    PUE_WUE_CHART_COLUMNS,
+    create_pue_wue_scatter_plot,
+)
 # from figures.pue_wue_reporting_heatmap import create_pue_wue_reporting_heatmap_plot
 from components.excel_export import create_filtered_excel_download
-
-
-def apply_multi_value_filter(df, column, selected_values):
-    """Helper function to apply multi-value string matching filter"""
-    if not selected_values:
-        return df
-
-    mask = pd.Series([False] * len(df), index=df.index)
-    for value in selected_values:
-        mask = mask | df[column].str.contains(value, case=False, na=False, regex=False)
-    return df[mask]
-
-
-def get_multi_value_options(df, column):
-    """Extract unique values from multi-value fields"""
-    all_values = set()
-    for value_str in df[column].dropna().unique():
-        values = [v.strip() for v in str(value_str).split(",")]
-        all_values.update(values)
-    return [{"label": val, "value": val} for val in sorted(all_values) if val]
-
-
-def filter_data(
+from helpers.row_selection import RowSelection
+from helpers.filter_cache import FilterCache
+from helpers.figure_cache import get_figure_cache
+from helpers.option_catalog import option_catalog, warm_option_catalog
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Filter columns whose options come from the dataset's option catalog
+PUE_WUE_OPTION_COLUMNS = {
+    "company_name": "single",
+    "time_period_category": "single",
+    "measurement_category": "single",
+    "metric_type": "single",
+    "facility_scope": "single",
+    "region": "multi",
+    "country": "multi",
+    "state_province": "multi",
+    "county": "multi",
+    "city": "multi",
+    "assigned_climate_zones": "multi",
+    "default_climate_zones": "multi",
+    "assigned_cooling_technologies": "multi",
+}
+
+
+def select_rows(
     df,
     company_name,
     time_period_category,
@@ -45,47 +51,40 @@ def filter_data(
     default_climate_zones,
     cooling_technologies,
 ):
-    """Filter dataframe based on all selections"""
-    filtered_df = df.copy()
+    """Return the RowSelection of all filter selections (nothing is copied)"""
+    selection = RowSelection(df)
 
     # Standard single-value filters
-    if company_name:
-        filtered_df = filtered_df[filtered_df["company_name"].isin(company_name)]
-    if time_period_category:
-        filtered_df = filtered_df[
-            filtered_df["time_period_category"].isin(time_period_category)
-        ]
-    if measurement_category:
-        filtered_df = filtered_df[
-            filtered_df["measurement_category"].isin(measurement_category)
-        ]
-    if metric_type:
-        filtered_df = filtered_df[filtered_df["metric_type"].isin(metric_type)]
-    if facility_scope:
-        filtered_df = filtered_df[filtered_df["facility_scope"].isin(facility_scope)]
+    selection.isin("company_name", company_name)
+    selection.isin("time_period_category", time_period_category)
+    selection.isin("measurement_category", measurement_category)
+    selection.isin("metric_type", metric_type)
+    selection.isin("facility_scope", facility_scope)
 
     # Multi-value address fields
-    filtered_df = apply_multi_value_filter(filtered_df, "region", region)
-    filtered_df = apply_multi_value_filter(filtered_df, "country", country)
-    filtered_df = apply_multi_value_filter(filtered_df, "state_province", state)
-    filtered_df = apply_multi_value_filter(filtered_df, "county", county)
-    filtered_df = apply_multi_value_filter(filtered_df, "city", city)
+    selection.multi_value("region", region)
+    selection.multi_value("country", country)
+    selection.multi_value("state_province", state)
+    selection.multi_value("county", county)
+    selection.multi_value("city", city)
 
     # Multi-value climate and cooling fields
-    filtered_df = apply_multi_value_filter(
-        filtered_df, "assigned_climate_zones", assigned_climate_zones
-    )
+    selection.multi_value("assigned_climate_zones", assigned_climate_zones)
     # TODO: Temporarily disabled - enable when default climate zones are finalized
-    # filtered_df = apply_multi_value_filter(
-    #     filtered_df, "default_climate_zones", default_climate_zones
-    # )
+    # selection.multi_value("default_climate_zones", default_climate_zones)
     # TODO: Temporarily disabled - enable when cooling technology options are finalized
-    # filtered_df = apply_multi_value_filter(filtered_df, 'assigned_cooling_technologies', cooling_technologies)
+    # selection.multi_value("assigned_cooling_technologies", cooling_technologies)
+
+    return selection
 
-    return filtered_df
 
+def register_pue_wue_callbacks(app, datasets):
+    # repeated filter selections are served as row positions into the dataset
+    filter_cache = FilterCache("pue_wue")
+    # rendered figures are reused per (chart, dataset version, selections)
+    figure_cache = get_figure_cache()
+    warm_option_catalog(datasets, "pue_wue", PUE_WUE_OPTION_COLUMNS)
 
-def register_pue_wue_callbacks(app, df):
     # Update all filters
     @app.callback(
         [
@@ -130,48 +129,27 @@ def register_pue_wue_callbacks(app, df):
         default_climate_zone,
         cooling_technologies,
     ):
-        # Start with full data for each filter's options
-        base_df = df.copy()
-
-        # Apply company filter first to all subsequent filters
-        if company_name:
-            base_df = base_df[base_df["company_name"].isin(company_name)]
-
-        # Location filters: depend on company + higher level locations
-        region_df = base_df.copy()
-        region_opts = get_multi_value_options(region_df, "region")
-
-        country_df = base_df.copy()
-        country_df = apply_multi_value_filter(country_df, "region", region)
-        country_opts = get_multi_value_options(country_df, "country")
-
-        state_df = base_df.copy()
-        state_df = apply_multi_value_filter(state_df, "region", region)
-        state_df = apply_multi_value_filter(state_df, "country", country)
-        state_opts = get_multi_value_options(state_df, "state_province")
-
-        county_df = base_df.copy()
-        county_df = apply_multi_value_filter(county_df, "region", region)
-        county_df = apply_multi_value_filter(county_df, "country", country)
-        county_df = apply_multi_value_filter(county_df, "state_province", state)
-        county_opts = get_multi_value_options(county_df, "county")
-
-        city_df = base_df.copy()
-        city_df = apply_multi_value_filter(city_df, "region", region)
-        city_df = apply_multi_value_filter(city_df, "country", country)
-        city_df = apply_multi_value_filter(city_df, "state_province", state)
-        city_df = apply_multi_value_filter(city_df, "county", county)
-        city_opts = get_multi_value_options(city_df, "city")
+        df = datasets.get("pue_wue")
+        catalog = option_catalog(df)
+        # Cascading filters: each level's options see the company filter and
+        # the locations above it, read from the dataset's option catalog
+        cascade = RowSelection(df).isin("company_name", company_name)
+        region_opts = catalog.options("region", "multi", cascade.mask)
 
-        # Climate filters: depend on company and facility scope + all location filters
-        climate_df = base_df.copy()
+        cascade.multi_value("region", region)
+        country_opts = catalog.options("country", "multi", cascade.mask)
+
+        cascade.multi_value("country", country)
+        state_opts = catalog.options("state_province", "multi", cascade.mask)
 
-        # Apply all location filters to climate data
-        climate_df = apply_multi_value_filter(climate_df, "region", region)
-        climate_df = apply_multi_value_filter(climate_df, "country", country)
-        climate_df = apply_multi_value_filter(climate_df, "state_province", state)
-        climate_df = apply_multi_value_filter(climate_df, "county", county)
-        climate_df = apply_multi_value_filter(climate_df, "city", city)
+        cascade.multi_value("state_province", state)
+        county_opts = catalog.options("county", "multi", cascade.mask)
+
+        cascade.multi_value("county", county)
+        city_opts = catalog.options("city", "multi", cascade.mask)
+
+        # Climate filters: depend on company and facility scope + all location filters
+        cascade.multi_value("city", city)
 
         # Disable climate filters if Fleet-wide is selected
         climate_disabled = facility_scope and "Fleet-wide" in facility_scope
@@ -180,14 +158,15 @@ def register_pue_wue_callbacks(app, df):
         ):
             climate_opts = default_opts = cooling_opts = []
         else:
-            if facility_scope:
-                climate_df = climate_df[
-                    climate_df["facility_scope"].isin(facility_scope)
-                ]
-            climate_opts = get_multi_value_options(climate_df, "assigned_climate_zones")
-            default_opts = get_multi_value_options(climate_df, "default_climate_zones")
-            cooling_opts = get_multi_value_options(
-                climate_df, "assigned_cooling_technologies"
+            cascade.isin("facility_scope", facility_scope)
+            climate_opts = catalog.options(
+                "assigned_climate_zones", "multi", cascade.mask
+            )
+            default_opts = catalog.options(
+                "default_climate_zones", "multi", cascade.mask
+            )
+            cooling_opts = catalog.options(
+                "assigned_cooling_technologies", "multi", cascade.mask
             )
 
         # Climate section styling
@@ -293,23 +272,9 @@ def register_pue_wue_callbacks(app, df):
         default_climate_zones,
         cooling_technologies,
     ):
-        # Get filtered data
-        filtered_df = filter_data(
-            df,
-            company,
-            time_period_category,
-            measurement_category,
-            metric_type,
-            facility_scope,
-            region,
-            country,
-            state,
-            county,
-            city,
-            assigned_climate_zones,
-            default_climate_zones,
-            cooling_technologies,
-        )
+        # frame and version as one pair, so cached rows and figures always
+        # come from the frame of the version they are stored under
+        df, version = datasets.get_with_version("pue_wue")
 
         ctx = dash.callback_context
 
@@ -318,13 +283,12 @@ def register_pue_wue_callbacks(app, df):
 
             if trigger_id == "clear-filters-btn":
                 # Show all data in gray when cleared
-                filtered_df = df.copy()
+                selection = RowSelection(df)
                 filters_applied = False
 
             elif trigger_id == "apply-filters-btn":
                 # Apply current filter states
-                filtered_df = filter_data(
-                    df,
+                selections = [
                     company,
                     time_period_category,
                     measurement_category,
@@ -338,50 +302,57 @@ def register_pue_wue_callbacks(app, df):
                     assigned_climate_zones,
                     default_climate_zones,
                     cooling_technologies,
+                ]
+                selection = filter_cache.select(
+                    df, version, select_rows, *selections
                 )
-                filters_applied = any(
-                    [
-                        company,
-                        time_period_category,
-                        measurement_category,
-                        metric_type,
-                        facility_scope,
-                        region,
-                        country,
-                        state,
-                        county,
-                        city,
-                        assigned_climate_zones,
-                        default_climate_zones,
-                        cooling_technologies,
-                    ]
-                )
+                filters_applied = any(selections)
             else:
                 return dash.no_update, dash.no_update
         else:
             # Initial load
-            filtered_df = df.copy()
+            selection = RowSelection(df)
             filters_applied = False
 
-        # Split data by metric type in callback
-        pue_filtered_df = filtered_df[filtered_df["metric"] == "pue"].copy()
-        pue_filtered_df = pue_filtered_df[pue_filtered_df["metric_value"].notna()]
-        wue_filtered_df = filtered_df[filtered_df["metric"] == "wue"].copy()
-        wue_filtered_df = wue_filtered_df[wue_filtered_df["metric_value"].notna()]
+        # Both figures depend only on the selections and the dataset version
+        figure_state = {
+            "selections": selections if filters_applied else None,
+            "filters_applied": filters_applied,
+        }
 
-        # Split unfiltered data for background
-        pue_full_df = df[df["metric"] == "pue"].copy()
-        wue_full_df = df[df["metric"] == "wue"].copy()
+        # Split data by metric type in callback; each chart gets one narrow
+        # slice of the rows and columns it shows
+        def build_pue_fig():
+            return create_pue_scatter_plot(
+                filtered_df=RowSelection(df)
+                .where(selection.mask)
+                .equals("metric", "pue")
+                .notna("metric_value")
+                .take(PUE_CHART_COLUMNS),
+                full_df=RowSelection(df)
+                .equals("metric", "pue")
+                .take(PUE_CHART_COLUMNS),
+                filters_applied=filters_applied,
+            )
 
-        pue_fig = create_pue_scatter_plot(
-            filtered_df=pue_filtered_df,
-            full_df=pue_full_df,
-            filters_applied=filters_applied,
+        def build_wue_fig():
+            return create_wue_scatter_plot(
+                filtered_df=RowSelection(df)
+                .where(selection.mask)
+                .equals("metric", "wue")
+                .notna("metric_value")
+                .take(WUE_CHART_COLUMNS),
+                full_df=RowSelection(df)
+                .equals("metric", "wue")
+                .take(WUE_CHART_COLUMNS),
+                filters_applied=filters_applied,
+            )
+
+        pue_fig = figure_cache.figure(
+            create_pue_scatter_plot, version, figure_state, build_pue_fig
         )
-        wue_fig = create_wue_scatter_plot(
-            filtered_df=wue_filtered_df,
-            full_df=wue_full_df,
-            filters_applied=filters_applied,
+        wue_fig = figure_cache.figure(
+            create_wue_scatter_plot, version, figure_state, build_wue_fig
         )
 
         return pue_fig, wue_fig
@@ -405,6 +376,7 @@ def register_pue_wue_callbacks(app, df):
     def update_pue_wue_scatter_plot(apply_clicks, clear_clicks, company):
         """Handle PUE vs WUE figure with company filter only"""
 
+        df = datasets.get("pue_wue")
         ctx = dash.callback_context
 
         if ctx.triggered:
@@ -412,10 +384,7 @@ def register_pue_wue_callbacks(app, df):
 
             if trigger_id == "clear-filters-btn":
                 # PUE-WUE data (from df)
-                pue_wue_filtered_df = df[df["metric"] == "pue"].copy()
-                pue_wue_filtered_df = pue_wue_filtered_df[
-                    pue_wue_filtered_df["wue_value"].notna()
-                ]
+                selection = RowSelection(df)
 
                 # # PUE Trends data (from pue_wue_companies_df)
                 # trends_filtered_df = pue_wue_companies_df.copy()
@@ -424,18 +393,8 @@ def register_pue_wue_callbacks(app, df):
 
             elif trigger_id == "apply-filters-btn":
                 # Apply company filter to FIRST dataframe
-                if company:
-                    pue_wue_filtered_df = df[
-                        (df["metric"] == "pue") & (df["company_name"].isin(company))
-                    ].copy()
-                    filters_applied = True
-                else:
-                    pue_wue_filtered_df = df[df["metric"] == "pue"].copy()
-                    filters_applied = False
-
-                pue_wue_filtered_df = pue_wue_filtered_df[
-                    pue_wue_filtered_df["wue_value"].notna()
-                ]
+                selection = RowSelection(df).isin("company_name", company)
+                filters_applied = bool(company)
 
                 # # Apply company filter to second dataframe
                 # if company:
@@ -449,18 +408,24 @@ def register_pue_wue_callbacks(app, df):
                 return dash.no_update, dash.no_update
         else:
             # Initial load - show all data from BOTH dataframes
-            pue_wue_filtered_df = df[df["metric"] == "pue"].copy()
-            pue_wue_filtered_df = pue_wue_filtered_df[
-                pue_wue_filtered_df["wue_value"].notna()
-            ]
+            selection = RowSelection(df)
 
             # trends_filtered_df = pue_wue_companies_df.copy()
 
             filters_applied = False
 
         # Create PUE-WUE chart (using df)
-        pue_wue_full_df = df[df["metric"] == "pue"].copy()
-        pue_wue_full_df = pue_wue_full_df[pue_wue_full_df["wue_value"].notna()]
+        pue_wue_filtered_df = (
+            selection.equals("metric", "pue")
+            .notna("wue_value")
+            .take(PUE_WUE_CHART_COLUMNS)
+        )
+        pue_wue_full_df = (
+            RowSelection(df)
+            .equals("metric", "pue")
+            .notna("wue_value")
+            .take(PUE_WUE_CHART_COLUMNS)
+        )
 
         pue_wue_fig = create_pue_wue_scatter_plot(
             filtered_df=pue_wue_filtered_df,
@@ -587,9 +552,7 @@ def register_pue_wue_callbacks(app, df):
         root_dir = Path(__file__).parent.parent.parent.parent
         input_path = root_dir / "data" / "DCEWM-PUEDataset.xlsx"
 
-        # Debug print
-        print(f"Looking for file at: {input_path}")
-        print(f"File exists: {input_path.exists()}")
+        logger.debug("Looking for file at: %s (exists: %s)", input_path, input_path.exists())
 
         return create_filtered_excel_download(
             input_path=input_path,
@@ -650,9 +613,7 @@ def register_pue_wue_callbacks(app, df):
         root_dir = Path(__file__).parent.parent.parent.parent
         input_path = root_dir / "data" / "DCEWM-WUEDataset.xlsx"
 
-        # Debug print
-        print(f"Looking for file at: {input_path}")
-        print(f"File exists: {input_path.exists()}")
+        logger.debug("Looking for file at: %s (exists: %s)", input_path, input_path.exists())
 
         return create_filtered_excel_download(
             input_path=input_path,
@@ -702,9 +663,7 @@ def register_pue_wue_callbacks(app, df):
         root_dir = Path(__file__).parent.parent.parent.parent
         input_path = root_dir / "data" / "DCEWM-PUEDataset.xlsx"
 
-        # Debug print
-        print(f"Looking for file at: {input_path}")
-        print(f"File exists: {input_path.exists()}")
+        logger.debug("Looking for file at: %s (exists: %s)", input_path, input_path.exists())
 
         return create_filtered_excel_download(
             input_path=input_path,
@@ -15,13 +15,13 @@ _rt_callbacks_registered = False
 ID_PREFIX = "rt-"
 
 
-def register_rt_page_callbacks(app, reporting_df, pue_wue_companies_df=None):
+def register_rt_page_callbacks(app, datasets):
     """Registers all callbacks related to the Company Reporting Trends page.
 
     Args:
         app: Dash app instance
-        reporting_df: DataFrame with reporting data (for tabs 1-3)
-        pue_wue_companies_df: DataFrame with PUE/WUE companies data (for tabs 4-5)
+        datasets: DatasetRegistry providing "reporting" (tabs 1-3) and
+            "pue_wue_companies" (tabs 4-5)
     """
     global _rt_callbacks_registered
 
@@ -66,17 +66,17 @@ def register_rt_page_callbacks(app, reporting_df, pue_wue_companies_df=None):
             # Extract tab value from button ID (e.g., 'rt-tab-btn-tab-1' -> 'tab-1')
             active_tab = button_id.replace(f"{ID_PREFIX}tab-btn-", "")
 
-        # Render content based on active tab
+        # Render content based on active tab; only its dataset is loaded
         if active_tab == "tab-1":
-            content = create_rt_tab1(app, reporting_df)
+            content = create_rt_tab1(app, datasets.get("reporting"))
         elif active_tab == "tab-2":
-            content = create_rt_tab2(app, reporting_df)
+            content = create_rt_tab2(app, datasets.get("reporting"))
         elif active_tab == "tab-3":
-            content = create_rt_tab3(app, reporting_df)
+            content = create_rt_tab3(app, datasets.get("reporting"))
         elif active_tab == "tab-4":
-            content = create_rt_tab4(app, pue_wue_companies_df)
+            content = create_rt_tab4(app, datasets.get("pue_wue_companies"))
         elif active_tab == "tab-5":
-            content = create_rt_tab5(app, pue_wue_companies_df)
+            content = create_rt_tab5(app, datasets.get("pue_wue_companies"))
         else:
             content = html.Div("Select a tab to explore or learn about data.")
 
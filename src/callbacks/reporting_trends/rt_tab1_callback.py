@@ -5,6 +5,7 @@ import json
 from datetime import datetime
 from figures.reporting_trends.reporting_barchart import create_reporting_bar_plot
 from components.excel_export import create_filtered_excel_download
+from helpers.row_selection import RowSelection
 from components.figure_card import create_figure_card
 
 
@@ -36,26 +37,15 @@ def get_rt_last_modified_date():
 
 
 def filter_data_by_year_range(df, from_year, to_year):
-    """Filter dataframe by year range"""
-    if df.empty:
-        return df
-
-    filtered_df = df.copy()
-
-    if from_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] >= from_year]
-
-    if to_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] <= to_year]
-
-    return filtered_df
+    """Filter dataframe by year range (both bounds in one mask, one slice)"""
+    return RowSelection(df).between("reported_data_year", from_year, to_year).take()
 
 
 # ID prefix for this page's components
 ID_PREFIX = "rt-"
 
 
-def register_rt_tab1_callbacks(app, df):
+def register_rt_tab1_callbacks(app, datasets):
     """Register callbacks for RT Tab 1 (Reporting Adoption barchart).
 
     Filters are inside each tab. Filter values are synced via rt-filter-store
@@ -77,6 +67,8 @@ def register_rt_tab1_callbacks(app, df):
         if active_tab is not None and active_tab != "tab-1":
             raise dash.exceptions.PreventUpdate
 
+        df = datasets.get("reporting")
+
         # Get filter values from store - convert to Python int
         from_year = None
         to_year = None
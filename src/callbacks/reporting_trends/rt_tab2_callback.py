@@ -6,6 +6,8 @@ from datetime import datetime
 import pandas as pd
 from figures.reporting_trends.energy_reporting_heatmap import create_energy_reporting_heatmap
 from components.excel_export import create_filtered_excel_download
+from helpers.figure_cache import get_figure_cache
+from helpers.row_selection import RowSelection
 
 
 def get_rt_last_modified_date():
@@ -35,27 +37,15 @@ def get_rt_last_modified_date():
         return None
 
 
-def filter_data_by_year_range(df, from_year, to_year):
-    """Filter dataframe by year range"""
-    if df.empty:
-        return df
-
-    filtered_df = df.copy()
-
-    if from_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] >= from_year]
-
-    if to_year is not None:
-        filtered_df = filtered_df[filtered_df["reported_data_year"] <= to_year]
-
-    return filtered_df
-
-
-def filter_data_by_companies(df, companies, company_col="company_name"):
-    """Filter dataframe by selected companies"""
-    if df.empty or not companies:
-        return df
-    return df[df[company_col].isin(companies)]
+def select_rows(
+    df, from_year, to_year, companies, year_col="reported_data_year", company_col="company_name"
+):
+    """Return the RowSelection of the year range and company filters (nothing is copied)"""
+    return (
+        RowSelection(df)
+        .between(year_col, from_year, to_year)
+        .isin(company_col, companies)
+    )
 
 def get_processed_reporting_data(df, filter_data):
     """
@@ -73,16 +63,17 @@ def get_processed_reporting_data(df, filter_data):
     sort_by = filter_data.get("sort_by", "company_name")
     sort_order = filter_data.get("sort_order", "asc")
 
-    # 2. Sequential Filtering
-    filtered_df = filter_data_by_year_range(df, from_year, to_year)
-    filtered_df = filter_data_by_companies(filtered_df, companies)
+    # 2. Year range and company filters (masks only, nothing is copied)
+    selection = select_rows(df, from_year, to_year, companies)
 
     # 3. "At Least Once" Status Filtering
     if tab2_reporting_status and len(tab2_reporting_status) > 0:
         data_status_values = [_TAB2_STATUS_TO_DATA.get(s, s) for s in tab2_reporting_status]
-        mask = filtered_df["reporting_status"].isin(data_status_values)
-        valid_companies = filtered_df[mask]["company_name"].unique()
-        filtered_df = filtered_df[filtered_df["company_name"].isin(valid_companies)]
+        mask = selection.mask & df["reporting_status"].isin(data_status_values).to_numpy()
+        valid_companies = df["company_name"][mask].unique()
+        selection.where(df["company_name"].isin(valid_companies))
+        # the selected rows are materialized once
+        filtered_df = selection.take()
     else:
         # Return empty if no status is selected (as per your current logic)
         return pd.DataFrame(columns=df.columns)
@@ -101,12 +92,17 @@ def get_processed_reporting_data(df, filter_data):
         if sort_by == "reporting_status":
                 # Weighted sort: total_company_score then company_name (case-insensitive)
                 temp_df = filtered_df.copy()
+                # statuses may be categorical (optimize_dtypes); map plain values to float scores
                 temp_df["year_score"] = (
-                    temp_df["reporting_status"].map(status_weights).fillna(0)
+                    temp_df["reporting_status"]
+                    .astype(object)
+                    .map(status_weights)
+                    .astype(float)
+                    .fillna(0)
                 )
                 scores = temp_df.groupby("company_name")["year_score"].sum()
-                filtered_df["total_company_score"] = filtered_df["company_name"].map(
-                    scores
+                filtered_df["total_company_score"] = (
+                    filtered_df["company_name"].astype(object).map(scores)
                 )
                 filtered_df["company_name_lower"] = (
                     filtered_df["company_name"].str.lower()
@@ -141,13 +137,25 @@ _TAB2_STATUS_TO_DATA = {
 ID_PREFIX = "rt-"
 
 
-def register_rt_tab2_callbacks(app, df, pue_wue_companies_df=None):
+def register_rt_tab2_callbacks(app, datasets):
     """Register callbacks for Tab2 of the company reporting trends page (energy reporting heatmap).
 
     Filters are inside each tab. Filter values are synced via rt-filter-store to preserve the user's selections
     when switchng tabs.
     """
 
+    # Rendered heatmaps are reused per (dataset version, stored filters, variant)
+    figure_cache = get_figure_cache()
+
+    def heatmap_figure(version, filter_data, filtered_df, **options):
+        """Return the heatmap of the stored filters, from the figure cache when possible."""
+        return figure_cache.figure(
+            create_energy_reporting_heatmap,
+            version,
+            {"filters": filter_data, **options},
+            lambda: create_energy_reporting_heatmap(filtered_df, **options),
+        )
+
     # Callback to update chart when filters or tab changes
     @app.callback(
         # Output("rt-fig2-container", "children"),
@@ -166,13 +174,19 @@ def register_rt_tab2_callbacks(app, df, pue_wue_companies_df=None):
         # Only process if we're on tab-2 (allow None for initial load)
         if active_tab is not None and active_tab != "tab-2":
             raise dash.exceptions.PreventUpdate
+
+        df, version = datasets.get_with_version("reporting")
         
         filtered_df = get_processed_reporting_data(df, filter_data)
 
         # Create Header (legend and x-axis)
-        header_fig = create_energy_reporting_heatmap(filtered_df, header_only=True)
+        header_fig = heatmap_figure(
+            version, filter_data, filtered_df, header_only=True
+        )
         # Create Body (the actual data rows)
-        body_fig = create_energy_reporting_heatmap(filtered_df, header_only=False)
+        body_fig = heatmap_figure(
+            version, filter_data, filtered_df, header_only=False
+        )
 
         header_card = dcc.Graph(
             figure=header_fig,
@@ -208,6 +222,7 @@ def register_rt_tab2_callbacks(app, df, pue_wue_companies_df=None):
     )
     def toggle_rt_tab2_modal(expand_clicks, is_open, filter_data):
         """Toggle the expanded modal view"""
+        df, version = datasets.get_with_version("reporting")
         if not expand_clicks:
             raise dash.exceptions.PreventUpdate
 
@@ -231,8 +246,8 @@ def register_rt_tab2_callbacks(app, df, pue_wue_companies_df=None):
             modal_title = "Energy Reporting by Company Over Time"
 
         filtered_df = get_processed_reporting_data(df, filter_data)
-        expanded_fig = create_energy_reporting_heatmap(
-            filtered_df, header_only=False, is_expanded=True
+        expanded_fig = heatmap_figure(
+            version, filter_data, filtered_df, header_only=False, is_expanded=True
         )
 
         num_rows = len(filtered_df["company_name"].unique())
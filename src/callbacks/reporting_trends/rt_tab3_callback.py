@@ -5,6 +5,7 @@ import json
 from datetime import datetime
 from components.excel_export import create_filtered_excel_download
 from components.figure_card import create_figure_card
+from helpers.row_selection import RowSelection
 
 # Placeholder for water reporting heatmap - to be implemented
 # For now, we'll create a simple placeholder figure
@@ -35,34 +36,27 @@ def get_rt_last_modified_date():
         return None
 
 
-def filter_data_by_year_range(df, from_year, to_year, year_col="reported_data_year"):
-    """Filter dataframe by year range"""
-    if df.empty:
-        return df
-
-    filtered_df = df.copy()
-
-    if from_year is not None:
-        filtered_df = filtered_df[filtered_df[year_col] >= from_year]
-
-    if to_year is not None:
-        filtered_df = filtered_df[filtered_df[year_col] <= to_year]
-
-    return filtered_df
-
-
-def filter_data_by_companies(df, companies, company_col="company_name"):
-    """Filter dataframe by selected companies"""
-    if df.empty or not companies:
-        return df
-    return df[df[company_col].isin(companies)]
+def select_rows(
+    df,
+    from_year,
+    to_year,
+    companies,
+    year_col="reported_data_year",
+    company_col="company_name",
+):
+    """Return the RowSelection of the year range and company filters (nothing is copied)"""
+    return (
+        RowSelection(df)
+        .between(year_col, from_year, to_year)
+        .isin(company_col, companies)
+    )
 
 
 # ID prefix for this page's components
 ID_PREFIX = "rt-"
 
 
-def register_rt_tab3_callbacks(app, reporting_df, pue_wue_companies_df=None):
+def register_rt_tab3_callbacks(app, datasets):
     """Register callbacks for RT Tab 3 (Water Reporting heatmap).
 
     Filters are inside each tab. Filter values are synced via rt-filter-store
@@ -84,29 +78,8 @@ def register_rt_tab3_callbacks(app, reporting_df, pue_wue_companies_df=None):
         if active_tab is not None and active_tab != "tab-3":
             raise dash.exceptions.PreventUpdate
 
-        # Get filter values from store
-        from_year = None
-        to_year = None
-        companies = None
-
-        if filter_data:
-            from_year = (
-                int(filter_data.get("from_year"))
-                if filter_data.get("from_year")
-                else None
-            )
-            to_year = (
-                int(filter_data.get("to_year")) if filter_data.get("to_year") else None
-            )
-            companies = filter_data.get("companies")
-
-        # Filter reporting_df by year range
-        filtered_df = filter_data_by_year_range(reporting_df, from_year, to_year)
-
-        # Filter by companies if selected
-        filtered_df = filter_data_by_companies(filtered_df, companies)
-
-        # TODO: Create water reporting heatmap chart
+        # TODO: Create water reporting heatmap chart from
+        # select_rows(datasets.get("reporting"), ...) of the filter store values
         # For now, return a placeholder
         import plotly.graph_objects as go
 
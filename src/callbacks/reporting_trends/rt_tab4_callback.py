@@ -6,6 +6,8 @@ from datetime import datetime
 import pandas as pd
 from figures.reporting_trends.pue_wue_reporting_heatmap import create_pue_wue_reporting_heatmap_plot
 from components.excel_export import create_filtered_excel_download
+from helpers.figure_cache import get_figure_cache
+from helpers.row_selection import RowSelection
 
 
 def get_rt_last_modified_date():
@@ -33,27 +35,15 @@ def get_rt_last_modified_date():
         return None
 
 
-def filter_data_by_year_range(df, from_year, to_year, year_col="year"):
-    """Filter dataframe by year range"""
-    if df.empty:
-        return df
-
-    filtered_df = df.copy()
-
-    if from_year is not None:
-        filtered_df = filtered_df[filtered_df[year_col] >= from_year]
-
-    if to_year is not None:
-        filtered_df = filtered_df[filtered_df[year_col] <= to_year]
-
-    return filtered_df
-
-
-def filter_data_by_companies(df, companies, company_col="company_name"):
-    """Filter dataframe by selected companies"""
-    if df.empty or not companies:
-        return df
-    return df[df[company_col].isin(companies)]
+def select_rows(
+    df, from_year, to_year, companies, year_col="year", company_col="company_name"
+):
+    """Return the RowSelection of the year range and company filters (nothing is copied)"""
+    return (
+        RowSelection(df)
+        .between(year_col, from_year, to_year)
+        .isin(company_col, companies)
+    )
 
 # ID prefix for this page's components
 ID_PREFIX = "rt-"
@@ -85,16 +75,17 @@ def get_processed_reporting_data(df, filter_data):
         sort_by = filter_data.get("sort_by", "company_name")
         sort_order = filter_data.get("sort_order", "asc")
 
-        # 2. Sequential Filtering
-        filtered_df = filter_data_by_year_range(df, from_year, to_year)
-        filtered_df = filter_data_by_companies(filtered_df, companies)
+        # 2. Year range and company filters (masks only, nothing is copied)
+        selection = select_rows(df, from_year, to_year, companies)
 
         # 3. "At Least Once" Status Filtering
         if pw_status and len(pw_status) > 0:
             data_status_values = [_PW_STATUS_TO_DATA.get(s, s) for s in pw_status]
-            mask = filtered_df["reports_pue"].isin(data_status_values)
-            valid_companies = filtered_df[mask]["company_name"].unique()
-            filtered_df = filtered_df[filtered_df["company_name"].isin(valid_companies)]
+            mask = selection.mask & df["reports_pue"].isin(data_status_values).to_numpy()
+            valid_companies = df["company_name"][mask].unique()
+            selection.where(df["company_name"].isin(valid_companies))
+            # the selected rows are materialized once
+            filtered_df = selection.take()
         else:
             # Return empty if no status is selected (as per your current logic)
             return pd.DataFrame(columns=df.columns)
@@ -122,12 +113,17 @@ def get_processed_reporting_data(df, filter_data):
             if data_sort_col == "reports_pue":
                 # Weighted sort: total_company_score then company_name (case-insensitive)
                 temp_df = filtered_df.copy()
+                # statuses may be categorical (optimize_dtypes); map plain values to float scores
                 temp_df["year_score"] = (
-                    temp_df["reports_pue"].map(status_weights).fillna(0)
+                    temp_df["reports_pue"]
+                    .astype(object)
+                    .map(status_weights)
+                    .astype(float)
+                    .fillna(0)
                 )
                 scores = temp_df.groupby("company_name")["year_score"].sum()
-                filtered_df["total_company_score"] = filtered_df["company_name"].map(
-                    scores
+                filtered_df["total_company_score"] = (
+                    filtered_df["company_name"].astype(object).map(scores)
                 )
                 filtered_df["company_name_lower"] = (
                     filtered_df["company_name"].str.lower()
@@ -149,13 +145,27 @@ def get_processed_reporting_data(df, filter_data):
 
         return filtered_df
 
-def register_rt_tab4_callbacks(app, pue_wue_companies_df):
+def register_rt_tab4_callbacks(app, datasets):
     """Register callbacks for RT Tab 4 (PUE Reporting heatmap with dual-chart pattern).
 
     Uses header + scrollable main chart like pue_wue_page.
     Filters are inside each tab. Filter values are synced via rt-filter-store.
     """
 
+    # Rendered heatmaps are reused per (dataset version, stored filters, variant)
+    figure_cache = get_figure_cache()
+
+    def heatmap_figure(version, filter_data, filtered_df, **options):
+        """Return the heatmap of the stored filters, from the figure cache when possible."""
+        return figure_cache.figure(
+            create_pue_wue_reporting_heatmap_plot,
+            version,
+            {"filters": filter_data, **options},
+            lambda: create_pue_wue_reporting_heatmap_plot(
+                filtered_df=filtered_df, **options
+            ),
+        )
+
     # Chart config for the graphs
     chart_config = {
         "responsive": True,
@@ -180,19 +190,27 @@ def register_rt_tab4_callbacks(app, pue_wue_companies_df):
         # Only process if we're on tab-4 (allow None for initial load)
         if active_tab is not None and active_tab != "tab-4":
             raise dash.exceptions.PreventUpdate
+
+        pue_wue_companies_df, version = datasets.get_with_version(
+            "pue_wue_companies"
+        )
         
         filtered_df = get_processed_reporting_data(pue_wue_companies_df, filter_data)
 
         # Header (legend + x-axis), sticky
-        pue_trends_header_fig = create_pue_wue_reporting_heatmap_plot(
-            filtered_df=filtered_df,
+        pue_trends_header_fig = heatmap_figure(
+            version,
+            filter_data,
+            filtered_df,
             header_only=True,
             reporting_column="reports_pue",
         )
 
         # Body (scrollable data rows), fixed row height
-        pue_trends_fig = create_pue_wue_reporting_heatmap_plot(
-            filtered_df=filtered_df,
+        pue_trends_fig = heatmap_figure(
+            version,
+            filter_data,
+            filtered_df,
             header_only=False,
             reporting_column="reports_pue",
         )
@@ -231,6 +249,9 @@ def register_rt_tab4_callbacks(app, pue_wue_companies_df):
     )
     def toggle_rt_tab4_modal(expand_clicks, is_open, filter_data):
         """Toggle the expanded modal view; expanded figure uses fixed row height (no stretch)."""
+        pue_wue_companies_df, version = datasets.get_with_version(
+            "pue_wue_companies"
+        )
         if not expand_clicks:
             raise dash.exceptions.PreventUpdate
 
@@ -254,8 +275,10 @@ def register_rt_tab4_callbacks(app, pue_wue_companies_df):
 
         filtered_df = get_processed_reporting_data(pue_wue_companies_df, filter_data)
 
-        expanded_fig = create_pue_wue_reporting_heatmap_plot(
-            filtered_df=filtered_df,
+        expanded_fig = heatmap_figure(
+            version,
+            filter_data,
+            filtered_df,
             header_only=False,
             is_expanded=True,
             reporting_column="reports_pue",
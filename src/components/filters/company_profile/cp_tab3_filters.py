@@ -1,6 +1,8 @@
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 
+from helpers.option_catalog import option_catalog
+
 ID_PREFIX = "cp-"
 
 
@@ -19,7 +21,8 @@ def create_cp_tab3_filters(df, default_company=None):
     Returns:
         html.Div wrapping the fixed sidebar
     """
-    companies_list = sorted(df["company_name"].unique())
+    company_options = option_catalog(df).options("company_name")
+    companies_list = [opt["value"] for opt in company_options]
     if default_company is None:
         default_company = companies_list[0] if companies_list else None
     years = sorted(df["reported_data_year"].unique(), reverse=True)
@@ -62,10 +65,7 @@ def create_cp_tab3_filters(df, default_company=None):
                                     ),
                                     dcc.Dropdown(
                                         id=f"{ID_PREFIX}company-dropdown",
-                                        options=[
-                                            {"label": c, "value": c}
-                                            for c in companies_list
-                                        ],
+                                        options=company_options,
                                         placeholder="Select a company",
                                         value=default_company,
                                         clearable=False,
@@ -88,10 +88,7 @@ def create_cp_tab3_filters(df, default_company=None):
                                     ),
                                     dcc.Dropdown(
                                         id=f"{ID_PREFIX}benchmark-companies-dropdown",
-                                        options=[
-                                            {"label": c, "value": c}
-                                            for c in companies_list
-                                        ],
+                                        options=company_options,
                                         placeholder="All companies",
                                         multi=True,
                                         style={
@@ -1,6 +1,7 @@
 import dash
 from dash import Input, Output, dcc, html
 import dash_bootstrap_components as dbc
+from helpers.gp_membership import INSTRUMENTS, OBJECTIVES
 
 
 def create_gp_tab1_filters(df):
@@ -139,11 +140,9 @@ def create_gp_tab1_filters(df):
                                         id="gp_instrument",
                                         options=[
                                             {"label": str(val), "value": val}
-                                            for val in sorted(
-                                                df["instrument"].dropna().unique()
-                                            )
+                                            for val in sorted(INSTRUMENTS)
                                         ]
-                                        if "instrument" in df.columns
+                                        if "instrument_mask" in df.columns
                                         else [],
                                         value=[],
                                         persistence=True,
@@ -155,11 +154,9 @@ def create_gp_tab1_filters(df):
                                         id="gp_objective",
                                         options=[
                                             {"label": str(val), "value": val}
-                                            for val in sorted(
-                                                df["objective"].dropna().unique()
-                                            )
+                                            for val in sorted(OBJECTIVES)
                                         ]
-                                        if "objective" in df.columns
+                                        if "objective_mask" in df.columns
                                         else [],
                                         value=[],
                                         persistence=True,
@@ -236,10 +233,3 @@ def create_gp_tab1_filters(df):
                     ),
                 ]
             )
-
-
-def get_options(column, filtered_df):
-    """Get unique options from filtered dataframe"""
-    return [
-        {"label": val, "value": val} for val in sorted(filtered_df[column].unique())
-    ]
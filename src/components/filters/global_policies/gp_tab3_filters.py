@@ -1,6 +1,7 @@
 import dash
 from dash import Input, Output, dcc, html
 import dash_bootstrap_components as dbc
+from helpers.gp_membership import INSTRUMENTS, OBJECTIVES
 
 
 def create_gp_tab3_filters(df):
@@ -71,11 +72,9 @@ def create_gp_tab3_filters(df):
                                         id="gp_tab3_instrument",
                                         options=[
                                             {"label": str(val), "value": val}
-                                            for val in sorted(
-                                                df["instrument"].dropna().unique()
-                                            )
+                                            for val in sorted(INSTRUMENTS)
                                         ]
-                                        if "instrument" in df.columns
+                                        if "instrument_mask" in df.columns
                                         else [],
                                         value=[],
                                         persistence=True,
@@ -87,11 +86,9 @@ def create_gp_tab3_filters(df):
                                         id="gp_tab3_objective",
                                         options=[
                                             {"label": str(val), "value": val}
-                                            for val in sorted(
-                                                df["objective"].dropna().unique()
-                                            )
+                                            for val in sorted(OBJECTIVES)
                                         ]
-                                        if "objective" in df.columns
+                                        if "objective_mask" in df.columns
                                         else [],
                                         value=[],
                                         persistence=True,
@@ -166,10 +163,3 @@ def create_gp_tab3_filters(df):
             ),
         ]
     )
-
-
-def get_options(column, filtered_df):
-    """Get unique options from filtered dataframe"""
-    return [
-        {"label": val, "value": val} for val in sorted(filtered_df[column].unique())
-    ]
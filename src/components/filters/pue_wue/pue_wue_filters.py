@@ -1,8 +1,10 @@
 import dash
 from dash import Input, Output, dcc, html
 import dash_bootstrap_components as dbc
+from helpers.option_catalog import option_catalog
 
 def create_pue_wue_filters(df):
+    catalog = option_catalog(df)
     return html.Div([
         # Sidebar container
         html.Div([
@@ -31,7 +33,7 @@ def create_pue_wue_filters(df):
                     html.Label("Company/Organization Name:", className="filter-label"),
                     dcc.Dropdown(
                         id='company_name', 
-                        options=sorted(df['company_name'].unique()), 
+                        options=catalog.options('company_name'),
                         multi=True, 
                         persistence=True,
                         persistence_type="session",
@@ -42,7 +44,7 @@ def create_pue_wue_filters(df):
                     html.Label("Time Period Category:", className="filter-label"),
                     dcc.Checklist(
                         id='time_period_category', 
-                        options=[{'label': str(val), 'value': val} for val in sorted(df['time_period_category'].dropna().unique())],
+                        options=catalog.options('time_period_category'),
                         value=[],
                         persistence=True,
                         persistence_type="session",
@@ -52,7 +54,7 @@ def create_pue_wue_filters(df):
                     html.Label("Measurement Category:", className="filter-label"),
                     dcc.Checklist(
                         id='measurement_category', 
-                        options=[{'label': str(val), 'value': val} for val in sorted(df['measurement_category'].dropna().unique())], 
+                        options=catalog.options('measurement_category'),
                         value=[],
                         persistence=True,
                         persistence_type="session",
@@ -62,7 +64,7 @@ def create_pue_wue_filters(df):
                     html.Label("PUE/WUE Type:", className="filter-label"),
                     dcc.Checklist(
                         id='metric_type', 
-                        options=[{'label': str(val), 'value': val} for val in sorted(df['metric_type'].dropna().unique())], 
+                        options=catalog.options('metric_type'),
                         value=[],
                         persistence=True,
                         persistence_type="session",
@@ -72,7 +74,7 @@ def create_pue_wue_filters(df):
                     html.Label("Facility Scope:", className="filter-label"),
                     dcc.Checklist(
                         id='facility_scope', 
-                        options=[{'label': str(val), 'value': val} for val in sorted(df['facility_scope'].dropna().unique())],  
+                        options=catalog.options('facility_scope'),
                         value=[],
                         persistence=True,
                         persistence_type="session",
@@ -259,8 +261,4 @@ def create_pue_wue_filters(df):
             #"boxShadow": "2px 0 5px rgba(0,0,0,0.1)",
             #"overflowY": "auto"
         })
-    ])
-
-def get_options(column, filtered_df):
-    """Get unique options from filtered dataframe"""
-    return [{'label': val, 'value': val} for val in sorted(filtered_df[column].unique())]
\ No newline at end of file
+    ])
\ No newline at end of file
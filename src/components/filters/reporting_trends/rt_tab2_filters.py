@@ -3,6 +3,7 @@ from dash import Input, Output, dcc, html
 import dash_bootstrap_components as dbc
 from components.filters.year_range_filter import create_year_range_component
 from components.filters.reporting_trends.rt_sort_options import create_sort_options_component
+from helpers.option_catalog import option_catalog
 
 
 def create_rt_tab2_filters(df):
@@ -69,7 +70,7 @@ def create_rt_tab2_filters(df):
                                     ),
                                     dcc.Dropdown(
                                         id="rt-company-filter",
-                                        options=sorted(df["company_name"].unique()),
+                                        options=option_catalog(df).options("company_name"),
                                         multi=True,
                                         persistence=True,
                                         persistence_type="session",
@@ -2,8 +2,11 @@ import dash
 from dash import Input, Output, dcc, html
 import dash_bootstrap_components as dbc
 
+from helpers.option_catalog import option_catalog
+
 
 def create_water_projections_filters(df):
+    catalog = option_catalog(df)
     return html.Div(
         [
             # Sidebar container
@@ -84,7 +87,7 @@ def create_water_projections_filters(df):
                                     ),
                                     dcc.Dropdown(
                                         id="wp_author_institution_type_s_",
-                                        options=sorted(df["citation"].unique()),
+                                        options=catalog.options("citation"),
                                         multi=True,
                                         persistence=True,
                                         persistence_type="session",
@@ -829,10 +832,3 @@ def create_water_projections_filters(df):
             )
         ]
     )
-
-
-def get_options(column, filtered_df):
-    """Get unique options from filtered dataframe"""
-    return [
-        {"label": val, "value": val} for val in sorted(filtered_df[column].unique())
-    ]
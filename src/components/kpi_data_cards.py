@@ -4,9 +4,9 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 
 
-def create_kpi_cards(kpi_data_sources, config):
+def compute_kpis(kpi_data_sources):
     """
-    create KPI data cards
+    calculate KPI values from the source datasets
     """
 
     pue_df = kpi_data_sources.get("pue")
@@ -28,6 +28,21 @@ def create_kpi_cards(kpi_data_sources, config):
         # "wue_values": df["metric_value"].dropna().count() if "metric_value" in df.columns else 0,
         "studies_assessed": energyprojections_df["citation"].nunique() if "citation" in energyprojections_df.columns else 0,
     }
+    # plain ints so the values can be stored as JSON
+    return {kpi_id: int(value) for kpi_id, value in all_kpis.items()}
+
+
+def create_kpi_cards(kpi_data_sources, config):
+    """
+    create KPI data cards
+
+    kpi_data_sources holds either the source datasets or precomputed values
+    under "kpis" (see compute_kpis)
+    """
+
+    all_kpis = kpi_data_sources.get("kpis")
+    if all_kpis is None:
+        all_kpis = compute_kpis(kpi_data_sources)
 
     # get KPIs from the kpi_cards list in the menu_structure
     kpi_configs = config.get(
@@ -1,3 +1,4 @@
+import logging
 import pandas as pd
 from pathlib import Path
 
@@ -11,17 +12,54 @@ from datetime import datetime
 import numpy as np
 import sys
 import time
+from operator import itemgetter
 
 # load support functions
 from helpers.geocode_locations import add_coordinates_from_cache
+from helpers.snapshot_cache import snapshot_cache
+from helpers.workbook_session import read_excel
+from helpers.dataset_registry import DatasetRegistry
+from helpers.dtype_optimizer import optimize_dtypes
+from helpers.gp_membership import encode_membership, explode_membership
+from helpers.hover_text import (
+    PROJECTION_HOVER_COLUMNS,
+    PUE_WUE_HOVER_COLUMNS,
+    add_hover_columns,
+)
+from helpers.scatter_jitter import (
+    PUE_JITTER,
+    WUE_JITTER,
+    X_JITTER_COLUMN,
+    add_x_jitter,
+)
+from components.kpi_data_cards import compute_kpis
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_pending_reporting_year():
+    """
+    Return the reporting year whose data is still pending.
+
+    Assumption: reports for year X are typically released by Aug 31st of year X+1,
+    so before the cutoff last year's data is pending, afterwards the current year's.
+    """
+    current_date = datetime.today()
+    reporting_release_cutoff = datetime(current_date.year, 8, 31)
+    if current_date < reporting_release_cutoff:
+        return current_date.year - 1
+    return current_date.year
+
 
+@snapshot_cache("DCEWM-PUEDataset.xlsx", version=2)
 def load_pue_data():
     # Get the current file's directory (src folder)
     current_dir = Path(__file__).parent
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "DCEWM-PUEDataset.xlsx"
 
-    pue_df = pd.read_excel(data_path, sheet_name="PUE", index_col=None, skiprows=1)
+    pue_df = read_excel(data_path, sheet_name="PUE", index_col=None, skiprows=1)
     pue_df = pue_df.clean_names()
 
     # Clean string columns
@@ -42,16 +80,17 @@ def load_pue_data():
     pue_df.rename(columns={"pue_type": "metric_type"}, inplace=True)
     pue_df.rename(columns={"pue_value": "metric_value"}, inplace=True)
 
-    return pue_df
+    return optimize_dtypes(pue_df, "pue")
 
 
+@snapshot_cache("DCEWM-WUEDataset.xlsx", version=2)
 def load_wue_data():
     # Get the current file's directory (src folder)
     current_dir = Path(__file__).parent
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "DCEWM-WUEDataset.xlsx"
 
-    wue_df = pd.read_excel(data_path, sheet_name="WUE", index_col=None, skiprows=1)
+    wue_df = read_excel(data_path, sheet_name="WUE", index_col=None, skiprows=1)
     wue_df = wue_df.clean_names()
 
     # Clean string columns
@@ -79,7 +118,7 @@ def load_wue_data():
         inplace=True,
     )
 
-    return wue_df
+    return optimize_dtypes(wue_df, "wue")
 
 
 def create_pue_wue_data(pue_df, wue_df):
@@ -152,97 +191,130 @@ def create_pue_wue_data(pue_df, wue_df):
 
     # append wue_df to pue_wue_df dataframe
     pue_wue_df = pd.concat([pue_wue_df, wue_df], ignore_index=True)
+    pue_wue_df = optimize_dtypes(pue_wue_df, "pue_wue")
 
-    return pue_wue_df
+    # scatter plot x positions, computed once per load instead of per request
+    pue_wue_df[X_JITTER_COLUMN] = np.nan
+    for metric, jitter in (("pue", PUE_JITTER), ("wue", WUE_JITTER)):
+        rows = (pue_wue_df["metric"] == metric).to_numpy(dtype=bool, na_value=False)
+        pue_wue_df.loc[rows, X_JITTER_COLUMN] = add_x_jitter(pue_wue_df[rows], *jitter)
+
+    # chart hover lines, formatted once per load instead of per request
+    return add_hover_columns(pue_wue_df, PUE_WUE_HOVER_COLUMNS)
+
+
+def _format_status_date(status_date):
+    """Format a status effective date as YYYY-MM-DD when it is a date."""
+    if status_date and hasattr(status_date, "strftime"):
+        return status_date.strftime("%Y-%m-%d")
+    return status_date
+
+
+def _missing_company_years(companies, years, df):
+    """
+    Build the company x year grid and drop the pairs already present in df.
+
+    Returns:
+        DataFrame with company and year columns, ordered by company then year
+    """
+    grid = pd.MultiIndex.from_product(
+        [companies, years], names=["company", "year"]
+    ).to_frame(index=False)
+    existing = pd.MultiIndex.from_frame(df[["company", "year"]])
+    return grid[~pd.MultiIndex.from_frame(grid).isin(existing)]
 
 
 def fill_inactive_status(df):
     """
     For companies marked as 'company inactive', fill all subsequent years
+
+    Works on the full company x year grid: the inactive status (with successor
+    and status date) of each company's first inactive year is carried forward
+    to every later year that has no row yet.
     """
-    all_years = sorted(df["year"].unique())
-    filled_rows = []
-
-    for company, company_data in df.groupby("company"):
-        # find the rows where a company became inactive
-        inactive_rows = company_data[company_data["reports_pue"] == "company inactive"]
-
-        if not inactive_rows.empty:
-            # extract the metadata from the first recorded inactive year
-            first_row = inactive_rows.sort_values("year").iloc[0]
-            first_inactive_year = first_row["year"]
-
-            successor = first_row.get("successor_entity", "")
-            status_date = first_row.get("status_effective_date", "")
-            if status_date and hasattr(status_date, "strftime"):
-                status_date = status_date.strftime("%Y-%m-%d")
-
-            # create a set of years that already have data for this company
-            existing_years = set(company_data["year"])
-
-            # append the rows with inactive company details following the row with the first inactive year
-            for year in all_years:
-                if year > first_inactive_year and year not in existing_years:
-                    filled_rows.append(
-                        {
-                            "company": company,
-                            "year": year,
-                            "reports_pue": "company inactive",
-                            "reports_wue": "company inactive",
-                            "successor_entity": successor,
-                            "status_effective_date": status_date,
-                        }
-                    )
+    all_years = np.sort(df["year"].unique())
 
-    if filled_rows:
-        return pd.concat([df, pd.DataFrame(filled_rows)], ignore_index=True)
+    # first recorded inactive year per company, with its metadata
+    inactive_rows = df[
+        (df["reports_pue"] == "company inactive") & df["company"].notna()
+    ]
+    if inactive_rows.empty:
+        return df
+    first_rows = (
+        inactive_rows.sort_values("year", kind="stable")
+        .drop_duplicates("company")
+        .sort_values("company")
+        .set_index("company")
+    )
+
+    filled = _missing_company_years(first_rows.index, all_years, df)
+    first_inactive_year = first_rows["year"].reindex(filled["company"]).to_numpy()
+    filled = filled[filled["year"].to_numpy() > first_inactive_year]
+    if filled.empty:
+        return df
+
+    filled["reports_pue"] = "company inactive"
+    filled["reports_wue"] = "company inactive"
+    for col in ["successor_entity", "status_effective_date"]:
+        if col in first_rows.columns:
+            values = first_rows[col]
+            if col == "status_effective_date":
+                values = values.map(_format_status_date)
+            filled[col] = values.reindex(filled["company"]).to_numpy()
+        else:
+            filled[col] = ""
+    filled = filled.infer_objects()
+
+    return pd.concat([df, filled], ignore_index=True)
 
-    return df
 
 def blackfill_not_established_status(df):
     """
     For companies marked as 'company not established', fill all years prior to year_founded
+
+    Works on the full company x year grid: every year before a company's
+    year_founded that has no row yet is added as 'company not established'.
     """
-    all_years = sorted(df["year"].unique())
-    filled_rows = []
+    all_years = np.sort(df["year"].unique())
 
     # mark existing rows where the reporting year is before year_founded
     df.loc[
         df["year"] < df["year_founded"], ["reports_pue", "reports_wue"]
     ] = "company not established"
 
-    for company, company_data in df.groupby("company"):
-        year_founded = int(company_data["year_founded"].iloc[0])
-
-        # create a set of years that already have data for this company
-        existing_years = set(company_data["year"])
+    # year_founded from each company's first row
+    year_founded = (
+        df[df["company"].notna()]
+        .drop_duplicates("company")
+        .sort_values("company")
+        .set_index("company")["year_founded"]
+        .astype(int)
+    )
 
-        # append missing rows with "company not established" status to the
-        # company details for years prior to year_founded
-        for year in all_years:
-            if year < year_founded and year not in existing_years:
-                filled_rows.append(
-                    {
-                        "company": company,
-                        "year": year,
-                        "reports_pue": "company not established",
-                        "reports_wue": "company not established",
-                    }
-                )
+    filled = _missing_company_years(year_founded.index, all_years, df)
+    filled = filled[
+        filled["year"].to_numpy()
+        < year_founded.reindex(filled["company"]).to_numpy()
+    ]
+    if filled.empty:
+        return df
 
-    if filled_rows:
-        return pd.concat([df, pd.DataFrame(filled_rows)], ignore_index=True)
+    filled["reports_pue"] = "company not established"
+    filled["reports_wue"] = "company not established"
 
-    return df
+    return pd.concat([df, filled], ignore_index=True)
 
 # load companies list data for pue and wue reporting
+@snapshot_cache(
+    "Companies_list.xlsx", version=2, extra_key=get_pending_reporting_year
+)
 def load_pue_wue_companies_data():
     # Get the current file's directory (src folder)
     current_dir = Path(__file__).parent
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "Companies_list.xlsx"
 
-    companies_df = pd.read_excel(
+    companies_df = read_excel(
         data_path, sheet_name="summary", index_col=None, skiprows=1
     )
     companies_df = companies_df.clean_names()
@@ -263,7 +335,7 @@ def load_pue_wue_companies_data():
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "Companies_list.xlsx"
 
-    df = pd.read_excel(data_path, sheet_name="reporting_status", index_col=None)
+    df = read_excel(data_path, sheet_name="reporting_status", index_col=None)
     df = df.clean_names()
 
     # Clean string columns
@@ -301,17 +373,8 @@ def load_pue_wue_companies_data():
     ].astype(int)
     
     cols_to_check = ["reports_pue", "reports_wue"]
-    # account for the delay in reporting 
-    current_date = datetime.today()
-    # Assumption: reports for year X are typically released by Aug 31st of year X+1
-    reporting_release_cutoff = datetime(current_date.year, 8, 31)
-
-    if current_date < reporting_release_cutoff:
-        # last year's data is pending
-        reporting_year = current_date.year - 1
-    else:
-        # last year's data is release, current year data is pending
-        reporting_year = current_date.year
+    # account for the delay in reporting
+    reporting_year = get_pending_reporting_year()
 
     # iterate and update each column separately
     for col in cols_to_check:
@@ -329,17 +392,115 @@ def load_pue_wue_companies_data():
     pue_wue_reporting_df = blackfill_not_established_status(pue_wue_reporting_df)
     pue_wue_reporting_df.rename(columns={"company": "company_name"}, inplace=True)
 
-    return pue_wue_reporting_df
+    return optimize_dtypes(pue_wue_reporting_df, "pue_wue_companies")
+
+
+def add_scenario_continuity(df):
+    """
+    Add the last historical point of each citation as the first point of each
+    of its scenarios, so scenario lines start where the historical line ends.
+
+    Set-based: the last historical row per citation is cross-joined to the
+    citation's scenario labels, anti-joined against years the scenario already
+    has, and concatenated with the original rows once. Rows come out in the
+    same order (and with the same index) as the former per-citation loop:
+    citations in order of appearance, each scenario's rows (sorted by year
+    when a continuity point was added) followed by the historical rows. Rows
+    sharing a year within a scenario keep their input order (the loop's
+    unstable sort left their order unspecified).
+    Rows without a citation, and scenario rows without a label in citations
+    that have historical data, are dropped as before.
+
+    Args:
+        df: Long-format projections (one row per citation, label and year)
+
+    Returns:
+        DataFrame with continuity points added (RangeIndex, not yet sorted)
+    """
+    df = df[df["citation"].notna()]
+    citation_codes, citations = pd.factorize(df["citation"])
+    is_historical = (df["label"] == "Historical").to_numpy()
+
+    historical = df[is_historical]
+    has_historical = np.zeros(citation_codes.max() + 1, dtype=bool)
+    has_historical[citation_codes[is_historical]] = True
+    in_historical_citation = has_historical[citation_codes]
+
+    # scenario rows of citations with historical data, grouped by label in
+    # order of appearance (unlabelled rows never matched a scenario)
+    is_scenario = (
+        ~is_historical & in_historical_citation & df["label"].notna().to_numpy()
+    )
+    # rows of citations without historical data are kept as they are
+    is_standalone = ~is_historical & ~in_historical_citation
+    scenarios = df[is_scenario]
+
+    scenario_labels = scenarios[["citation", "label"]].drop_duplicates()
+    scenario_labels["block"] = scenario_labels.groupby(
+        "citation", sort=False
+    ).cumcount()
+
+    # last historical point per citation x scenario label, minus the
+    # scenarios that already have a value for that year
+    last_historical = historical.loc[
+        historical.groupby("citation", sort=False)["year"].idxmax()
+    ]
+    continuity = scenario_labels.merge(
+        last_historical.drop(columns="label"), on="citation", how="inner"
+    )
+    existing = scenarios[["citation", "label", "year"]].drop_duplicates()
+    continuity = continuity.merge(
+        existing, on=["citation", "label", "year"], how="left", indicator=True
+    )
+    continuity = continuity[continuity["_merge"] == "left_only"]
+
+    # scenarios that received a continuity point are ordered by year
+    sorted_blocks = scenarios[["citation", "label"]].merge(
+        continuity[["citation", "label"]], how="left", indicator=True
+    )["_merge"].eq("both").to_numpy()
+
+    # sort keys reproducing the former concat order
+    n_rows = len(df)
+    positions = np.arange(n_rows)
+    block = np.zeros(n_rows, dtype=np.int64)
+    block[is_scenario] = scenarios[["citation", "label"]].merge(
+        scenario_labels, how="left"
+    )["block"].to_numpy()
+    block[is_historical] = n_rows  # historical rows follow all scenarios
+    by_year = np.zeros(n_rows)
+    scenario_positions = positions[is_scenario]
+    by_year[scenario_positions[sorted_blocks]] = (
+        scenarios["year"].to_numpy()[sorted_blocks]
+    )
+
+    kept = is_historical | is_scenario | is_standalone
+    keys = {
+        "citation": np.concatenate(
+            [citation_codes[kept], citations.get_indexer(continuity["citation"])]
+        ),
+        "block": np.concatenate([block[kept], continuity["block"].to_numpy()]),
+        "by_year": np.concatenate([by_year[kept], continuity["year"].to_numpy()]),
+        "position": np.concatenate([positions[kept], np.full(len(continuity), -1)]),
+    }
+    order = np.lexsort(
+        (keys["position"], keys["by_year"], keys["block"], keys["citation"])
+    )
+
+    combined = pd.concat(
+        [df[kept], continuity[df.columns]], ignore_index=True
+    )
+    return combined.iloc[order].reset_index(drop=True)
 
 
 # data load for Energy Demand and Projections page
+@snapshot_cache("DCEWM-EnergyStudiesData.xlsx", version=4)
 def load_energyprojections_data():
     # Get the current file's directory (src folder)
     current_dir = Path(__file__).parent
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "DCEWM-EnergyStudiesData.xlsx"
 
-    df = pd.read_excel(data_path, sheet_name="Data Viz", index_col=None, skiprows=4)
+    df = read_excel(data_path, sheet_name="Data Viz", index_col=None, skiprows=4)
 
     # pivot longer all year columns
     year_columns = [col for col in df.columns if re.match(r"^\d{4}$", str(col))]
@@ -361,73 +522,23 @@ def load_energyprojections_data():
 
     # Ensure continuity between Historical and scenario data
     # Add the last historical point as the first point of each scenario
-    df_continuous = []
-
-    for citation in df["citation"].unique():
-        citation_data = df[df["citation"] == citation].copy()
-
-        # Get historical data
-        historical_data = citation_data[citation_data["label"] == "Historical"].copy()
-
-        if not historical_data.empty:
-            # Find the last historical point (excluding NaN values)
-            valid_historical = historical_data[historical_data["energy_demand"].notna()]
-            if not valid_historical.empty:
-                last_historical = valid_historical.loc[
-                    valid_historical["year"].idxmax()
-                ].copy()
-            else:
-                continue  # Skip if no valid historical data
-
-            # Get all scenario labels (non-Historical)
-            scenario_labels = citation_data[citation_data["label"] != "Historical"][
-                "label"
-            ].unique()
-
-            # Add the last historical point to each scenario
-            for scenario in scenario_labels:
-                scenario_data = citation_data[citation_data["label"] == scenario].copy()
-
-                if not scenario_data.empty:
-                    # Check if this year already exists in the scenario
-                    if last_historical["year"] not in scenario_data["year"].values:
-                        # Create a new row for continuity
-                        continuity_point = last_historical.copy()
-                        continuity_point["label"] = scenario
-
-                        # Add to the scenario data
-                        scenario_data = pd.concat(
-                            [pd.DataFrame([continuity_point]), scenario_data],
-                            ignore_index=True,
-                        )
-                        scenario_data = scenario_data.sort_values("year")
-
-                df_continuous.append(scenario_data)
-
-        # Add historical data (unchanged)
-        df_continuous.append(historical_data)
-
-        # Add any data that doesn't have Historical counterpart
-        non_historical_citations = citation_data[citation_data["label"] != "Historical"]
-        if historical_data.empty and not non_historical_citations.empty:
-            df_continuous.append(non_historical_citations)
-
-    # Combine all data
-    if df_continuous:
-        df = pd.concat(df_continuous, ignore_index=True)
+    if df["citation"].notna().any():
+        df = add_scenario_continuity(df)
         df = df.sort_values(["citation", "label", "year"])
 
         # DEBUG: Check PBH records specifically
-        print(f"\n=== PBH DEBUG ===")
-        pbh_data = df[df["citation"] == "PBH(2018)"]
-        print(f"PBH total records: {len(pbh_data)}")
-        if not pbh_data.empty:
+        if logger.isEnabledFor(logging.DEBUG):
+            pbh_data = df[df["citation"] == "PBH(2018)"]
+            logger.debug("PBH total records: %d", len(pbh_data))
             for label in pbh_data["label"].unique():
                 label_data = pbh_data[pbh_data["label"] == label]
-                print(f"PBH {label}: {len(label_data)} records")
-                print(f"  Years: {sorted(label_data['year'].tolist())}")
-                print(f"  Values: {label_data['energy_demand'].tolist()}")
-        print("=== END PBH DEBUG ===\n")
+                logger.debug(
+                    "PBH %s: %d records, years %s, values %s",
+                    label,
+                    len(label_data),
+                    sorted(label_data["year"].tolist()),
+                    label_data["energy_demand"].tolist(),
+                )
 
     # Clean string columns
     string_columns = [
@@ -452,15 +563,19 @@ def load_energyprojections_data():
         if col in df.columns:
             df[col] = df[col].where(df[col].isna(), df[col].astype(str).str.strip())
 
-    return df
+    df = optimize_dtypes(df, "energyprojections")
 
+    # chart hover lines, formatted once per load instead of per request
+    return add_hover_columns(df, PROJECTION_HOVER_COLUMNS)
+
+@snapshot_cache("DCEWM-GlobalPolicies.xlsx", version=3)
 def load_gp_data():
     # Get the current file's directory (src folder)
     current_dir = Path(__file__).parent
     # Go up one level and into data directory
     data_path = current_dir.parent / "data" / "DCEWM-GlobalPolicies.xlsx"
 
-    df = pd.read_excel(data_path, sheet_name="Policy_Eval", index_col=None, skiprows=2)
+    df = read_excel(data_path, sheet_name="Policy_Eval", index_col=None, skiprows=2)
 
     df = df[
         [
@@ -568,44 +683,9 @@ def load_gp_data():
 
     gp_base_df.rename(columns=dict(zip(old_policy_columns, policy_columns)), inplace=True)
     
-    # pivot longer all instrument and objective columns
-    instrument_columns = [
-        "Measurement and Reporting",
-        "Procurement standard",
-        "Performance standard",
-        "Research, demonstration, and development",
-        "Capacity building",
-        "Rate structuring",
-        "Development incentives",
-        "Development restrictions",
-        "Other",
-    ]
-    transposed_df = df.melt(
-        id_vars=[col for col in df.columns if col not in instrument_columns],
-        value_vars=instrument_columns,
-        var_name="instrument",
-        value_name="has_instrument",
-    )
-
-    objective_columns = [
-        "Energy",
-        "Power",
-        "Water",
-        "Emissions",
-        "Other Environemental",
-        "Taxes",
-        "Permits",
-        "Employement",
-        "Communities",
-    ]
-    transposed_df = transposed_df.melt(
-        id_vars=[col for col in transposed_df.columns if col not in objective_columns],
-        value_vars=objective_columns,
-        var_name="objective",
-        value_name="has_objective",
-    )
-
-    clean_df = transposed_df.drop_duplicates()
+    # one row per policy row, with instrument and objective membership held
+    # as bitmask columns (see helpers/gp_membership.py)
+    clean_df = encode_membership(df).drop_duplicates()
 
     # Extract year: check if numeric year (1900-2100) first, otherwise parse as datetime
     def extract_year(date_col):
@@ -647,7 +727,55 @@ def load_gp_data():
         to_datetime(clean_df["date_killed"])
     )
 
-    return gp_base_df, clean_df
+    return (
+        optimize_dtypes(gp_base_df, "gp_base"),
+        optimize_dtypes(clean_df, "globalpolicies"),
+    )
+
+
+def _factorize_with_na(series):
+    """Return (codes, number of codes) with missing values as their own code."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # categorical codes are already factorized; -1 (missing) becomes the last code
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        size = len(series.cat.categories) + 1
+        codes[codes < 0] = size - 1
+        return codes, size
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes.astype(np.int64), max(len(uniques), 1)
+
+
+def distinct_count_per_group(df, keys, value_col):
+    """
+    Count distinct values of value_col within each group of keys, per row.
+
+    Same result as df.groupby(keys, dropna=False)[value_col].transform("nunique")
+    but works on integer codes: the key columns are factorized (missing values
+    get their own code) and folded into one group key, and the distinct
+    (group, value) pairs are counted with numpy.
+
+    Returns:
+        Series of counts aligned with df
+    """
+    group = np.zeros(len(df), dtype=np.int64)
+    size = 1
+    for key in keys:
+        codes, n_codes = _factorize_with_na(df[key])
+        if size * n_codes >= 2**62:
+            # compact the key so far before it can overflow
+            group, uniques = pd.factorize(group)
+            size = max(len(uniques), 1)
+        group = group * n_codes + codes
+        size *= n_codes
+    group, uniques = pd.factorize(group)
+    n_groups = len(uniques)
+
+    values, uniques = pd.factorize(df[value_col])  # missing values -> -1
+    n_values = max(len(uniques), 1)
+    present = values >= 0
+    pairs = pd.unique(group[present] * n_values + values[present])
+    counts = np.bincount(pairs // n_values, minlength=n_groups)
+    return pd.Series(counts[group], index=df.index, name=value_col)
 
 
 # transpose global policies data so that we get a DataFrame with one row per objective/instrument
@@ -656,7 +784,7 @@ def transpose_gp_data(df):
     Preprocess dataframe for a treemap and choropleth map visualizations.
 
     Args:
-        df: Raw DataFrame with policy data
+        df: Policy DataFrame with instrument_mask / objective_mask columns
 
     Returns:
         transposed_df: Processed DataFrame with one row per objective/instrument
@@ -670,7 +798,7 @@ def transpose_gp_data(df):
     )
 
     # create a clean Objective DataFrame
-    obj_long = amendment_df[amendment_df["has_objective"] == "Yes"].copy()
+    obj_long = explode_membership(amendment_df, "objective")
     obj_long = obj_long.drop_duplicates(
         subset=[
             "policy_id",
@@ -692,7 +820,7 @@ def transpose_gp_data(df):
     obj_long["attr_value"] = obj_long["objective"]
 
     # create a clean Instrument DataFrame
-    inst_long = amendment_df[amendment_df["has_instrument"] == "Yes"].copy()
+    inst_long = explode_membership(amendment_df, "instrument")
     inst_long = inst_long.drop_duplicates(
         subset=[
             "policy_id",
@@ -716,8 +844,10 @@ def transpose_gp_data(df):
     # stack instrument and objective dataframes to ensure 1 row per Objective and 1 row per Instrument
     transposed_df = pd.concat([obj_long, inst_long], ignore_index=True)
 
-    # calculate counts on the stacked data
-    transposed_df["unique_per_attr"] = transposed_df.groupby(
+    # calculate counts on the stacked data (attr_value already tells objectives
+    # and instruments apart, so the objective column is not part of the key)
+    transposed_df["unique_per_attr"] = distinct_count_per_group(
+        transposed_df,
         [
             "jurisdiction_level",
             "city",
@@ -730,13 +860,12 @@ def transpose_gp_data(df):
             "region",
             "order_type",
             "status",
-            "objective",
             "attr_value",
         ],
-        dropna=False,
-    )["policy_id"].transform("nunique")
+        "policy_id",
+    )
     transposed_df = transposed_df.drop(
-        ["instrument", "has_instrument", "objective", "has_objective"], axis=1
+        ["instrument", "objective", "instrument_mask", "objective_mask"], axis=1
     )
     transposed_df["deduped_policy_count"] = (
         ~transposed_df["policy_id"].duplicated()
@@ -757,8 +886,9 @@ def transpose_gp_data(df):
         country_col="country",
     )
 
-    return transposed_df
+    return optimize_dtypes(transposed_df, "gp_transposed")
 
+@snapshot_cache("modules.xlsx", version=2, extra_key=get_pending_reporting_year)
 def load_reporting_data():
     """Load energy reporting data and build reporting_status per (company, year).
 
@@ -787,7 +917,7 @@ def load_reporting_data():
     data_path = current_dir.parent / "data" / "modules.xlsx"
 
     # Base data from modules.xlsx
-    company_total_ec_df = pd.read_excel(
+    company_total_ec_df = read_excel(
         data_path, sheet_name="Company Total Electricity Use", skiprows=1
     )
     company_total_ec_df = company_total_ec_df.clean_names()
@@ -795,13 +925,13 @@ def load_reporting_data():
     company_total_ec_df = company_total_ec_df[["company_name", "reported_data_year"]]
     company_total_ec_df = company_total_ec_df.dropna(subset=["reported_data_year"])
 
-    dc_ec_df = pd.read_excel(
+    dc_ec_df = read_excel(
         data_path, sheet_name="Data Center Electricity Use ", skiprows=1
     )
     dc_ec_df = dc_ec_df.clean_names()
     dc_ec_df = dc_ec_df[["company_name", "reported_data_year"]]
 
-    dc_fuel_df = pd.read_excel(
+    dc_fuel_df = read_excel(
         data_path, sheet_name="Data Center Fuel Use ", skiprows=1
     )
     dc_fuel_df = dc_fuel_df.clean_names()
@@ -825,12 +955,7 @@ def load_reporting_data():
     )
 
     # Pending year logic: reports for year X typically released by Aug 31 of year X+1
-    current_date = datetime.today()
-    reporting_release_cutoff = datetime(current_date.year, 8, 31)
-    if current_date < reporting_release_cutoff:
-        pending_year = current_date.year - 1
-    else:
-        pending_year = current_date.year
+    pending_year = get_pending_reporting_year()
 
     # Last three years relative to pending year (inclusive): e.g. pending_year=2025 → 2022–2024
     last_three_years = {pending_year - 3, pending_year - 2, pending_year - 1}
@@ -920,20 +1045,21 @@ def load_reporting_data():
         subset=["company_name", "reported_data_year", "reporting_status"]
     )
 
-    return reporting_df
+    return optimize_dtypes(reporting_df, "reporting")
 
 
+@snapshot_cache("modules.xlsx", version=2)
 def load_energy_use_data():
     current_dir = Path(__file__).parent
     data_path = current_dir.parent / "data" / "modules.xlsx"
 
-    print("\nLoading energy use data...")
+    logger.info("Loading energy use data...")
 
     # load company total electricity use data
-    company_total_ec_df = pd.read_excel(
+    company_total_ec_df = read_excel(
         data_path, sheet_name="Company Total Electricity Use", skiprows=1
     )
-    print(f"\nInitial company total records: {len(company_total_ec_df)}")
+    logger.debug("Initial company total records: %d", len(company_total_ec_df))
 
     company_total_ec_df = company_total_ec_df.clean_names()
 
@@ -954,17 +1080,18 @@ def load_energy_use_data():
     company_total_ec_df = company_total_ec_df[
         ["company_name", "reported_data_year", "electricity_usage_kwh"]
     ]
-    print("\nCompany total data sample:")
-    print(company_total_ec_df.head())
-    print(
-        f"Null values in company total electricity: {company_total_ec_df['electricity_usage_kwh'].isna().sum()}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Company total data sample:\n%s", company_total_ec_df.head())
+        logger.debug(
+            "Null values in company total electricity: %d",
+            company_total_ec_df["electricity_usage_kwh"].isna().sum(),
+        )
 
     # load data center electricity use data
-    dc_ec_df = pd.read_excel(
+    dc_ec_df = read_excel(
         data_path, sheet_name="Data Center Electricity Use ", skiprows=1
     )
-    print(f"\nInitial data center records: {len(dc_ec_df)}")
+    logger.debug("Initial data center records: %d", len(dc_ec_df))
 
     dc_ec_df = dc_ec_df.clean_names()
 
@@ -990,11 +1117,12 @@ def load_energy_use_data():
         dc_ec_df["electricity_usage_kwh"], errors="coerce"
     )
 
-    print("\nData center data sample:")
-    print(dc_ec_df.head())
-    print(
-        f"Null values in data center electricity: {dc_ec_df['electricity_usage_kwh'].isna().sum()}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Data center data sample:\n%s", dc_ec_df.head())
+        logger.debug(
+            "Null values in data center electricity: %d",
+            dc_ec_df["electricity_usage_kwh"].isna().sum(),
+        )
 
     # Group by company and year for data centers
     dc_ec_df = (
@@ -1015,33 +1143,36 @@ def load_energy_use_data():
         int
     )
 
-    print("\nFinal dataset:")
-    print(f"Total records: {len(energy_use_df)}")
-    print(f"Unique companies: {len(energy_use_df['company_name'].unique())}")
-    print(
-        f"Years range: {energy_use_df['reported_data_year'].min()} - {energy_use_df['reported_data_year'].max()}"
-    )
-    print(
-        f"Null values in final electricity usage: {energy_use_df['electricity_usage_kwh'].isna().sum()}"
-    )
-    print("\nSample of final data:")
-    print(energy_use_df.head())
-    print(energy_use_df.columns)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Final energy use dataset: %d records, %d companies, years %s - %s",
+            len(energy_use_df),
+            energy_use_df["company_name"].nunique(),
+            energy_use_df["reported_data_year"].min(),
+            energy_use_df["reported_data_year"].max(),
+        )
+        logger.debug(
+            "Null values in final electricity usage: %d",
+            energy_use_df["electricity_usage_kwh"].isna().sum(),
+        )
+        logger.debug("Sample of final data:\n%s", energy_use_df.head())
+        logger.debug("Columns: %s", list(energy_use_df.columns))
 
-    return energy_use_df
+    return optimize_dtypes(energy_use_df, "energy_use")
 
 
+@snapshot_cache("modules.xlsx", version=2)
 def load_company_profile_data():
     current_dir = Path(__file__).parent
     data_path = current_dir.parent / "data" / "modules.xlsx"
 
-    print("\nLoading company profile data...")
+    logger.info("Loading company profile data...")
 
     # load company total electricity use data
-    reporting_metrics_df = pd.read_excel(
+    reporting_metrics_df = read_excel(
         data_path, sheet_name="Information Source Characterist", skiprows=1
     )
-    print(f"\nInitial company total records: {len(reporting_metrics_df)}")
+    logger.debug("Initial company total records: %d", len(reporting_metrics_df))
 
     data_path = current_dir.parent / "data" / "modules.xlsx"
     columns_to_melt = [
@@ -1127,11 +1258,61 @@ def load_company_profile_data():
     #     inplace=True,
     # )
     company_profile_df = company_profile_df[["company", "metric", "status"]]
-    print("\nSample of final company_profile data:")
-    print(company_profile_df.head())
-    print(company_profile_df.columns)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Sample of final company_profile data:\n%s", company_profile_df.head())
+        logger.debug("Columns: %s", list(company_profile_df.columns))
+
+    return optimize_dtypes(company_profile_df, "company_profile")
+
+
+def create_kpi_data(pue_df, wue_df, pue_wue_df, energyprojections_df):
+    """Aggregate the landing page KPI values."""
+    return compute_kpis(
+        {
+            "pue": pue_df,
+            "wue": wue_df,
+            "company_name": pue_wue_df,
+            "energy_projections_studies": energyprojections_df,  # TO DO: add water projections studies to the KPIs count
+        }
+    )
+
+
+def create_dataset_registry(profiler=None):
+    """
+    Register every dataset used by the dashboard.
+
+    Args:
+        profiler: Optional StartupProfiler recording each loader run
+
+    Returns:
+        DatasetRegistry; datasets are loaded on first get() or by warm()
+    """
+    registry = DatasetRegistry(profiler=profiler)
+
+    # workbook loaders
+    registry.register("pue", load_pue_data)
+    registry.register("wue", load_wue_data)
+    registry.register("pue_wue_companies", load_pue_wue_companies_data)
+    registry.register("energyprojections", load_energyprojections_data)
+    registry.register("gp", load_gp_data)
+    registry.register("reporting", load_reporting_data)
+    registry.register("energy_use", load_energy_use_data)
+    registry.register("company_profile", load_company_profile_data)
+
+    # derived datasets
+    registry.register("pue_wue", create_pue_wue_data, deps=("pue", "wue"))
+    # TO DO: replace with the function to load water projections dataset
+    registry.register(
+        "waterprojections", lambda df: df, deps=("energyprojections",)
+    )
+    registry.register("gp_base", itemgetter(0), deps=("gp",))
+    registry.register("globalpolicies", itemgetter(1), deps=("gp",))
+    registry.register("gp_transposed", transpose_gp_data, deps=("globalpolicies",))
+    registry.register(
+        "kpis", create_kpi_data, deps=("pue", "wue", "pue_wue", "energyprojections")
+    )
 
-    return company_profile_df
+    return registry
 
 
 def update_metadata():
@@ -85,7 +85,9 @@ def create_gp_choropleth_map(
         # Create combined location string: "State, Country"
         state_bubbles = state_bubbles.copy()
         state_bubbles["location"] = (
-            state_bubbles["state_province"] + ", " + state_bubbles["country"]
+            state_bubbles["state_province"].astype(str)
+            + ", "
+            + state_bubbles["country"].astype(str)
         )
         fig.add_scattergeo(
             lat=state_bubbles["state_lat"],
@@ -113,7 +115,9 @@ def create_gp_choropleth_map(
     if not city_bubbles.empty:
         # Create combined location string: "City, Country"
         city_bubbles = city_bubbles.copy()
-        city_bubbles["location"] = city_bubbles["city"] + ", " + city_bubbles["country"]
+        city_bubbles["location"] = (
+            city_bubbles["city"].astype(str) + ", " + city_bubbles["country"].astype(str)
+        )
         fig.add_scattergeo(
             lat=city_bubbles["lat"],
             lon=city_bubbles["lon"],
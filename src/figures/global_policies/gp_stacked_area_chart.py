@@ -4,6 +4,26 @@ import pandas as pd
 import colorsys
 import plotly.colors as pc
 from datetime import datetime
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Columns read by create_gp_stacked_area_plot; callers can pass narrower frames
+GP_STACKED_AREA_COLUMNS = [
+    "policy_id",
+    "authors",
+    "jurisdiction_level",
+    "region",
+    "supranational_policy_area",
+    "country",
+    "state_province",
+    "city",
+    "county",
+    "order_type",
+    "status",
+    "year_introduced",
+]
 
 
 def create_gp_stacked_area_plot(filtered_df, full_df=None, filters_applied=False):
@@ -19,12 +39,14 @@ def create_gp_stacked_area_plot(filtered_df, full_df=None, filters_applied=False
     # Reset template to avoid Plotly template corruption bug
     pio.templates.default = "simple_white"
 
-    # Make copies to avoid modifying the original DataFrames
-    filtered_df = filtered_df.copy()
-    # full_df = full_df.copy()
+    # Shallow copy: the column added below never reaches the caller's frame
+    # (copy-on-write), and no data is copied up front
+    filtered_df = filtered_df.copy(deep=False)
 
     filtered_df["area_group"] = (
-        filtered_df["country"] + " - " + filtered_df["jurisdiction_level"]
+        filtered_df["country"].astype(str)
+        + " - "
+        + filtered_df["jurisdiction_level"].astype(str)
     )
     df_unique = filtered_df.drop_duplicates(
         subset=[
@@ -92,8 +114,10 @@ def create_gp_stacked_area_plot(filtered_df, full_df=None, filters_applied=False
                 data_year - 1
             )  # Use year before data year if baseline is not earlier
         all_years = [baseline_year, data_year]
-        print(
-            f"Only one year found ({data_year}), adding baseline year {baseline_year} for area plot rendering"
+        logger.debug(
+            "Only one year found (%s), adding baseline year %s for area plot rendering",
+            data_year,
+            baseline_year,
         )
 
     # Create complete year-area_group combinations
@@ -344,9 +368,11 @@ def create_gp_stacked_area_plot(filtered_df, full_df=None, filters_applied=False
     # This should be the sum across ALL groups, not max per group
     if full_df is not None:
         # Process full_df similar to filtered_df to get cumulative policies
-        full_df_copy = full_df.copy()
+        full_df_copy = full_df.copy(deep=False)
         full_df_copy["area_group"] = (
-            full_df_copy["country"] + " - " + full_df_copy["jurisdiction_level"]
+            full_df_copy["country"].astype(str)
+            + " - "
+            + full_df_copy["jurisdiction_level"].astype(str)
         )
         full_df_unique = full_df_copy.drop_duplicates(
             subset=[
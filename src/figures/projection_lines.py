@@ -0,0 +1,404 @@
+"""
+Line charts of energy and water demand projections.
+
+Both projection charts draw every (study, scenario) line of the selected
+units in gray and highlight the lines of the selected rows in their study
+color, next to a dual legend (scenarios, then studies). The full dataset
+is grouped once into one pre-styled line trace per (citation,
+scenario); the lines to highlight are found by a set join of the trace
+keys against the selected (citation, label) pairs, so building a figure
+is linear in its traces.
+
+Trace order and line dashes follow Plotly Express (which the charts used
+to be drawn with), and highlight_patch() restyles a drawn figure from one
+filter state to another without resending its data.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from dash import Patch
+
+from helpers.hover_text import PROJECTION_HOVER_COLUMNS, with_hover_columns
+
+# Line dash of the known scenarios; other scenarios follow the dash sequence
+# Plotly Express assigns in order of appearance
+SCENARIO_LINE_STYLES = {
+    "Historical": "solid",
+    "Lower scenario": "dash",
+    "Upper scenario": "dot",
+}
+DASH_SEQUENCE = ["solid", "dot", "dash", "longdash", "dashdot", "longdashdot"]
+
+# Per-point hover data; hover lines are precomputed per dataset (helpers.hover_text)
+CUSTOM_DATA = [
+    "citation",
+    "energy_demand",
+    "year",
+    "hover_region",
+    "hover_data_center_type",
+    "hover_modeling_approach",
+    "hover_time_horizon",
+    "hover_label",
+]
+
+
+def _trace_groups(plot_df):
+    """
+    Group the rows of a chart frame into line traces.
+
+    Rows are grouped by citation and scenario (the label column); groups are
+    ordered by first appearance of the citation, then of the scenario.
+
+    Returns:
+        list of (citation, scenario, dash, row positions) per trace
+    """
+    citation_codes, citations = pd.factorize(plot_df["citation"].astype(object))
+    # rows without a scenario form their own line, as in Plotly Express
+    label_codes, labels = pd.factorize(
+        plot_df["label"].astype(object), use_na_sentinel=False
+    )
+    known = np.flatnonzero(citation_codes >= 0)
+    keys = citation_codes[known] * len(labels) + label_codes[known]
+
+    if not len(keys):
+        return []
+
+    # one stable sort of the rows by trace, then split at each new trace
+    order = np.argsort(keys, kind="stable")
+    starts = np.flatnonzero(np.diff(keys[order])) + 1
+    groups = []
+    for rows in np.split(known[order], starts):
+        label_code = label_codes[rows[0]]
+        scenario = labels[label_code]
+        dash = SCENARIO_LINE_STYLES.get(
+            scenario, DASH_SEQUENCE[label_code % len(DASH_SEQUENCE)]
+        )
+        groups.append((citations[citation_codes[rows[0]]], scenario, dash, rows))
+    return groups
+
+
+def _chart_frame(full_df):
+    """Return the full dataset in chart order (by citation and year), with hover lines."""
+    return with_hover_columns(
+        full_df.sort_values(["citation", "year"]), PROJECTION_HOVER_COLUMNS
+    )
+
+
+def projection_traces(full_df):
+    """
+    Return the (citation, scenario, dash) of each line trace, in trace order.
+
+    Args:
+        full_df: Full dataset of the chart (one units value)
+    """
+    return [
+        (citation, scenario, dash)
+        for citation, scenario, dash, _ in _trace_groups(_chart_frame(full_df))
+    ]
+
+
+def highlight_state(traces, filtered_df, filters_applied):
+    """
+    Return the traces a filter state highlights and the legend entries it shows.
+
+    Args:
+        traces: projection_traces() of the full dataset
+        filtered_df: Selected rows
+        filters_applied: Boolean indicating if filters are actively applied
+
+    Returns:
+        dict with "filtered" (highlighting is on), "colors" ({trace position:
+        study color} of the highlighted traces), "color_map" (study colors)
+        and "legend" (legend entry traces, appended after the line traces)
+    """
+    filtered_df = filtered_df.sort_values(["citation", "year"])
+    citations = filtered_df["citation"].unique()
+    palette = px.colors.qualitative.Dark24
+    color_map = {
+        citation: palette[i % len(palette)] for i, citation in enumerate(citations)
+    }
+    state = {"filtered": False, "colors": {}, "color_map": color_map, "legend": []}
+    if not filters_applied or filtered_df.empty:
+        return state
+
+    # A trace is highlighted when a selected row has its study and scenario
+    if "label" in filtered_df.columns:
+        selected = set(zip(filtered_df["citation"], filtered_df["label"]))
+        highlighted = [(citation, scenario) in selected for citation, scenario, _ in traces]
+    else:
+        # If no label column, highlight all scenarios of the selected studies
+        selected = set(citations)
+        highlighted = [citation in selected for citation, _, _ in traces]
+    state["filtered"] = True
+    state["colors"] = {
+        position: color_map[traces[position][0]]
+        for position, on in enumerate(highlighted)
+        if on
+    }
+
+    # Dual legend: scenarios of the selected rows, then the selected studies
+    if "label" in filtered_df.columns:
+        unique_labels = filtered_df["label"].unique()
+    else:
+        unique_labels = [scenario for _, scenario, _ in traces]
+    scenario_colors = ["black", "black", "black"]  # Use black for scenario legend
+    legend = []
+    for i, label in enumerate(sorted(unique_labels)):
+        if label and not pd.isna(label):
+            legend.append(
+                go.Scatter(
+                    x=[None], y=[None],  # Empty trace just for legend
+                    mode="lines",
+                    line=dict(
+                        color=scenario_colors[i % len(scenario_colors)],
+                        width=2,
+                        dash=SCENARIO_LINE_STYLES.get(label, "solid"),
+                    ),
+                    name=label,
+                    showlegend=True,
+                    legendgroup="scenarios",
+                    hovertemplate="<extra></extra>",  # Hide hover
+                )
+            )
+
+    # Add separator (invisible trace with blank name)
+    legend.append(
+        go.Scatter(
+            x=[None], y=[None],
+            mode="lines",
+            line=dict(color="rgba(0,0,0,0)", width=0),
+            name="",  # Empty name creates visual separation
+            showlegend=True,
+            legendgroup="separator",
+            hovertemplate="<extra></extra>",
+        )
+    )
+
+    for citation in sorted(citations):
+        legend.append(
+            go.Scatter(
+                x=[None], y=[None],  # Empty trace just for legend
+                mode="lines",
+                line=dict(color=color_map.get(citation, "blue"), width=2),
+                name=citation,
+                showlegend=True,
+                legendgroup="citations",
+                hovertemplate="<extra></extra>",  # Hide hover
+            )
+        )
+    state["legend"] = legend
+    return state
+
+
+def trace_style(dash, color, filtered, y_label):
+    """
+    Return the style of one line trace.
+
+    Args:
+        dash: Line dash of the trace's scenario
+        color: Study color when the trace is highlighted, else None (gray)
+        filtered: Whether highlighting is on (gray traces are then fainter)
+        y_label: Value label of the hover text
+    """
+    if color is not None:
+        # This trace matches the filter - show in color with full hover
+        return dict(
+            line=dict(color=color, dash=dash, width=2),
+            marker=dict(
+                symbol="circle",
+                size=6,
+                opacity=0.7,
+                line=dict(width=0.5, color="grey"),
+            ),
+            opacity=1.0,
+            showlegend=False,  # Hide original legend entries for dual legend
+            hovertemplate=(
+                "<b>Publication: %{customdata[0]}</b><br>"
+                + "Year: %{x}<br>"
+                + f"{y_label}: "+"%{y:.2f}<br>"
+                + "%{customdata[3]}"
+                + "%{customdata[4]}"
+                + "%{customdata[5]}"
+                + "<extra></extra>"
+            ),
+        )
+    # Gray with minimal hover; fainter next to highlighted traces
+    return dict(
+        line=dict(color="lightgray", dash=dash, width=2),
+        marker=dict(symbol="circle", size=5, opacity=0.6 if filtered else 0.7),
+        opacity=0.4 if filtered else 0.6,
+        showlegend=False,  # Hide original legend entries for dual legend
+        hovertemplate=(
+            "<b>%{customdata[0]}</b><br>"
+            + "Year: %{x}<br>"
+            + f"{y_label}: "+"%{y:.2f}<br>"
+            + "<extra></extra>"
+        ),
+    )
+
+
+def highlight_summary(state):
+    """Return the JSON-serializable part of a highlight state that highlight_patch() needs."""
+    return {
+        "filtered": state["filtered"],
+        "colors": {str(position): color for position, color in state["colors"].items()},
+        "legend": len(state["legend"]),
+    }
+
+
+def highlight_patch(traces, previous, state, filters_applied, y_label):
+    """
+    Return a dash.Patch restyling a figure from one highlight state to another.
+
+    Only the line traces whose highlight changed are restyled (line, marker,
+    opacity and hover text); the legend entries are replaced.
+
+    Args:
+        traces: projection_traces() the figure was built from
+        previous: highlight_summary() of the figure's current state
+        state: highlight_state() of the new filter state
+        filters_applied: Boolean indicating if filters are actively applied
+        y_label: Value label of the hover text
+    """
+    patch = Patch()
+    previous_colors = {int(k): color for k, color in previous["colors"].items()}
+    for position, (_, _, dash) in enumerate(traces):
+        before = (previous["filtered"], previous_colors.get(position))
+        after = (state["filtered"], state["colors"].get(position))
+        if before == after:
+            continue
+        style = trace_style(dash, after[1], after[0], y_label)
+        for prop in ("line", "marker", "opacity", "hovertemplate"):
+            patch["data"][position][prop] = style[prop]
+
+    # Legend entries follow the line traces; drop the old ones from the end
+    for position in reversed(range(len(traces), len(traces) + previous["legend"])):
+        del patch["data"][position]
+    if state["legend"]:
+        patch["data"].extend([trace.to_plotly_json() for trace in state["legend"]])
+    patch["layout"]["showlegend"] = filters_applied
+    return patch
+
+
+def create_projection_line_plot(
+    filtered_df, full_df, filters_applied, yaxis_title, y_label
+):
+    """
+    Create a projections line plot with dual legend system
+
+    Args:
+        filtered_df: DataFrame to display
+        full_df: unfiltered DataFrame
+        filters_applied: Boolean indicating if filters are actively applied
+        yaxis_title: Y axis title of the empty-data figure
+        y_label: Y axis title and hover value label
+    """
+    # Calculate axis ranges to avoid extra empty space
+    ymin = full_df["energy_demand"].min() - 10
+    ymax = full_df["energy_demand"].max() + 10
+    xmin = full_df["year"].min() - 1
+    xmax = full_df["year"].max() + 1
+
+    if full_df.empty:
+        return {
+            "data": [],
+            "layout": {
+                "xaxis": {"title": "Year", "visible": True},
+                "yaxis": {"title": yaxis_title, "visible": True},
+                "showlegend": False,
+                "annotations": [
+                    {
+                        "text": "No data available for selected filters",
+                        "xref": "paper",
+                        "yref": "paper",
+                        "x": 0.5,
+                        "y": 0.5,
+                        "showarrow": False,
+                        "font": {"size": 16, "color": "gray"},
+                    }
+                ],
+                "plot_bgcolor": "white",
+            },
+        }
+
+    # Always work with the full dataset
+    plot_df = _chart_frame(full_df)
+    groups = _trace_groups(plot_df)
+    state = highlight_state(
+        [group[:3] for group in groups], filtered_df, filters_applied
+    )
+
+    x = plot_df["year"].to_numpy()
+    y = plot_df["energy_demand"].to_numpy()
+    customdata = plot_df[CUSTOM_DATA].to_numpy(dtype=object)
+
+    # WebGL for larger datasets, like Plotly Express' automatic render mode
+    trace_type = go.Scattergl if len(plot_df) > 1000 else go.Scatter
+
+    # One pre-styled trace per (citation, scenario): highlighted traces in
+    # their study color, all others in gray
+    traces = []
+    # the scenario hover line is display text only (trace name), not a key
+    hover_labels = plot_df["hover_label"].to_numpy()
+    for position, (citation, scenario, dash, rows) in enumerate(groups):
+        name = f"{citation}, {hover_labels[rows[0]]}"
+        traces.append(
+            trace_type(
+                x=x[rows],
+                y=y[rows],
+                customdata=customdata[rows],
+                mode="lines+markers",
+                name=name,
+                legendgroup=name,
+                **trace_style(
+                    dash, state["colors"].get(position), state["filtered"], y_label
+                ),
+            )
+        )
+
+    # Dual legend entries (only if filters are applied) follow the lines
+    fig = go.Figure(data=traces + state["legend"])
+
+    fig.update_layout(
+        font_family="Inter",
+        plot_bgcolor="white",
+        margin=dict(t=60, r=300),  # Increased right margin for dual legend
+        xaxis=dict(
+            title_text="Year",
+            range=[xmin, xmax],
+            showgrid=False,  # disable gridlines
+            dtick=1,  # force yearly intervals
+            showline=True,
+            linecolor="black",
+            linewidth=1,
+            title_font=dict(size=14),
+        ),
+        yaxis=dict(
+            title_text=y_label,
+            range=[
+                ymin,
+                ymax,
+            ],
+            showgrid=False,  # Disable gridlines
+            showline=True,
+            linecolor="black",
+            linewidth=1,
+            title_font=dict(size=14),
+        ),
+        legend=dict(
+            title_text="",
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.05,
+            traceorder="normal",
+            tracegroupgap=0,
+        ),
+        showlegend=filters_applied,
+        template="simple_white",
+    )
+
+    return fig
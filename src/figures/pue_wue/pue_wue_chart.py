@@ -1,6 +1,23 @@
 import plotly.express as px
 import plotly.io as pio
-import pandas as pd
+
+from helpers.hover_text import PUE_WUE_HOVER_COLUMNS, with_hover_columns
+
+
+# Columns read by create_pue_wue_scatter_plot; callers can pass narrower frames
+PUE_WUE_CHART_COLUMNS = [
+    "company_name",
+    "metric_value",
+    "wue_value",
+    "hover_pue_type",
+    "hover_pue_measurement_category",
+    "hover_time_period_category",
+    "hover_facility_scope",
+    "hover_region",
+    "hover_country",
+    "hover_city",
+    "hover_climate_zone",
+]
 
 
 def create_pue_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
@@ -92,56 +109,20 @@ def create_pue_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False
             },
         }
 
-    # Create fields for hover text
-    def create_hover_text(df):
-        """Process DataFrame fields for hover text display"""
-        df["metric_type"] = df["metric_type"].apply(
-            lambda x: f"PUE Type: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["measurement_category"] = df["measurement_category"].apply(
-            lambda x: f"PUE Measurement Category: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["time_period_category"] = df["time_period_category"].apply(
-            lambda x: f"Time Period Category: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["facility_scope"] = df["facility_scope"].apply(
-            lambda x: f"Facility Scope: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["region_text"] = df["region"].apply(
-            lambda x: f"Region: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["country"] = df["country"].apply(
-            lambda x: f"Country: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["city"] = df["city"].apply(
-            lambda x: f"City: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["climate_text"] = df["assigned_climate_zones"].apply(
-            lambda x: f"IECC Climate Zone: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-
+    # Hover lines are precomputed per dataset (helpers.hover_text)
     custom_data = [
         "company_name",
-        "metric_type",
-        "measurement_category",
-        "time_period_category",
-        "facility_scope",
-        "region_text",
-        "country",
-        "city",
-        "climate_text",
+        "hover_pue_type",
+        "hover_pue_measurement_category",
+        "hover_time_period_category",
+        "hover_facility_scope",
+        "hover_region",
+        "hover_country",
+        "hover_city",
+        "hover_climate_zone",
     ]
 
-    filtered_df = filtered_df.copy()
-    create_hover_text(filtered_df)
+    filtered_df = with_hover_columns(filtered_df, PUE_WUE_HOVER_COLUMNS)
 
     # Create the scatter plot with conditional parameters
     scatter_params = {
@@ -178,12 +159,12 @@ def create_pue_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False
             # Filter background data to exclude companies already displayed
             background_df = full_df[
                 ~full_df["company_name"].isin(filtered_companies)
-            ].copy()
+            ]
 
             if (
                 not background_df.empty
             ):  # Only create background if there are companies to show
-                create_hover_text(background_df)
+                background_df = with_hover_columns(background_df, PUE_WUE_HOVER_COLUMNS)
 
                 background_fig = px.scatter(
                     background_df,
@@ -1,7 +1,30 @@
 import plotly.express as px
 import plotly.io as pio
-import pandas as pd
-import hashlib
+
+from helpers.hover_text import PUE_WUE_HOVER_COLUMNS, with_hover_columns
+from helpers.scatter_jitter import (
+    WUE_JITTER,
+    X_JITTER_COLUMN,
+    add_x_jitter,
+    year_positions,
+)
+
+
+# Columns read by create_wue_scatter_plot; callers can pass narrower frames
+WUE_CHART_COLUMNS = [
+    "company_name",
+    "metric_value",
+    "time_period_value",
+    "custom_x_jitter",
+    "hover_wue_type",
+    "hover_measurement_category",
+    "hover_time_period_category",
+    "hover_facility_scope",
+    "hover_region",
+    "hover_country",
+    "hover_city",
+    "hover_climate_zone",
+]
 
 
 def create_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
@@ -16,78 +39,21 @@ def create_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
     # Reset template to avoid Plotly template corruption bug
     pio.templates.default = "simple_white"
 
-    # Make copies to avoid modifying the original DataFrames
-    filtered_df = filtered_df.copy()
-    full_df = full_df.copy()
+    # Shallow copies: columns added below never reach the caller's frames
+    # (copy-on-write), and no data is copied up front
+    filtered_df = filtered_df.copy(deep=False)
+    full_df = full_df.copy(deep=False)
 
     # Define years and set progressive gaps along the timeline
     # Use full dataset to ensure all years are included for consistent x-axis
-    years = sorted(full_df["time_period_value"].unique())
-    gap_small = 1.0
-    gap_medium = 1.7
-    gap_large = 2.5
-    year_x_map = {}
-    current_x = years[0]
-    for year in years:
-        year_x_map[year] = current_x
-        if year < 2017:
-            current_x += gap_small
-        elif year < 2020:
-            current_x += gap_medium
-        else:
-            current_x += gap_large
-
-    # Calculate progressive jitter amount for each year (e.g., more jitter for later years)
-    min_jitter = 0.15
-    max_jitter = 0.8
-    year_jitter_map = {}
-    for i, year in enumerate(years):
-        # Linear interpolation between min_jitter and max_jitter
-        year_jitter_map[year] = min_jitter + (max_jitter - min_jitter) * (
-            i / (len(years) - 1)
-        )
-
-    # Create deterministic jitter based on company name and year
-    def add_deterministic_x_jitter(row):
-        """Create deterministic x-jitter with more variation for same company/year"""
-        jitter_amt = year_jitter_map[row["time_period_value"]]
-
-        # Create hash from company name, year, facility scope, region and city
-        # Use empty string for missing values
-        facility_scope = (
-            row["facility_scope"]
-            if "facility_scope" in row.index and pd.notna(row["facility_scope"])
-            else ""
-        )
-        region = (
-            row["region"] if "region" in row.index and pd.notna(row["region"]) else ""
-        )
-        city = row["city"] if "city" in row.index and pd.notna(row["city"]) else ""
-
-        hash_input = f"{row['company_name']}_{row['time_period_value']}_{facility_scope}_{region}_{city}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest()[:8], 16)
-
-        # Normalize hash to [-1, 1] range
-        normalized_hash = (hash_value / (16**8 - 1)) * 2 - 1
-
-        # Apply jitter - explicitly return a scalar float
-        result = float(
-            year_x_map[row["time_period_value"]] + normalized_hash * jitter_amt
-        )
-        return result
+    years = sorted(full_df["time_period_value"].dropna().unique())
+    year_x = year_positions(years)
 
-    # Apply deterministic jitter
-    full_df["custom_x_jitter"] = full_df.apply(
-        lambda row: add_deterministic_x_jitter(row), axis=1
-    )
-    # Check if filtered_df is empty before applying jitter
-    if not filtered_df.empty:
-        filtered_df["custom_x_jitter"] = filtered_df.apply(
-            lambda row: add_deterministic_x_jitter(row), axis=1
-        )
-    else:
-        # Create empty custom_x_jitter column for empty DataFrame
-        filtered_df["custom_x_jitter"] = pd.Series([], dtype=float)
+    # Deterministic x-jitter is precomputed when the dataset is loaded
+    # (helpers.scatter_jitter); frames without it get it computed here
+    for frame in (full_df, filtered_df):
+        if X_JITTER_COLUMN not in frame.columns:
+            frame[X_JITTER_COLUMN] = add_x_jitter(frame, *WUE_JITTER, years=years)
 
     # Sort by company name for consistent ordering
     full_df = full_df.sort_values("company_name")
@@ -178,58 +144,22 @@ def create_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
             },
         }
 
-    # Create fields for hover text
-    def create_hover_text(df):
-        """Process DataFrame fields for hover text display"""
-        df["metric_type"] = df["metric_type"].apply(
-            lambda x: f"WUE Type: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["measurement_category"] = df["measurement_category"].apply(
-            lambda x: f"Measurement Category: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["time_period_category"] = df["time_period_category"].apply(
-            lambda x: f"Time Period Category: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["facility_scope"] = df["facility_scope"].apply(
-            lambda x: f"Facility Scope: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-        df["region_text"] = df["region"].apply(
-            lambda x: f"Region: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["country"] = df["country"].apply(
-            lambda x: f"Country: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["city"] = df["city"].apply(
-            lambda x: f"City: {x}<br>" if pd.notna(x) and str(x).strip() else ""
-        )
-        df["climate_text"] = df["assigned_climate_zones"].apply(
-            lambda x: f"IECC Climate Zone: {x}<br>"
-            if pd.notna(x) and str(x).strip()
-            else ""
-        )
-
+    # Hover lines are precomputed per dataset (helpers.hover_text)
     custom_data = [
         "company_name",
         "metric_value",
-        "metric_type",
-        "measurement_category",
-        "time_period_category",
+        "hover_wue_type",
+        "hover_measurement_category",
+        "hover_time_period_category",
         "time_period_value",
-        "facility_scope",
-        "region_text",
-        "country",
-        "city",
-        "climate_text",
+        "hover_facility_scope",
+        "hover_region",
+        "hover_country",
+        "hover_city",
+        "hover_climate_zone",
     ]
 
-    filtered_df = filtered_df.copy()
-    create_hover_text(filtered_df)
+    filtered_df = with_hover_columns(filtered_df, PUE_WUE_HOVER_COLUMNS)
 
     # Create the scatter plot
     # Note: Don't pass template here to avoid Plotly template corruption bug
@@ -269,12 +199,12 @@ def create_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
             # Filter background data to exclude companies already displayed
             background_df = full_df[
                 ~full_df["company_name"].isin(filtered_companies)
-            ].copy()
+            ]
 
             if (
                 not background_df.empty
             ):  # Only create background if there are companies to show
-                create_hover_text(background_df)
+                background_df = with_hover_columns(background_df, PUE_WUE_HOVER_COLUMNS)
 
                 background_fig = px.scatter(
                     background_df,
@@ -298,7 +228,7 @@ def create_wue_scatter_plot(filtered_df, full_df=None, filters_applied=False):
                 )
     wue_fig.update_xaxes(
         range=[xmin - 1, xmax + 1],
-        tickvals=[year_x_map[year] for year in years],
+        tickvals=year_x.tolist(),
         ticktext=[str(year) for year in years],
         showgrid=False,
         showline=True,
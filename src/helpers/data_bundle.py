@@ -0,0 +1,153 @@
+"""
+Prebuilt data bundle: every dataset the dashboard uses, computed offline.
+
+scripts/build_data_bundle.py runs all loaders and derived builders once and
+writes the results to a versioned folder under data/bundle/ with a manifest.
+With DCEWM_DATA_BUNDLE set, create_app reads the frames straight from the
+bundle instead of parsing workbooks, so openpyxl, pyjanitor and geopy are
+never imported.
+
+DCEWM_DATA_BUNDLE=1 uses the bundle named in data/bundle/LATEST; any other
+value is taken as the path of a bundle folder.
+"""
+
+import functools
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from helpers.dataset_registry import DatasetRegistry
+from helpers.env_config import env_flag, parse_flag
+from helpers.logging_config import get_logger
+from helpers.snapshot_cache import read_frame, write_frame
+
+# Get absolute path to data/bundle folder
+_script_dir = Path(__file__).parent
+_project_root = _script_dir.parent.parent
+BUNDLE_ROOT = _project_root / "data" / "bundle"
+LATEST_FILE = "LATEST"
+MANIFEST_FILE = "manifest.json"
+
+# bump when the bundle layout changes
+BUNDLE_FORMAT = 1
+
+logger = get_logger(__name__)
+
+
+def data_bundle_enabled():
+    """Return True when the app should load from a prebuilt bundle (DCEWM_DATA_BUNDLE)."""
+    return env_flag("DCEWM_DATA_BUNDLE", False)
+
+
+def resolve_bundle_dir(root=None):
+    """Return the bundle folder selected by DCEWM_DATA_BUNDLE."""
+    setting = os.environ.get("DCEWM_DATA_BUNDLE", "1")
+    # a boolean selects the latest bundle; any other value is a folder path
+    if parse_flag(setting) is None:
+        return Path(setting.strip())
+    root = Path(root or BUNDLE_ROOT)
+    latest = root / LATEST_FILE
+    if not latest.exists():
+        raise FileNotFoundError(
+            f"No data bundle found at {root}; run scripts/build_data_bundle.py"
+        )
+    return root / latest.read_text().strip()
+
+
+def write_bundle(values, sources=None, root=None):
+    """
+    Write datasets into a new bundle folder and mark it as the latest.
+
+    Args:
+        values: Dict of dataset name to DataFrame or JSON-serializable value;
+            tuples of frames are skipped (their parts are separate datasets)
+        sources: Fingerprints of the workbooks the datasets were built from
+        root: Folder holding the bundles (defaults to data/bundle/)
+
+    Returns:
+        Path of the written bundle folder
+    """
+    root = Path(root or BUNDLE_ROOT)
+    bundle_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    bundle_dir = root / bundle_id
+    staging_dir = root / f".{bundle_id}.{os.getpid()}.tmp"
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+
+    datasets = {}
+    try:
+        for name, value in values.items():
+            if isinstance(value, tuple):
+                continue
+            if isinstance(value, pd.DataFrame):
+                datasets[name] = {
+                    "file": write_frame(value, staging_dir / name),
+                    "rows": len(value),
+                    "columns": len(value.columns),
+                }
+            else:
+                datasets[name] = {"value": value}
+
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "bundle": bundle_id,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "sources": sources or {},
+            "datasets": datasets,
+        }
+        with open(staging_dir / MANIFEST_FILE, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(staging_dir, bundle_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    # point LATEST at the new bundle only once it is complete
+    tmp_latest = root / (LATEST_FILE + ".tmp")
+    tmp_latest.write_text(bundle_id)
+    os.replace(tmp_latest, root / LATEST_FILE)
+    return bundle_dir
+
+
+def read_manifest(bundle_dir):
+    with open(Path(bundle_dir) / MANIFEST_FILE, "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(
+            f"Data bundle {bundle_dir} has format {manifest.get('format')}, "
+            f"expected {BUNDLE_FORMAT}; rebuild it with scripts/build_data_bundle.py"
+        )
+    return manifest
+
+
+def read_bundle_dataset(bundle_dir, name, entry):
+    """Load one dataset from a bundle folder."""
+    if "value" in entry:
+        return entry["value"]
+    return read_frame(Path(bundle_dir) / entry["file"])
+
+
+def create_bundle_registry(bundle_dir=None, profiler=None):
+    """
+    Register every dataset of a bundle.
+
+    Returns:
+        DatasetRegistry whose loaders read the prebuilt frames
+    """
+    bundle_dir = Path(bundle_dir or resolve_bundle_dir())
+    manifest = read_manifest(bundle_dir)
+    logger.info("Loading data bundle %s (%s)", manifest["bundle"], manifest["created"])
+
+    registry = DatasetRegistry(profiler=profiler)
+    for name, entry in manifest["datasets"].items():
+        registry.register(
+            name,
+            functools.partial(read_bundle_dataset, str(bundle_dir), name, entry),
+            sources=(),
+        )
+    return registry
@@ -0,0 +1,98 @@
+"""
+Background watcher that reloads datasets when workbooks in data/ change.
+
+Polls the modification time and size of the workbooks in the data folder
+(no extra dependency needed) and reports files that changed. A change is only
+reported once a file has looked the same for two consecutive polls, so a
+workbook that is still being copied into place is not read half-written.
+
+Enable with DCEWM_WATCH_DATA=1; the poll interval in seconds can be set with
+DCEWM_WATCH_INTERVAL (default 5).
+"""
+
+import threading
+from pathlib import Path
+
+from helpers.env_config import env_flag, env_number
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def data_watch_enabled():
+    """Return True when the data folder watcher is enabled via DCEWM_WATCH_DATA."""
+    return env_flag("DCEWM_WATCH_DATA", False)
+
+
+class DataWatcher:
+    """Poll a folder and call on_change(file_names) when workbooks change."""
+
+    def __init__(self, directory, on_change, interval=None, pattern="*.xlsx"):
+        self.directory = Path(directory)
+        self.on_change = on_change
+        if interval is None:
+            interval = env_number("DCEWM_WATCH_INTERVAL", 5)
+        self.interval = interval
+        self.pattern = pattern
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._state = self._scan()
+        self._last_seen = self._state
+
+    def _scan(self):
+        """Return {file name: (mtime, size)} for the watched workbooks."""
+        state = {}
+        for path in self.directory.glob(self.pattern):
+            if path.name.startswith("~$"):
+                continue  # skip temporary Excel files
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path.name] = (stat.st_mtime, stat.st_size)
+        return state
+
+    def poll(self):
+        """
+        Check the folder once.
+
+        Returns:
+            Sorted list of changed file names (empty if nothing settled)
+        """
+        current = self._scan()
+        if current != self._last_seen:
+            # still changing; wait until it settles
+            self._last_seen = current
+            return []
+
+        changed = sorted(
+            name
+            for name in set(current) | set(self._state)
+            if current.get(name) != self._state.get(name)
+        )
+        self._state = current
+        return changed
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                changed = self.poll()
+                if changed:
+                    self.on_change(changed)
+            except Exception as e:
+                logger.exception("Error while reloading changed data files: %s", e)
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="dcewm-data-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,90 @@
+"""
+Per-value partitions of a registry dataset.
+
+Pages that always show one slice of a dataset (the energy projections page
+shows either TWh or GW rows) used to select and copy that slice from the
+full frame on every request. DatasetPartitions splits the dataset once by
+one column and keeps each slice together with data precomputed from it
+(option lists, facet indexes). Callbacks pick a partition by key.
+
+Partitions are rebuilt when the registry reports a new dataset version.
+They are shared between requests and must be treated as read-only; with
+pandas copy-on-write, frames derived from a partition never write back to
+it.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class Partition:
+    """One slice of a dataset and the data precomputed from it."""
+
+    def __init__(self, key, frame, data=None, version=None):
+        self.key = key
+        self.frame = frame
+        self.data = data
+        # (dataset version, key): changes whenever the frame does, for cache keys
+        self.version = (version, key)
+
+
+class DatasetPartitions:
+    """Read-only partitions of a registry dataset by the values of one column."""
+
+    def __init__(self, datasets, name, column, prepare=None):
+        """
+        Args:
+            datasets: DatasetRegistry
+            name: Dataset name
+            column: Column to partition by
+            prepare: Optional callable(frame) run once per partition; its
+                result is kept as Partition.data
+        """
+        self.datasets = datasets
+        self.name = name
+        self.column = column
+        self.prepare = prepare
+        self._lock = threading.Lock()
+        self._version = None
+        self._partitions = {}
+        self._empty = None
+
+    def _partition(self, key, frame, version):
+        data = self.prepare(frame) if self.prepare is not None else None
+        return Partition(key, frame, data, version)
+
+    def _build(self):
+        # read the version first: a reload in between only triggers another rebuild
+        version = self.datasets.version(self.name)
+        df = self.datasets.get(self.name)
+
+        codes, values = pd.factorize(df[self.column])
+        partitions = {}
+        for code, key in enumerate(values):
+            partitions[key] = self._partition(
+                key, df.take(np.flatnonzero(codes == code)), version
+            )
+
+        self._partitions = partitions
+        self._empty = self._partition(None, df.iloc[:0], version)
+        self._version = version
+
+    def _current(self):
+        with self._lock:
+            if self._version != self.datasets.version(self.name):
+                self._build()
+            return self._partitions, self._empty
+
+    def warm(self):
+        """Build the partitions now instead of on first use."""
+        self._current()
+
+    def get(self, key):
+        """Return the Partition for a column value (an empty one for unknown values)."""
+        partitions, empty = self._current()
+        return partitions.get(key, empty)
+
+    def keys(self):
+        return list(self._current()[0])
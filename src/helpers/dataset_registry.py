@@ -0,0 +1,331 @@
+"""
+Registry of the datasets used by the dashboard.
+
+Each dataset declares its loader, the upstream datasets the loader takes as
+arguments and the workbooks it reads. Results are computed once and memoized,
+so a dataset shared by several pages is only loaded once, and the registry can
+tell which datasets a changed workbook invalidates.
+
+get() is thread-safe: concurrent requests for a dataset that is not loaded
+yet wait for a single load instead of each running the loader. reload()
+rebuilds datasets off to the side and swaps them in atomically, so requests
+already holding a frame finish on the old version.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from helpers.env_config import env_flag
+from helpers.logging_config import configure_logging, get_logger
+from helpers.startup_profiler import profile_call
+
+logger = get_logger(__name__)
+
+
+def parallel_loading_enabled():
+    """Return False when parallel loading is disabled via DCEWM_PARALLEL_LOAD."""
+    return env_flag("DCEWM_PARALLEL_LOAD", True)
+
+
+def lazy_loading_enabled():
+    """
+    Return True when lazy loading is enabled via DCEWM_LAZY_LOAD.
+
+    In lazy mode nothing is loaded at startup; each dataset loads on the first
+    request to a page or callback that needs it.
+    """
+    return env_flag("DCEWM_LAZY_LOAD", False)
+
+
+def run_loaders(loaders, profile=False):
+    """
+    Run zero-argument loaders in this process.
+
+    Returns:
+        (results by name, profiling records; empty unless profile is True)
+    """
+    # worker processes need their own log listener
+    configure_logging()
+    results = {}
+    records = []
+    for name, loader in loaders.items():
+        if profile:
+            results[name], record = profile_call(name, loader)
+            records.append(record)
+        else:
+            results[name] = loader()
+    return results, records
+
+
+class DatasetRegistry:
+    """Memoized, dependency-aware dataset loaders."""
+
+    def __init__(self, profiler=None):
+        # optional StartupProfiler recording every loader run
+        self.profiler = profiler
+        self._specs = {}
+        self._values = {}
+        self._lock = threading.RLock()
+        # one lock per dataset, so different datasets can load concurrently
+        self._load_locks = {}
+        # bumped on every reload, for caches keyed by dataset contents
+        self._versions = {}
+        self._reload_listeners = []
+
+    def register(self, name, loader, deps=(), sources=None):
+        """
+        Register a dataset.
+
+        Args:
+            name: Dataset name used by callbacks and pages
+            loader: Callable taking the upstream datasets (in deps order)
+            deps: Names of upstream datasets
+            sources: Workbook file names the loader reads; defaults to the
+                loader's snapshot sources, if any
+        """
+        for dep in deps:
+            if dep not in self._specs:
+                raise KeyError(f"Dataset '{name}' depends on unknown dataset '{dep}'")
+        if sources is None:
+            sources = getattr(loader, "snapshot_sources", ())
+        self._specs[name] = {
+            "loader": loader,
+            "deps": tuple(deps),
+            "sources": tuple(sources),
+        }
+        self._load_locks[name] = threading.Lock()
+        self._versions[name] = 0
+
+    def names(self):
+        """Return all registered dataset names in registration order."""
+        return list(self._specs)
+
+    def sources(self, name):
+        """Return the workbook file names a dataset's loader reads."""
+        return self._specs[name]["sources"]
+
+    def is_loaded(self, name):
+        return name in self._values
+
+    def version(self, name):
+        """Return a counter that changes whenever the dataset is reloaded."""
+        return self._versions[name]
+
+    def add_reload_listener(self, listener):
+        """Call listener(names) after datasets have been reloaded or invalidated."""
+        self._reload_listeners.append(listener)
+
+    def _notify(self, names):
+        for listener in self._reload_listeners:
+            try:
+                listener(names)
+            except Exception as e:
+                logger.exception("Dataset reload listener failed: %s", e)
+
+    def _build(self, name, inputs):
+        """Run a dataset's loader, recording it when a profiler is attached."""
+        spec = self._specs[name]
+        if self.profiler is None:
+            return spec["loader"](*inputs)
+        kind = "derived" if spec["deps"] else "loader"
+        return self.profiler.call(name, spec["loader"], *inputs, kind=kind)
+
+    def get(self, name):
+        """Return a dataset, loading it and its upstream datasets on first use."""
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name not in self._specs:
+            raise KeyError(f"Unknown dataset '{name}'")
+
+        # resolve upstream datasets before taking this dataset's lock, so a
+        # lock is only ever held while running its own loader
+        spec = self._specs[name]
+        inputs = [self.get(dep) for dep in spec["deps"]]
+        with self._load_locks[name]:
+            if name not in self._values:
+                self._values[name] = self._build(name, inputs)
+        return self._values[name]
+
+    __getitem__ = get
+
+    def get_with_version(self, name):
+        """
+        Return a dataset and its version as one consistent pair.
+
+        Calling get() and version() separately can pair an old frame with
+        the version of a reload that landed in between, so results cached
+        under that version would come from the old frame. Reloads swap the
+        frame and bump the version under the dataset's lock; the pair is
+        read under the same lock, retrying if the frame changed meanwhile.
+
+        Returns:
+            (frame, version)
+        """
+        while True:
+            frame = self.get(name)
+            with self._load_locks[name]:
+                if self._values.get(name) is frame:
+                    return frame, self._versions[name]
+
+    def upstream(self, names):
+        """Return the given datasets plus everything they depend on."""
+        seen = []
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.append(name)
+                stack.extend(self._specs[name]["deps"])
+        return seen
+
+    def downstream(self, names):
+        """Return the given datasets plus everything derived from them."""
+        affected = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for name, spec in self._specs.items():
+                if name not in affected and affected.intersection(spec["deps"]):
+                    affected.add(name)
+                    changed = True
+        return [name for name in self._specs if name in affected]
+
+    def datasets_for_sources(self, sources):
+        """Return the datasets invalidated by changes to the given workbooks."""
+        sources = set(sources)
+        direct = [
+            name
+            for name, spec in self._specs.items()
+            if sources.intersection(spec["sources"])
+        ]
+        return self.downstream(direct)
+
+    def invalidate(self, names):
+        """Forget the given datasets and everything derived from them."""
+        affected = self.downstream(names)
+        with self._lock:
+            for name in affected:
+                with self._load_locks[name]:
+                    self._values.pop(name, None)
+                    self._versions[name] += 1
+        self._notify(affected)
+
+    def reload(self, names):
+        """
+        Rebuild the given datasets and everything derived from them.
+
+        Only datasets that are currently loaded are rebuilt; the others are
+        simply forgotten and load fresh on first use. New frames are built
+        before anything is replaced and swapped in together, so callers
+        never see a mix of old and new versions. If a loader fails the old
+        frames stay in place.
+
+        Returns:
+            List of affected dataset names, or None if the reload failed
+        """
+        affected = self.downstream(names)
+        staged = {}
+        try:
+            # registration order is a valid build order (deps register first)
+            for name in affected:
+                if name not in self._values:
+                    continue
+                spec = self._specs[name]
+                inputs = [
+                    staged[dep] if dep in staged else self.get(dep)
+                    for dep in spec["deps"]
+                ]
+                staged[name] = self._build(name, inputs)
+        except Exception as e:
+            logger.exception(
+                "Error reloading datasets %s, keeping current data: %s", affected, e
+            )
+            return None
+
+        with self._lock:
+            for name in affected:
+                with self._load_locks[name]:
+                    if name in staged:
+                        self._values[name] = staged[name]
+                    else:
+                        self._values.pop(name, None)
+                    self._versions[name] += 1
+        self._notify(affected)
+        return affected
+
+    def _build_ready(self, needed):
+        """Build the needed derived datasets whose inputs are all loaded."""
+        # registration order: a derived dataset built here can complete the
+        # inputs of one registered after it
+        for name, spec in self._specs.items():
+            if (
+                name in needed
+                and spec["deps"]
+                and name not in self._values
+                and all(dep in self._values for dep in spec["deps"])
+            ):
+                try:
+                    self.get(name)
+                except Exception as e:
+                    # built again (raising the error) once loading is done
+                    logger.debug("Early build of %s failed: %s", name, e)
+
+    def warm(self, names=None, max_workers=None, parallel=None):
+        """
+        Load datasets ahead of use.
+
+        Independent (root) loaders run concurrently in a process pool, grouped
+        by workbook so loaders reading the same workbook share a worker and its
+        workbook session. Each derived dataset is built in this process as soon
+        as all of its inputs have arrived, while the remaining workers are still
+        loading. Set DCEWM_PARALLEL_LOAD=0 to load sequentially.
+
+        Args:
+            names: Datasets to load (defaults to all registered datasets)
+            max_workers: Number of worker processes (defaults to one per
+                workbook, capped at the CPU count)
+            parallel: Use worker processes (defaults to DCEWM_PARALLEL_LOAD)
+        """
+        names = self.names() if names is None else names
+        needed = [n for n in self.upstream(names) if n not in self._values]
+        roots = [n for n in needed if not self._specs[n]["deps"]]
+
+        if parallel is None:
+            parallel = parallel_loading_enabled()
+        if parallel and len(roots) > 1:
+            groups = {}
+            for name in roots:
+                sources = self._specs[name]["sources"] or (name,)
+                groups.setdefault(tuple(sorted(sources)), {})[name] = self._specs[
+                    name
+                ]["loader"]
+            if max_workers is None:
+                max_workers = min(len(groups), os.cpu_count() or 1)
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(
+                            run_loaders, loaders, self.profiler is not None
+                        )
+                        for loaders in groups.values()
+                    ]
+                    for future in as_completed(futures):
+                        results, records = future.result()
+                        for name, value in results.items():
+                            with self._load_locks[name]:
+                                self._values.setdefault(name, value)
+                        for record in records:
+                            self.profiler.add(record)
+                        self._build_ready(needed)
+            except Exception as e:
+                # e.g. BrokenProcessPool, an unpicklable loader or a loader error;
+                # anything still missing is loaded (or fails again) below
+                logger.warning("Parallel loading failed (%s), loading sequentially", e)
+
+        # derived datasets (and any roots not loaded above)
+        for name in self._specs:
+            if name in needed:
+                self.get(name)
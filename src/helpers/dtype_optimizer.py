@@ -0,0 +1,151 @@
+"""
+Compact dtypes for the loaded datasets.
+
+Applied as the last step of each loader:
+- low-cardinality string columns become categoricals
+- year columns become nullable small integers (Int16)
+- float columns become float32 where every value survives the round trip
+
+A report of the bytes saved per frame is logged and kept for the process
+(see get_dtype_report()). Frames restored from a snapshot are already compact,
+so they are not reported again.
+"""
+
+import numpy as np
+import pandas as pd
+
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# convert string columns with at most this share of distinct values
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+_reports = {}
+
+
+def _is_string_column(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return False
+    if pd.api.types.is_string_dtype(series.dtype):
+        return True
+    if series.dtype == object:
+        values = series.dropna()
+        return not values.empty and values.map(type).eq(str).all()
+    return False
+
+
+def _to_category(series):
+    if len(series) == 0:
+        return None
+    if series.nunique() > CATEGORY_MAX_UNIQUE_RATIO * len(series):
+        return None
+    return series.astype("category")
+
+
+def _to_year(series):
+    # only whole, in-range years without gaps; columns with missing years
+    # stay float so comparisons never see pd.NA
+    if not pd.api.types.is_numeric_dtype(series.dtype) or series.isna().any():
+        return None
+    if pd.api.types.is_bool_dtype(series.dtype) or series.empty:
+        return None
+    values = series.to_numpy(dtype="float64")
+    if not np.array_equal(values, np.round(values)):
+        return None
+    info = np.iinfo(np.int16)
+    if values.min() < info.min or values.max() > info.max:
+        return None
+    return series.astype("Int16")
+
+
+def _to_float32(series):
+    if series.dtype != np.float64:
+        return None
+    values = series.to_numpy()
+    with np.errstate(over="ignore"):
+        compact = values.astype(np.float32)
+    if not np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+        return None
+    return pd.Series(compact, index=series.index, name=series.name)
+
+
+def _memory(obj):
+    usage = obj.memory_usage(deep=True)
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+
+def optimize_dtypes(df, name=None, verbose=True):
+    """
+    Convert a frame's columns to compact dtypes.
+
+    Args:
+        df: DataFrame to optimize (not modified)
+        name: Name used in the report (e.g. the dataset name)
+        verbose: Log the report line for this frame
+
+    Returns:
+        Optimized copy of the DataFrame
+    """
+    df = df.copy()
+    before = _memory(df)
+    columns = {}
+
+    for col in df.columns:
+        series = df[col]
+        if _is_string_column(series):
+            converted = _to_category(series)
+        else:
+            converted = None
+            if "year" in str(col).lower():
+                converted = _to_year(series)
+            if converted is None:
+                converted = _to_float32(series)
+
+        if converted is None:
+            continue
+        old_bytes, new_bytes = _memory(series), _memory(converted)
+        if new_bytes >= old_bytes:
+            continue
+        df[col] = converted
+        columns[col] = {
+            "from": str(series.dtype),
+            "to": str(converted.dtype),
+            "bytes_saved": old_bytes - new_bytes,
+        }
+
+    after = _memory(df)
+    report = {
+        "rows": len(df),
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after,
+        "columns": columns,
+    }
+    if name is not None:
+        _reports[name] = report
+    if verbose:
+        logger.info("%s", format_dtype_report(name or "frame", report))
+    return df
+
+
+def format_dtype_report(name, report):
+    """Return a one-line summary of a frame's dtype report."""
+    saved = report["bytes_saved"]
+    share = saved / report["bytes_before"] * 100 if report["bytes_before"] else 0
+    return (
+        f"Dtypes for {name}: {report['bytes_before'] / 1e6:.2f} MB -> "
+        f"{report['bytes_after'] / 1e6:.2f} MB (saved {saved / 1e6:.2f} MB, "
+        f"{share:.0f}%, {len(report['columns'])} columns converted)"
+    )
+
+
+def get_dtype_report():
+    """
+    Return the dtype reports of the frames optimized in this process.
+
+    Returns:
+        dict mapping frame name to rows, bytes_before, bytes_after,
+        bytes_saved and per-column conversions
+    """
+    return dict(_reports)
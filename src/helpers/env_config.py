@@ -0,0 +1,52 @@
+"""
+Parsing of the DCEWM_* environment flags.
+
+Settings are read when they are needed rather than at import time, so a
+flag changed in a test or before a reload takes effect. Invalid numbers are
+logged and the default is used instead.
+"""
+
+import os
+
+from helpers.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# boolean flag values (compared case-insensitively, ignoring surrounding spaces)
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off", "")
+
+
+def parse_flag(value):
+    """Return True or False for a boolean flag value, None for any other text."""
+    text = value.strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return None
+
+
+def env_flag(name, default):
+    """
+    Return a boolean flag.
+
+    Unset flags use default; "0", "false", "no", "off" and "" mean False,
+    anything else True.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return parse_flag(value) is not False
+
+
+def env_number(name, default):
+    """Return a numeric setting as a float; unset or invalid values use default."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid %s=%r, using %s", name, value, default)
+        return default
@@ -0,0 +1,200 @@
+"""
+Faceted filter options ("all but self") for the projection pages.
+
+Each dropdown lists the values still reachable under every other active
+filter, so a selection never hides its own alternatives. Instead of copying
+the data and re-applying all other filters once per dropdown, a
+FacetedSelection computes one boolean row mask per active filter and derives
+each facet's "all except me" mask from a per-row count of failed filters:
+a row is reachable for facet f when it fails no filter, or only f.
+
+Masks and options are computed on per-column value codes (categorical codes
+or factorized values) that are built once per dataset and cached for as long
+as the dataset frame is alive; the sorted option lists come from the
+dataset's OptionCatalog (see option_catalog).
+
+Facets are declared as {filter name: (column, kind)} with kind one of:
+- "single": value is one of the selected values
+- "multi": comma-separated list holds any selected value (see token_index)
+- "checkbox": value, compared as text, is one of the selected values
+- "range": numeric value within the selected [min, max]
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from helpers.option_catalog import OptionCatalog
+from helpers.token_index import TokenIndex
+
+_lock = threading.Lock()
+# id(frame) -> (weakref to frame, FacetIndex)
+_indexes = {}
+
+
+class FacetIndex:
+    """Per-column value codes of one dataset, built on first use."""
+
+    def __init__(self, df):
+        # weak, so the cache entry goes away with the dataset
+        self._df = weakref.ref(df)
+        self._codes = {}
+        self._token_indexes = {}
+        self._tokens = {}
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    @property
+    def catalog(self):
+        """OptionCatalog of the dataset, sharing these value codes."""
+        with self._lock:
+            if self._catalog is None:
+                self._catalog = OptionCatalog(self)
+            return self._catalog
+
+    def codes(self, column):
+        """Return (codes, values): per-row positions into values, -1 for missing."""
+        with self._lock:
+            if column not in self._codes:
+                series = self._df()[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    codes = series.cat.codes.to_numpy()
+                    values = series.cat.categories
+                else:
+                    codes, values = pd.factorize(series)
+                self._codes[column] = (codes, pd.Series(values.to_numpy()))
+            return self._codes[column]
+
+    def token_index(self, column):
+        with self._lock:
+            if column in self._token_indexes:
+                return self._token_indexes[column]
+        index = TokenIndex(self.codes(column)[1])
+        with self._lock:
+            self._token_indexes[column] = index
+        return index
+
+    def tokens(self, column):
+        """Return the stripped list items of each distinct value (for options)."""
+        with self._lock:
+            if column in self._tokens:
+                return self._tokens[column]
+        tokens = [
+            [part.strip() for part in str(value).split(",")]
+            for value in self.codes(column)[1]
+        ]
+        with self._lock:
+            self._tokens[column] = tokens
+        return tokens
+
+    def value_mask(self, column, kind, selected):
+        """Return a boolean array over the distinct values of column."""
+        values = self.codes(column)[1]
+        if kind == "multi":
+            return self.token_index(column).value_mask(selected)
+        if kind == "checkbox":
+            return values.astype(str).isin([str(x) for x in selected]).to_numpy()
+        return values.isin(selected).to_numpy()
+
+    def row_mask(self, column, kind, selected):
+        """Return a boolean row mask for one filter."""
+        if kind == "range":
+            min_val, max_val = selected
+            values = self._df()[column]
+            return ((values >= min_val) & (values <= max_val)).to_numpy(
+                dtype=bool, na_value=False
+            )
+        codes = self.codes(column)[0]
+        # code -1 (missing) picks the trailing False
+        return np.append(self.value_mask(column, kind, selected), False)[codes]
+
+    def present(self, column, mask):
+        """Return a boolean array over the distinct values, True where any masked row has it."""
+        codes = self.codes(column)[0]
+        present = np.zeros(len(self.codes(column)[1]) + 1, dtype=bool)
+        present[codes[mask]] = True
+        return present[:-1]
+
+
+def facet_index(df):
+    """Return the cached FacetIndex of a dataset frame."""
+    key = id(df)
+    with _lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    index = FacetIndex(df)
+    with _lock:
+        _indexes[key] = (
+            weakref.ref(df, lambda _, key=key: _indexes.pop(key, None)),
+            index,
+        )
+    return index
+
+
+def _is_active(kind, selected):
+    if kind == "range":
+        return bool(selected) and len(selected) == 2
+    return bool(selected)
+
+
+class FacetedSelection:
+    """One set of filter selections over a dataset."""
+
+    def __init__(self, df, facets, selections, base_filters=None):
+        """
+        Args:
+            df: Full dataset
+            facets: {filter name: (column, kind)}
+            selections: {filter name: selected value(s)}; inactive filters
+                (None, empty) are ignored
+            base_filters: {column: value} equality filters applied to every
+                facet (e.g. the units selector)
+        """
+        self.index = facet_index(df)
+        self.facets = facets
+
+        self.base = np.ones(len(df), dtype=bool)
+        for column, value in (base_filters or {}).items():
+            self.base &= self.index.row_mask(column, "single", [value])
+
+        self.failed = {}
+        for name, (column, kind) in facets.items():
+            selected = selections.get(name)
+            if _is_active(kind, selected):
+                self.failed[name] = ~self.index.row_mask(column, kind, selected)
+
+        # number of active filters each row fails
+        self.failures = np.zeros(len(df), dtype=np.int16)
+        for failed in self.failed.values():
+            self.failures += failed
+
+    def mask(self, exclude=None):
+        """Return the row mask of all filters, or all but the named one."""
+        if exclude in self.failed:
+            return self.base & ((self.failures - self.failed[exclude]) == 0)
+        return self.base & (self.failures == 0)
+
+    def options(self, name):
+        """Return dropdown options for a facet under all other filters."""
+        column, kind = self.facets[name]
+        kind = "multi" if kind == "multi" else "single"
+        return self.index.catalog.options(column, kind, self.mask(exclude=name))
+
+    def checkbox_options(self, name):
+        """Return checkbox options, disabled where unreachable under all other filters."""
+        column, _ = self.facets[name]
+        values = self.index.codes(column)[1]
+        possible = self.index.present(column, self.base)
+        available = self.index.present(column, self.mask(exclude=name))
+        options = []
+        for code in sorted(np.flatnonzero(possible), key=lambda c: values[c]):
+            val = values[code]
+            if val and str(val).strip():
+                options.append(
+                    {"label": str(val), "value": str(val), "disabled": not available[code]}
+                )
+        return options
@@ -0,0 +1,191 @@
+"""
+Rendered-figure cache for the chart callbacks.
+
+For a given dataset version and filter state, the figure builders return
+the same figure every time, yet each click rebuilt it and sent it through
+Plotly's validation and serialization again. FigureCache stores the
+serialized JSON of a built figure, keyed by the figure builder, the dataset
+version from the registry and the canonical filter state (see
+helpers.filter_cache.canonical_selection), and later requests for the same
+key return the cached JSON, decoded to a plain dict that Dash sends as is.
+
+A reload changes the dataset version, so stale figures are never served
+as long as callers read the frame and its version as one pair
+(DatasetRegistry.get_with_version()); stale entries are dropped as the
+least recently used ones once the cache is over its byte budget. Hit and miss counters are kept overall and per builder;
+get_figure_cache_stats() returns them, and register_figure_cache_endpoint()
+serves them as JSON.
+
+    df, version = datasets.get_with_version("pue_wue")
+    figure = get_figure_cache().figure(
+        create_pue_scatter_plot,
+        version,
+        {"company": company, "filters_applied": filters_applied},
+        lambda: create_pue_scatter_plot(filtered_df, full_df, filters_applied),
+    )
+
+Environment flags:
+- DCEWM_FIGURE_CACHE_MB (default 64): megabytes of figure JSON kept; 0 disables caching
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from helpers.env_config import env_number
+from helpers.filter_cache import canonical_selection
+
+ENDPOINT_ROUTE = "/_profile/figure_cache"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _builder_name(builder):
+    return f"{builder.__module__}.{builder.__qualname__}"
+
+
+class FigureCache:
+    """LRU cache of serialized figures, bounded by total bytes."""
+
+    def __init__(self, max_bytes=None):
+        """
+        Args:
+            max_bytes: Byte budget (defaults to DCEWM_FIGURE_CACHE_MB megabytes)
+        """
+        if max_bytes is None:
+            max_bytes = env_number("DCEWM_FIGURE_CACHE_MB", 64) * 1024 * 1024
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stored_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.oversized = 0
+        self._builders = {}
+
+    def make_key(self, builder, version, state):
+        """Return the hash of a figure request: builder, dataset version and filter state."""
+        request = {
+            "builder": _builder_name(builder),
+            "version": version,
+            "state": canonical_selection(state),
+        }
+        text = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _count(self, builder, hit):
+        counts = self._builders.setdefault(
+            _builder_name(builder), {"hits": 0, "misses": 0}
+        )
+        if hit:
+            self.hits += 1
+            counts["hits"] += 1
+        else:
+            self.misses += 1
+            counts["misses"] += 1
+
+    def _lookup(self, builder, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            self._count(builder, payload is not None)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def _store(self, key, payload):
+        with self._lock:
+            if len(payload) > self.max_bytes:
+                self.oversized += 1
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.stored_bytes -= len(previous)
+            self._entries[key] = payload
+            self.stored_bytes += len(payload)
+            while self.stored_bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self.stored_bytes -= len(dropped)
+                self.evicted += 1
+
+    def figure(self, builder, version, state, build):
+        """
+        Return the figure of a filter state, from the cache when possible.
+
+        Args:
+            builder: Figure builder function (part of the key)
+            version: Dataset version from the registry; a reload changes it
+            state: Filter selections and other inputs the figure depends on
+            build: Function of no arguments returning the figure (go.Figure or
+                dict), called on a miss
+
+        Returns:
+            The built figure on a miss, its cached JSON decoded to a dict on a hit
+        """
+        if self.max_bytes <= 0:
+            return build()
+
+        key = self.make_key(builder, version, state)
+        payload = self._lookup(builder, key)
+        if payload is not None:
+            return json.loads(payload)
+
+        fig = build()
+        self._store(key, pio.to_json(fig, validate=False).encode("utf-8"))
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stored_bytes = 0
+
+    def stats(self):
+        """Return the counters and current size of the cache, overall and per builder."""
+
+        def rate(hits, misses):
+            lookups = hits + misses
+            return round(hits / lookups, 4) if lookups else None
+
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "stored_bytes": self.stored_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": rate(self.hits, self.misses),
+                "evicted": self.evicted,
+                "oversized": self.oversized,
+                "builders": {
+                    name: {**counts, "hit_rate": rate(counts["hits"], counts["misses"])}
+                    for name, counts in self._builders.items()
+                },
+            }
+
+
+def get_figure_cache():
+    """Return the process-wide FigureCache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FigureCache()
+        return _cache
+
+
+def get_figure_cache_stats():
+    """Return the stats of the figure cache."""
+    return get_figure_cache().stats()
+
+
+def register_figure_cache_endpoint(server, route=ENDPOINT_ROUTE):
+    """Serve the figure cache stats as JSON on the app's Flask server."""
+    from flask import jsonify
+
+    def figure_cache_stats():
+        return jsonify(get_figure_cache_stats())
+
+    server.add_url_rule(route, "figure_cache_stats", figure_cache_stats)
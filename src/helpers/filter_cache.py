@@ -0,0 +1,177 @@
+"""
+Result cache for the page filter functions.
+
+Popular filter combinations (one company, one region, TWh vs GW) are asked
+for over and over. FilterCache sits in front of a module's select_rows: the
+key is a hash of the filter selections (sorted by name) and the dataset
+version from the registry, and the cached value is the array of selected
+row positions rather than a DataFrame copy. A hit is returned as a
+RowSelection over the current dataset frame.
+
+The cache is bounded by entry count (least recently used entries are
+dropped first) and by age. Hit, miss, expiry and eviction counters are kept
+per cache; get_filter_cache_stats() returns them for all caches, and
+register_filter_cache_endpoint() serves them as JSON.
+
+Environment flags:
+- DCEWM_FILTER_CACHE_SIZE (default 128): entries per cache; 0 disables caching
+- DCEWM_FILTER_CACHE_TTL (default 900): seconds an entry stays valid
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from helpers.env_config import env_number
+from helpers.row_selection import RowSelection
+
+ENDPOINT_ROUTE = "/_profile/filter_cache"
+
+_caches = {}
+
+
+def canonical_selection(value):
+    """Return a JSON-friendly form of a selection; inactive (empty) selections become None."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        if not value:
+            return None
+        return {str(k): canonical_selection(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        if not value:
+            return None
+        items = [canonical_selection(v) for v in value]
+        return sorted(items, key=repr) if isinstance(value, set) else items
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, str) and value == "":
+        return None
+    return value
+
+
+class FilterCache:
+    """LRU + TTL cache of filter results, stored as row positions."""
+
+    def __init__(self, name, max_entries=None, ttl_seconds=None):
+        """
+        Args:
+            name: Cache name used in the stats (e.g. the dataset name)
+            max_entries: Entry limit (defaults to DCEWM_FILTER_CACHE_SIZE)
+            ttl_seconds: Entry lifetime (defaults to DCEWM_FILTER_CACHE_TTL)
+        """
+        self.name = name
+        if max_entries is None:
+            max_entries = env_number("DCEWM_FILTER_CACHE_SIZE", 128)
+        if ttl_seconds is None:
+            ttl_seconds = env_number("DCEWM_FILTER_CACHE_TTL", 900)
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        _caches[name] = self
+
+    def make_key(self, select_func, version, args, kwargs):
+        """Return the hash of a filter call: function, dataset version and selections."""
+        selections = {
+            "function": f"{select_func.__module__}.{select_func.__qualname__}",
+            "version": version,
+            "args": [canonical_selection(v) for v in args],
+            "kwargs": {k: canonical_selection(v) for k, v in kwargs.items()},
+        }
+        text = json.dumps(selections, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, rows = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def _store(self, key, rows):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+
+    def select(self, df, version, select_func, *args, **kwargs):
+        """
+        Return select_func(df, *args, **kwargs) as a RowSelection, from the cache when possible.
+
+        Inactive selections must be falsy.
+
+        Args:
+            df: Dataset frame
+            version: Version of df from the registry, read with it in one
+                get_with_version() call; a reload changes it
+            select_func: Function taking df first and returning a RowSelection
+        """
+        if self.max_entries <= 0:
+            return select_func(df, *args, **kwargs)
+
+        key = self.make_key(select_func, version, args, kwargs)
+        rows = self._lookup(key)
+        if rows is not None:
+            return RowSelection(df, rows)
+
+        selection = select_func(df, *args, **kwargs)
+        rows = selection.rows()
+        if len(df) <= np.iinfo(np.int32).max:
+            rows = rows.astype(np.int32)
+        self._store(key, rows)
+        return selection
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return the counters and current size of this cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "stored_bytes": int(sum(rows.nbytes for _, rows in self._entries.values())),
+            }
+
+
+def get_filter_cache_stats():
+    """Return the stats of every filter cache, by name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def register_filter_cache_endpoint(server, route=ENDPOINT_ROUTE):
+    """Serve the filter cache stats as JSON on the app's Flask server."""
+    from flask import jsonify
+
+    def filter_cache_stats():
+        return jsonify(get_filter_cache_stats())
+
+    server.add_url_rule(route, "filter_cache_stats", filter_cache_stats)
@@ -0,0 +1,141 @@
+"""
+Compact instrument / objective membership for the global policies data.
+
+The policy sheet has one Yes/No column per instrument and per objective.
+Instead of melting them into one row per (policy, instrument, objective),
+each policy row stores two bitmask columns, instrument_mask and
+objective_mask, where bit i is set when the policy has INSTRUMENTS[i]
+(or OBJECTIVES[i]). The helpers below answer membership questions on whole
+columns at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+INSTRUMENTS = [
+    "Measurement and Reporting",
+    "Procurement standard",
+    "Performance standard",
+    "Research, demonstration, and development",
+    "Capacity building",
+    "Rate structuring",
+    "Development incentives",
+    "Development restrictions",
+    "Other",
+]
+
+OBJECTIVES = [
+    "Energy",
+    "Power",
+    "Water",
+    "Emissions",
+    "Other Environemental",
+    "Taxes",
+    "Permits",
+    "Employement",
+    "Communities",
+]
+
+ATTRIBUTES = {"instrument": INSTRUMENTS, "objective": OBJECTIVES}
+MASK_COLUMNS = {"instrument": "instrument_mask", "objective": "objective_mask"}
+
+# values counted as "has this instrument/objective"
+YES_VALUES = ["YES", "TRUE", "1"]
+
+
+def is_yes(values):
+    """Return a boolean array, True where a flag value means yes (Yes/True/1)."""
+    values = pd.Series(values)
+    text = values.astype(str).str.upper()
+    return (text.isin(YES_VALUES) | values.isin([True, 1])).to_numpy(dtype=bool)
+
+
+def encode_membership(df):
+    """
+    Replace the per-instrument and per-objective flag columns with bitmasks.
+
+    Args:
+        df: Policy sheet with one Yes/No column per instrument and objective
+
+    Returns:
+        DataFrame without the flag columns, with instrument_mask and
+        objective_mask (uint16) columns appended
+    """
+    df = df.copy()
+    for kind, names in ATTRIBUTES.items():
+        mask = np.zeros(len(df), dtype=np.uint16)
+        for bit, name in enumerate(names):
+            mask |= is_yes(df[name]).astype(np.uint16) << bit
+        df = df.drop(columns=names)
+        df[MASK_COLUMNS[kind]] = mask
+    return df
+
+
+def attribute_bits(kind, names):
+    """Return the bitmask for the given instrument or objective names."""
+    vocabulary = ATTRIBUTES[kind]
+    bits = 0
+    for name in names or []:
+        if name in vocabulary:
+            bits |= 1 << vocabulary.index(name)
+    return bits
+
+
+def has_any(df, kind, names):
+    """
+    Return a boolean array, True for rows with any of the given attributes.
+
+    Args:
+        df: Policy rows with mask columns
+        kind: "instrument" or "objective"
+        names: Instrument or objective names
+    """
+    bits = attribute_bits(kind, names)
+    return (df[MASK_COLUMNS[kind]].to_numpy() & bits) != 0
+
+
+def has_attribute(df, kind, name):
+    """Return a boolean array, True for rows with the given attribute."""
+    return has_any(df, kind, [name])
+
+
+def present_attributes(df, kind):
+    """Return the set of instrument or objective names held by any row."""
+    masks = df[MASK_COLUMNS[kind]].to_numpy()
+    combined = int(np.bitwise_or.reduce(masks)) if len(masks) else 0
+    return {
+        name for bit, name in enumerate(ATTRIBUTES[kind]) if combined & (1 << bit)
+    }
+
+
+def attribute_counts(df, kind, policy_col="policy_id"):
+    """
+    Count distinct policies per instrument or objective.
+
+    Returns:
+        Series indexed by attribute name (in vocabulary order)
+    """
+    masks = df[MASK_COLUMNS[kind]].to_numpy()
+    policies = df[policy_col].to_numpy()
+    counts = {}
+    for bit, name in enumerate(ATTRIBUTES[kind]):
+        selected = policies[(masks & (1 << bit)) != 0]
+        counts[name] = pd.Series(selected).nunique()
+    return pd.Series(counts, name=f"{kind}_policies")
+
+
+def explode_membership(df, kind):
+    """
+    Expand policy rows into one row per attribute the row holds.
+
+    Rows are ordered by attribute (vocabulary order), then by their order in
+    df, and carry the attribute name in a column named after kind.
+    """
+    names = ATTRIBUTES[kind]
+    masks = df[MASK_COLUMNS[kind]].to_numpy()
+    bits = np.arange(len(names), dtype=np.uint16)
+    attr_pos, row_pos = np.nonzero((masks[None, :] >> bits[:, None]) & 1)
+
+    exploded = df.iloc[row_pos].reset_index(drop=True)
+    exploded[kind] = np.asarray(names, dtype=object)[attr_pos]
+    return exploded
@@ -0,0 +1,91 @@
+"""
+Precomputed hover text fragments for the scatter and line charts.
+
+Chart hover templates show optional lines such as "Region: Europe<br>",
+left out when the value is missing or blank. The figure builders used to
+format these with one row-wise apply per field on every render. Instead,
+the loaders add one hover column per field when a dataset is built, with
+vectorized string operations (on the categories of categorical columns),
+and the charts pass these columns as custom data.
+
+Hover columns are declared as {hover column: (source column, label)}.
+"""
+
+import numpy as np
+import pandas as pd
+
+# PUE / WUE / PUE-vs-WUE scatter plots (pue_wue dataset)
+PUE_WUE_HOVER_COLUMNS = {
+    "hover_pue_type": ("metric_type", "PUE Type"),
+    "hover_wue_type": ("metric_type", "WUE Type"),
+    "hover_measurement_category": ("measurement_category", "Measurement Category"),
+    "hover_pue_measurement_category": (
+        "measurement_category",
+        "PUE Measurement Category",
+    ),
+    "hover_time_period_category": ("time_period_category", "Time Period Category"),
+    "hover_facility_scope": ("facility_scope", "Facility Scope"),
+    "hover_region": ("region", "Region"),
+    "hover_country": ("country", "Country"),
+    "hover_city": ("city", "City"),
+    "hover_climate_zone": ("assigned_climate_zones", "IECC Climate Zone"),
+}
+
+# energy and water projections line plots (energyprojections dataset)
+PROJECTION_HOVER_COLUMNS = {
+    "hover_region": ("region", "Study Region"),
+    "hover_data_center_type": ("data_center_type_s_", "Data Center Type(s)"),
+    "hover_modeling_approach": ("modeling_approach_es_", "Modeling Approach(es)"),
+    "hover_time_horizon": ("time_horizon", "Time Horizon"),
+    "hover_label": ("label", "Scenario"),
+}
+
+
+def _format(values, label):
+    text = values.astype(object).where(values.notna(), "").astype(str)
+    keep = (text.str.strip() != "").to_numpy() & values.notna().to_numpy()
+    return pd.Series(
+        np.where(keep, label + ": " + text + "<br>", ""),
+        index=values.index,
+        dtype=object,
+    )
+
+
+def hover_fragment(series, label):
+    """
+    Return "label: value<br>" for each value, "" where it is missing or blank.
+
+    Categorical columns are formatted once per category and stay categorical.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.Series(series.cat.categories)
+        fragments = _format(categories, label).to_numpy()
+        codes = series.cat.codes.to_numpy()
+        values = np.append(fragments, "")[codes]  # code -1 (missing) -> ""
+        return pd.Series(
+            pd.Categorical(values), index=series.index, name=series.name
+        )
+    return _format(series, label)
+
+
+def add_hover_columns(df, columns):
+    """
+    Add the hover columns of {hover column: (source column, label)} to df.
+
+    Columns whose source is missing are skipped.
+
+    Returns:
+        df (modified in place)
+    """
+    for name, (source, label) in columns.items():
+        if source in df.columns:
+            df[name] = hover_fragment(df[source], label)
+    return df
+
+
+def with_hover_columns(df, columns):
+    """Return df, with any hover columns it lacks computed from their sources."""
+    missing = {name: spec for name, spec in columns.items() if name not in df.columns}
+    if not missing:
+        return df
+    return add_hover_columns(df.copy(deep=False), missing)
@@ -0,0 +1,117 @@
+"""
+Project-wide logging.
+
+Every module logs through get_logger(__name__), which returns a child of the
+"dcewm" logger. configure_logging() attaches a single non-blocking handler:
+records are put on an in-memory queue and written to stdout by a background
+listener thread, so request handlers never wait on console I/O.
+
+Messages use lazy %-style arguments (logger.debug("%d rows", n)); records
+below the active level are dropped before any formatting happens. Wrap
+expensive debug dumps (frame heads, option lists) in
+logger.isEnabledFor(logging.DEBUG).
+
+Environment flags:
+- DCEWM_LOG_LEVEL (default INFO): level for all dashboard modules
+- DCEWM_LOG_LEVELS: per-module overrides as comma-separated module=LEVEL
+  pairs, matched on the module path, e.g.
+  "data_loader=DEBUG,callbacks.energy_projections=DEBUG"
+- DCEWM_LOG_FORMAT (default text): "json" writes one JSON object per line
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOGGER_ROOT = "dcewm"
+DEFAULT_LEVEL = "INFO"
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_lock = threading.Lock()
+_listener = None
+_listener_pid = None
+
+
+def get_logger(name):
+    """Return the logger for a dashboard module (pass __name__)."""
+    return logging.getLogger(f"{LOGGER_ROOT}.{name}")
+
+
+def _parse_level(value, default=logging.INFO):
+    level = logging.getLevelName(str(value).strip().upper())
+    if isinstance(level, int):
+        return level
+    print(f"Warning: unknown log level '{value}', using {logging.getLevelName(default)}")
+    return default
+
+
+def module_levels():
+    """Return the per-module levels set in DCEWM_LOG_LEVELS."""
+    levels = {}
+    for item in os.environ.get("DCEWM_LOG_LEVELS", "").split(","):
+        if "=" not in item:
+            continue
+        module, level = item.split("=", 1)
+        if module.strip():
+            levels[module.strip()] = _parse_level(level)
+    return levels
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _formatter():
+    if os.environ.get("DCEWM_LOG_FORMAT", "text").lower() == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging():
+    """
+    Set levels and attach the queue handler to the "dcewm" logger.
+
+    Safe to call more than once; a forked worker process gets its own
+    listener on its first call.
+    """
+    global _listener, _listener_pid
+    with _lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            return
+
+        root = logging.getLogger(LOGGER_ROOT)
+        root.setLevel(_parse_level(os.environ.get("DCEWM_LOG_LEVEL", DEFAULT_LEVEL)))
+        for module, level in module_levels().items():
+            get_logger(module).setLevel(level)
+
+        # the parent's handler and listener thread do not survive a fork
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        log_queue = queue.SimpleQueue()
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(_formatter())
+        listener = logging.handlers.QueueListener(log_queue, console)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.propagate = False
+        listener.start()
+        atexit.register(listener.stop)
+
+        _listener = listener
+        _listener_pid = os.getpid()
@@ -0,0 +1,179 @@
+"""
+Precomputed dropdown and checklist options per dataset.
+
+Option helpers used to split comma-separated strings and sort the distinct
+values of a column on every callback and every page render. An
+OptionCatalog builds the sorted option dicts of a column once per dataset
+frame, together with a map from the column's value codes (see FacetIndex)
+to option positions. The options reachable under a row mask are then
+derived with one array lookup instead of re-reading the frame:
+
+    catalog = option_catalog(df)
+    catalog.options("company_name")                  # all options
+    catalog.options("region", "multi", mask)         # options under a mask
+    catalog.flagged_options("status", mask)          # all, with "disabled"
+
+Kinds:
+- "single": one option per distinct value
+- "multi": one option per item of comma-separated values
+
+Each call returns a new list, but the option dicts are shared between
+callers and must not be modified.
+"""
+
+import threading
+
+import numpy as np
+
+
+def _value(val):
+    """Return a plain Python scalar (numpy scalars are not JSON serializable)."""
+    return val.item() if isinstance(val, np.generic) else val
+
+
+class ColumnOptions:
+    """Sorted options of one column and the option positions of its values."""
+
+    def __init__(self, options, value_codes, option_positions):
+        self.options = options
+        # pairs: rows holding value code value_codes[i] reach option option_positions[i]
+        self.value_codes = value_codes
+        self.option_positions = option_positions
+
+    def available(self, values_present):
+        """Return a boolean array over the options, from a boolean array over the values."""
+        available = np.zeros(len(self.options), dtype=bool)
+        available[self.option_positions[values_present[self.value_codes]]] = True
+        return available
+
+
+class OptionCatalog:
+    """Options of the filter columns of one dataset, built once per column."""
+
+    def __init__(self, index):
+        """
+        Args:
+            index: FacetIndex of the dataset (value codes and list items)
+        """
+        self.index = index
+        self._columns = {}
+        self._lock = threading.Lock()
+
+    def _build(self, column, kind):
+        codes, values = self.index.codes(column)
+        # categorical columns can have categories that no row uses
+        present = np.zeros(len(values) + 1, dtype=bool)
+        present[codes] = True
+        present = present[:-1]
+
+        if kind == "multi":
+            tokens = self.index.tokens(column)
+            pairs = [
+                (code, token)
+                for code in np.flatnonzero(present)
+                for token in tokens[code]
+                if token
+            ]
+            labels = sorted({token for _, token in pairs})
+            positions = {label: pos for pos, label in enumerate(labels)}
+            options = [{"label": label, "value": label} for label in labels]
+            value_codes = np.array([code for code, _ in pairs], dtype=np.intp)
+            option_positions = np.array(
+                [positions[token] for _, token in pairs], dtype=np.intp
+            )
+        else:
+            values = [_value(val) for val in values.tolist()]
+            kept = [code for code in np.flatnonzero(present) if str(values[code]).strip()]
+            kept.sort(key=lambda code: values[code])
+            options = [
+                {"label": str(values[code]), "value": values[code]} for code in kept
+            ]
+            value_codes = np.array(kept, dtype=np.intp)
+            option_positions = np.arange(len(kept), dtype=np.intp)
+
+        return ColumnOptions(options, value_codes, option_positions)
+
+    def column(self, column, kind="single"):
+        """Return the ColumnOptions of a column, building them on first use."""
+        key = (column, kind)
+        with self._lock:
+            if key in self._columns:
+                return self._columns[key]
+        built = self._build(column, kind)
+        with self._lock:
+            return self._columns.setdefault(key, built)
+
+    def warm(self, columns):
+        """Build the options of {column: kind} now instead of on first use."""
+        for column, kind in columns.items():
+            self.column(column, kind)
+        return self
+
+    def available(self, column, mask, kind="single"):
+        """Return a boolean array over the column's options, True where a masked row has it."""
+        return self.column(column, kind).available(self.index.present(column, mask))
+
+    def options(self, column, kind="single", mask=None):
+        """Return the sorted options of a column, limited to the masked rows if given."""
+        entry = self.column(column, kind)
+        if mask is None:
+            return list(entry.options)
+        available = entry.available(self.index.present(column, mask))
+        return [opt for opt, keep in zip(entry.options, available) if keep]
+
+    def flagged_options(self, column, mask, kind="single", within=None):
+        """
+        Return options with a "disabled" flag for the ones no masked row has.
+
+        Args:
+            column: Column name
+            mask: Rows whose values stay enabled
+            kind: "single" or "multi"
+            within: Optional row mask limiting which options are listed
+        """
+        entry = self.column(column, kind)
+        available = self.available(column, mask, kind)
+        listed = (
+            np.ones(len(entry.options), dtype=bool)
+            if within is None
+            else self.available(column, within, kind)
+        )
+        return [
+            {**opt, "disabled": not keep}
+            for opt, keep, show in zip(entry.options, available, listed)
+            if show
+        ]
+
+    def values(self, column, mask, kind="single"):
+        """Return the set of option values present in the masked rows."""
+        entry = self.column(column, kind)
+        available = self.available(column, mask, kind)
+        return {opt["value"] for opt, keep in zip(entry.options, available) if keep}
+
+
+def option_catalog(df):
+    """Return the cached OptionCatalog of a dataset frame."""
+    from helpers.facet_filters import facet_index
+
+    return facet_index(df).catalog
+
+
+def warm_option_catalog(datasets, name, columns):
+    """
+    Build the options of a registry dataset before the first callback needs them.
+
+    Runs now if the dataset is loaded, and again after every reload that
+    leaves it loaded; a lazily loaded dataset builds its options on first use.
+
+    Args:
+        datasets: DatasetRegistry
+        name: Dataset name
+        columns: {column: kind} of the dataset's filter columns
+    """
+
+    def warm(names=None):
+        if (names is None or name in names) and datasets.is_loaded(name):
+            option_catalog(datasets.get(name)).warm(columns)
+
+    warm()
+    datasets.add_reload_listener(warm)
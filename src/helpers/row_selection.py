@@ -0,0 +1,121 @@
+"""
+Copy-free row filtering.
+
+Filter helpers used to start with df.copy() and chain boolean indexing, so
+every active filter materialized another full-width frame. A RowSelection
+only combines boolean masks over the original frame; the selected rows are
+materialized once, by take(), and only for the columns the caller needs.
+
+Registered datasets are shared between requests and treated as immutable:
+a RowSelection never writes to its frame, and take() always returns a new
+frame object (with copy-on-write, an unfiltered take() shares the data
+without copying it).
+
+Example:
+    selection = RowSelection(df).isin("company_name", companies)
+    selection.between("year", from_year, to_year)
+    chart_df = selection.take(["company_name", "year", "metric_value"])
+"""
+
+import numpy as np
+
+from helpers.token_index import multi_value_mask
+
+
+def _is_empty(values):
+    return values is None or len(values) == 0
+
+
+def _as_mask(values):
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy(dtype=bool, na_value=False)
+    return np.asarray(values, dtype=bool)
+
+
+class RowSelection:
+    """Row filters over one frame, combined into a single mask."""
+
+    def __init__(self, df, rows=None):
+        """
+        Args:
+            df: Frame to select from (not modified)
+            rows: Optional row positions to start from
+        """
+        self.df = df
+        self._mask = None
+        if rows is not None:
+            mask = np.zeros(len(df), dtype=bool)
+            mask[rows] = True
+            self._mask = mask
+
+    def where(self, mask):
+        """Keep the rows where mask (boolean array or Series, NA as False) is True."""
+        mask = _as_mask(mask)
+        self._mask = mask if self._mask is None else self._mask & mask
+        return self
+
+    def isin(self, column, values):
+        """Keep rows whose column is one of values; no-op when values is empty."""
+        if not _is_empty(values):
+            self.where(self.df[column].isin(values))
+        return self
+
+    def equals(self, column, value):
+        """Keep rows whose column equals value."""
+        return self.where(self.df[column] == value)
+
+    def between(self, column, low=None, high=None):
+        """Keep rows with low <= column <= high; a None bound is open."""
+        if low is not None:
+            self.where(self.df[column] >= low)
+        if high is not None:
+            self.where(self.df[column] <= high)
+        return self
+
+    def notna(self, column):
+        """Keep rows where column is not missing."""
+        return self.where(self.df[column].notna())
+
+    def checkbox(self, column, values):
+        """Keep rows whose column, compared as text, is one of values."""
+        if not _is_empty(values):
+            self.where(self.df[column].astype(str).isin([str(v) for v in values]))
+        return self
+
+    def multi_value(self, column, values):
+        """Keep rows whose comma-separated column holds any of values."""
+        if not _is_empty(values):
+            self.where(multi_value_mask(self.df[column], values))
+        return self
+
+    @property
+    def mask(self):
+        """Boolean array over the frame's rows."""
+        if self._mask is None:
+            return np.ones(len(self.df), dtype=bool)
+        return self._mask
+
+    def rows(self):
+        """Return the positions of the selected rows."""
+        if self._mask is None:
+            return np.arange(len(self.df))
+        return np.flatnonzero(self._mask)
+
+    def __len__(self):
+        if self._mask is None:
+            return len(self.df)
+        return int(np.count_nonzero(self._mask))
+
+    def take(self, columns=None):
+        """
+        Materialize the selected rows.
+
+        Args:
+            columns: Columns to keep (missing ones are skipped); all when None
+        """
+        frame = self.df
+        if columns is not None:
+            frame = frame[frame.columns.intersection(columns, sort=False)]
+        if self._mask is None:
+            return frame.copy(deep=False)
+        return frame.take(self.rows())
@@ -0,0 +1,95 @@
+"""
+Deterministic x-jitter for the PUE and WUE scatter plots.
+
+Points of the same company and year are spread along the x axis by an
+offset derived from a hash of the row's identity (company, year, facility
+scope, region, city), so a point keeps its position across filter changes.
+The years themselves sit on a progressive timeline (wider gaps for recent
+years) and recent years get more jitter.
+
+The figure builders used to hash every row with hashlib in a DataFrame.apply
+on each request. Here the hash is vectorized (pd.util.hash_pandas_object),
+and add_x_jitter() computes the final x column once per dataset, when the
+PUE/WUE dataset is built; the figures only read it.
+"""
+
+import numpy as np
+import pandas as pd
+
+X_JITTER_COLUMN = "custom_x_jitter"
+
+# row identity hashed for the jitter direction
+JITTER_KEY_COLUMNS = [
+    "company_name",
+    "time_period_value",
+    "facility_scope",
+    "region",
+    "city",
+]
+
+# (min, max) jitter per metric, growing linearly from the first to the last year
+PUE_JITTER = (0.3, 1.1)
+WUE_JITTER = (0.15, 0.8)
+
+
+def jitter_hash(df):
+    """
+    Return a deterministic value in [-1, 1] per row, from the row's identity.
+
+    Missing key values hash as empty strings; key columns missing from df
+    are skipped.
+    """
+    keys = pd.DataFrame(index=df.index)
+    for column in JITTER_KEY_COLUMNS:
+        if column in df.columns:
+            values = df[column].astype(object)
+            keys[column] = values.where(values.notna(), "").astype(str)
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    # top 32 bits, scaled to [-1, 1]
+    return (hashes >> np.uint64(32)).astype(np.float64) / (2**32 - 1) * 2 - 1
+
+
+def year_positions(years):
+    """
+    Return the x position of each sorted, distinct year.
+
+    Gaps grow along the timeline: 1.0 before 2017, 1.7 before 2020, 2.5 after.
+    """
+    years = np.asarray(years, dtype=np.float64)
+    gaps = np.where(years < 2017, 1.0, np.where(years < 2020, 1.7, 2.5))
+    # summed in timeline order, starting from the first year
+    return np.cumsum(np.concatenate([years[:1], gaps[:-1]]))
+
+
+def add_x_jitter(df, min_jitter, max_jitter, years=None, year_col="time_period_value"):
+    """
+    Return the jittered x position of each row.
+
+    Args:
+        df: Rows of one metric
+        min_jitter: Jitter amount of the first year
+        max_jitter: Jitter amount of the last year
+        years: Years of the timeline (defaults to the distinct years of df);
+            must include every year in df
+        year_col: Year column
+
+    Returns:
+        float64 array (NaN where the year is missing)
+    """
+    row_years = df[year_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    if years is None:
+        years = row_years
+    years = np.asarray(years, dtype=np.float64)
+    years = np.unique(years[~np.isnan(years)])
+    if len(years) == 0:
+        return np.full(len(df), np.nan)
+
+    steps = np.arange(len(years)) / max(len(years) - 1, 1)
+    amounts = min_jitter + (max_jitter - min_jitter) * steps
+    positions = year_positions(years)
+
+    known = ~np.isnan(row_years)
+    codes = np.searchsorted(years, row_years[known])
+    x = np.full(len(df), np.nan)
+    x[known] = positions[codes] + jitter_hash(df)[known] * amounts[codes]
+    return x
@@ -0,0 +1,252 @@
+"""
+Columnar snapshot cache for data_loader outputs.
+
+Every loader re-parses its Excel workbook(s) on each app start. The
+snapshot_cache decorator stores the processed DataFrame(s) as Parquet files
+under data/dependencies/snapshots/<loader>/ and reloads them on the next start
+as long as the source workbooks, the loader version and any extra key
+(e.g. the pending reporting year) are unchanged.
+
+Set DCEWM_SNAPSHOT_CACHE=0 to bypass the cache entirely.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from helpers.env_config import env_flag
+from helpers.logging_config import get_logger
+
+# Get absolute path to data and data/dependencies folders
+_script_dir = Path(__file__).parent
+_project_root = _script_dir.parent.parent
+DATA_DIR = _project_root / "data"
+SNAPSHOT_DIR = DATA_DIR / "dependencies" / "snapshots"
+
+MANIFEST_FILE = "manifest.json"
+
+logger = get_logger(__name__)
+
+
+def snapshots_enabled():
+    """Return False when the snapshot cache is disabled via DCEWM_SNAPSHOT_CACHE."""
+    return env_flag("DCEWM_SNAPSHOT_CACHE", True)
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Compute the SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_sources(source_files, previous=None):
+    """
+    Fingerprint source workbooks by mtime, size and SHA-256.
+
+    The hash recorded in a previous manifest is reused when mtime and size are
+    unchanged, so a warm start only needs a stat() per workbook.
+
+    Args:
+        source_files: File names relative to the data directory
+        previous: "sources" section of an existing manifest, if any
+
+    Returns:
+        Dict mapping file name to {"mtime", "size", "sha256"}
+    """
+    previous = previous or {}
+    fingerprints = {}
+    for name in source_files:
+        stat = (DATA_DIR / name).stat()
+        recorded = previous.get(name, {})
+        if (
+            recorded.get("mtime") == stat.st_mtime
+            and recorded.get("size") == stat.st_size
+            and recorded.get("sha256")
+        ):
+            sha256 = recorded["sha256"]
+        else:
+            sha256 = file_sha256(DATA_DIR / name)
+        fingerprints[name] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha256": sha256,
+        }
+    return fingerprints
+
+
+def _read_manifest(snapshot_dir):
+    manifest_path = snapshot_dir / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("Could not read snapshot manifest %s: %s", manifest_path, e)
+        return None
+
+
+def _manifest_matches(manifest, version, extra_key, sources):
+    if manifest is None:
+        return False
+    if manifest.get("version") != version or manifest.get("extra_key") != extra_key:
+        return False
+    recorded = manifest.get("sources", {})
+    return set(recorded) == set(sources) and all(
+        recorded[name].get("sha256") == sources[name]["sha256"] for name in sources
+    )
+
+
+def write_frame(df, path_stem):
+    """
+    Write a frame as Parquet, falling back to pickle for frames Arrow cannot
+    round-trip exactly (mixed-type object columns, non-string column labels).
+
+    Returns:
+        File name of the written snapshot
+    """
+    parquet_path = path_stem.with_suffix(".parquet")
+    try:
+        df.to_parquet(parquet_path)
+        roundtrip = pd.read_parquet(parquet_path)
+        if roundtrip.dtypes.equals(df.dtypes) and roundtrip.equals(df):
+            return parquet_path.name
+        parquet_path.unlink()
+    except Exception:
+        if parquet_path.exists():
+            parquet_path.unlink()
+
+    pickle_path = path_stem.with_suffix(".pkl")
+    df.to_pickle(pickle_path)
+    return pickle_path.name
+
+
+def read_frame(path):
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def load_snapshot(name, version, extra_key, source_files):
+    """
+    Load a snapshot if it is still valid for the current source workbooks.
+
+    Returns:
+        Tuple of (result or None, fingerprints of the source workbooks)
+    """
+    snapshot_dir = SNAPSHOT_DIR / name
+    manifest = _read_manifest(snapshot_dir)
+    sources = fingerprint_sources(
+        source_files, manifest.get("sources") if manifest else None
+    )
+    if not _manifest_matches(manifest, version, extra_key, sources):
+        return None, sources
+
+    try:
+        frames = [read_frame(snapshot_dir / entry) for entry in manifest["frames"]]
+    except Exception as e:
+        logger.warning("Could not read snapshot for %s, rebuilding: %s", name, e)
+        return None, sources
+
+    # refresh recorded mtimes if the workbook was touched but not changed
+    if manifest["sources"] != sources:
+        manifest["sources"] = sources
+        _write_manifest(snapshot_dir, manifest)
+
+    result = tuple(frames) if manifest.get("is_tuple") else frames[0]
+    return result, sources
+
+
+def _write_manifest(snapshot_dir, manifest):
+    tmp_path = snapshot_dir / (MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, snapshot_dir / MANIFEST_FILE)
+
+
+def save_snapshot(name, version, extra_key, sources, result):
+    """Save a loader result (DataFrame or tuple of DataFrames) as a snapshot."""
+    is_tuple = isinstance(result, tuple)
+    frames = list(result) if is_tuple else [result]
+    if not all(isinstance(frame, pd.DataFrame) for frame in frames):
+        logger.warning("%s did not return DataFrames, snapshot skipped", name)
+        return
+
+    snapshot_dir = SNAPSHOT_DIR / name
+    # write into a staging folder and swap it in so readers never see a
+    # half-written snapshot
+    staging_dir = SNAPSHOT_DIR / f".{name}.{os.getpid()}.tmp"
+    try:
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+        manifest = {
+            "loader": name,
+            "version": version,
+            "extra_key": extra_key,
+            "sources": sources,
+            "is_tuple": is_tuple,
+            "frames": [
+                write_frame(frame, staging_dir / f"frame_{i}")
+                for i, frame in enumerate(frames)
+            ],
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        _write_manifest(staging_dir, manifest)
+
+        if snapshot_dir.exists():
+            shutil.rmtree(snapshot_dir)
+        os.replace(staging_dir, snapshot_dir)
+    except Exception as e:
+        logger.warning("Could not write snapshot for %s: %s", name, e)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def snapshot_cache(*source_files, version=1, extra_key=None):
+    """
+    Cache a loader's output as a columnar snapshot.
+
+    Args:
+        *source_files: Workbook file names (relative to data/) the loader reads
+        version: Bump whenever the loader's processing logic changes
+        extra_key: Optional callable returning a JSON-serialisable value that
+            must also match, for loaders whose output depends on more than the
+            workbooks (e.g. today's pending reporting year)
+
+    Returns:
+        Decorator wrapping a zero-argument loader
+    """
+
+    def decorator(loader):
+        @functools.wraps(loader)
+        def wrapper():
+            if not snapshots_enabled():
+                return loader()
+
+            name = loader.__name__
+            key = extra_key() if extra_key is not None else None
+            try:
+                result, sources = load_snapshot(name, version, key, source_files)
+            except FileNotFoundError:
+                # let the loader raise its usual error for a missing workbook
+                return loader()
+            if result is not None:
+                return result
+
+            result = loader()
+            save_snapshot(name, version, key, sources, result)
+            return result
+
+        wrapper.snapshot_sources = tuple(source_files)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,228 @@
+"""
+Startup profiling for the dataset loaders.
+
+Records, for each loader and derived-frame builder: wall time, CPU time,
+peak memory and the size of the output (rows, columns, deep memory). App-level
+steps (loading, metadata export, callback registration) are timed as phases.
+The report is written to data/dependencies/startup_profile.json and a summary
+is printed, so slow or growing loaders show up in deploy logs.
+
+Environment flags:
+- DCEWM_PROFILE_STARTUP (default 0): record and write the report; off by
+  default, as measuring output sizes scans every string column
+- DCEWM_PROFILE_MEMORY (default 0): also trace Python allocations with
+  tracemalloc (peak bytes per loader); slows loading noticeably
+- DCEWM_PROFILE_ENDPOINT (default 0): serve the live report as JSON at
+  /_profile/startup
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from helpers.env_config import env_flag
+from helpers.logging_config import get_logger
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Get absolute path to data/dependencies folder
+_script_dir = Path(__file__).parent
+_project_root = _script_dir.parent.parent
+REPORT_FILE = _project_root / "data" / "dependencies" / "startup_profile.json"
+
+ENDPOINT_ROUTE = "/_profile/startup"
+
+logger = get_logger(__name__)
+
+
+def profiling_enabled():
+    """Return True when startup profiling is enabled via DCEWM_PROFILE_STARTUP."""
+    return env_flag("DCEWM_PROFILE_STARTUP", False)
+
+
+def memory_tracing_enabled():
+    """Return True when tracemalloc tracing is enabled via DCEWM_PROFILE_MEMORY."""
+    return env_flag("DCEWM_PROFILE_MEMORY", False)
+
+
+def profile_endpoint_enabled():
+    """Return True when the report endpoint is enabled via DCEWM_PROFILE_ENDPOINT."""
+    return env_flag("DCEWM_PROFILE_ENDPOINT", False)
+
+
+def _max_rss_bytes():
+    """Return the peak resident set size of this process so far, if available."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if os.uname().sysname == "Darwin" else max_rss * 1024
+
+
+def describe_output(value):
+    """Return rows, columns and deep memory of a loader result (frame or tuple of frames)."""
+    frames = value if isinstance(value, tuple) else (value,)
+    frames = [f for f in frames if isinstance(f, pd.DataFrame)]
+    if not frames:
+        return {"rows": None, "columns": None, "memory_bytes": None}
+    return {
+        "rows": sum(len(f) for f in frames),
+        "columns": sum(len(f.columns) for f in frames),
+        "memory_bytes": int(sum(f.memory_usage(deep=True).sum() for f in frames)),
+    }
+
+
+def profile_call(name, func, *args, kind="loader"):
+    """
+    Run func(*args) and measure it.
+
+    Args:
+        name: Dataset name
+        func: Loader or builder to run
+        *args: Upstream datasets passed to func
+        kind: "loader" for workbook loaders, "derived" for builders
+
+    Returns:
+        (result, record) where record is a JSON-serializable dict
+    """
+    trace = memory_tracing_enabled()
+    started_tracing = False
+    if trace:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    rss_before = _max_rss_bytes()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    result = func(*args)
+
+    record = {
+        "name": name,
+        "kind": kind,
+        "pid": os.getpid(),
+        "wall_seconds": round(time.perf_counter() - wall_start, 4),
+        "cpu_seconds": round(time.process_time() - cpu_start, 4),
+        "peak_traced_bytes": None,
+        "max_rss_delta_bytes": None,
+    }
+    if trace:
+        record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1] - traced_before
+        if started_tracing:
+            tracemalloc.stop()
+    if rss_before is not None:
+        record["max_rss_delta_bytes"] = _max_rss_bytes() - rss_before
+    record.update(describe_output(result))
+    return result, record
+
+
+class StartupProfiler:
+    """Collects loader records and app-level phase timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.created = datetime.now().isoformat()
+        self.records = []
+        self.phases = []
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def call(self, name, func, *args, kind="loader"):
+        """Run and record func(*args); return its result."""
+        result, record = profile_call(name, func, *args, kind=kind)
+        self.add(record)
+        return result
+
+    @contextmanager
+    def phase(self, name):
+        """Time an app-level startup step."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append(
+                    {
+                        "name": name,
+                        "wall_seconds": round(time.perf_counter() - wall_start, 4),
+                        "cpu_seconds": round(time.process_time() - cpu_start, 4),
+                    }
+                )
+
+    def report(self, settings=None):
+        """Return the report as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "created": self.created,
+                "elapsed_seconds": round(time.perf_counter() - self._started, 4),
+                "settings": settings or {},
+                "phases": list(self.phases),
+                "datasets": list(self.records),
+            }
+
+    def write(self, path=None, settings=None):
+        """
+        Write the report as JSON (default: data/dependencies/startup_profile.json).
+
+        The report is written to a per-process temporary file and swapped in,
+        so workers starting together never leave an interleaved or truncated
+        file.
+        """
+        path = Path(path or REPORT_FILE)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.report(settings), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning("Could not write startup profile to %s: %s", path, e)
+        return path
+
+    def summary(self):
+        """Return a plain-text table of the recorded datasets and phases."""
+        lines = [
+            f"{'dataset':<20} {'kind':<8} {'wall s':>8} {'cpu s':>8} "
+            f"{'rows':>9} {'cols':>5} {'MB':>8}"
+        ]
+        with self._lock:
+            records = list(self.records)
+            phases = list(self.phases)
+        for r in records:
+            rows = "" if r["rows"] is None else f"{r['rows']:,}"
+            cols = "" if r["columns"] is None else r["columns"]
+            mb = "" if r["memory_bytes"] is None else f"{r['memory_bytes'] / 1e6:.2f}"
+            lines.append(
+                f"{r['name']:<20} {r['kind']:<8} {r['wall_seconds']:>8.3f} "
+                f"{r['cpu_seconds']:>8.3f} {rows:>9} {cols:>5} {mb:>8}"
+            )
+        for p in phases:
+            lines.append(f"phase: {p['name']:<30} {p['wall_seconds']:>8.3f}s")
+        return "\n".join(lines)
+
+
+def register_profile_endpoint(server, profiler, settings=None, route=ENDPOINT_ROUTE):
+    """Serve the live profiler report as JSON on the app's Flask server."""
+    from flask import jsonify
+
+    def startup_profile():
+        return jsonify(profiler.report(settings))
+
+    server.add_url_rule(route, "startup_profile", startup_profile)
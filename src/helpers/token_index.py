@@ -0,0 +1,128 @@
+"""
+Inverted token index for comma-separated multi-value columns.
+
+Columns like region, country, city, assigned_climate_zones or
+data_center_type_s_ hold lists such as "North America, Europe". Filtering
+used to run one str.contains scan per selected value, which also matched
+substrings ("US" matched "USA"). Instead, each distinct cell value is split
+into normalized tokens once, and every token maps to a bitmap over the
+distinct values. A filter ORs the bitmaps of the selected tokens (one
+operation per selected value) and looks the result up by each row's value
+code.
+
+Multi-value columns are categorical after optimize_dtypes, and filtered
+subsets share their categories with the full dataset, so the index is
+built once per dataset column and reused by every filter pass on any
+subset. Other columns are factorized per call and indexed on the fly.
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+SEPARATOR = ","
+
+_lock = threading.Lock()
+# id(categories) -> (weakref to categories, TokenIndex)
+_category_indexes = {}
+
+
+def normalize_token(value):
+    """Return the form used to compare tokens (stripped, case-insensitive)."""
+    return str(value).strip().casefold()
+
+
+def split_tokens(value):
+    """Return the normalized tokens of one cell (its list items and the whole value)."""
+    if pd.isna(value):
+        return set()
+    text = str(value)
+    tokens = {normalize_token(part) for part in text.split(SEPARATOR)}
+    tokens.add(normalize_token(text))
+    tokens.discard("")
+    return tokens
+
+
+class TokenIndex:
+    """Maps each token to a bitmap of the distinct values containing it."""
+
+    def __init__(self, values):
+        """
+        Args:
+            values: Distinct cell values (categories or factorized uniques);
+                bit i of a bitmap refers to values[i]
+        """
+        self.size = len(values)
+        positions = {}
+        for code, value in enumerate(values):
+            for token in split_tokens(value):
+                positions.setdefault(token, []).append(code)
+
+        self.bitmaps = {}
+        for token, codes in positions.items():
+            present = np.zeros(self.size, dtype=bool)
+            present[codes] = True
+            self.bitmaps[token] = np.packbits(present, bitorder="little")
+
+    def value_mask(self, selected_values):
+        """Return a boolean array over the distinct values, True where any selected token occurs."""
+        bitmaps = [
+            self.bitmaps[token]
+            for token in {normalize_token(v) for v in selected_values}
+            if token in self.bitmaps
+        ]
+        if not bitmaps:
+            return np.zeros(self.size, dtype=bool)
+        combined = np.bitwise_or.reduce(bitmaps)
+        return np.unpackbits(combined, count=self.size, bitorder="little").astype(bool)
+
+    def row_mask(self, codes, selected_values):
+        """
+        Return a boolean row mask from value codes.
+
+        Args:
+            codes: Per-row positions into the indexed values (-1 for missing)
+            selected_values: Values selected in the filter
+        """
+        # code -1 (missing) picks the trailing False
+        lookup = np.append(self.value_mask(selected_values), False)
+        return lookup[codes]
+
+
+def _category_index(categories):
+    key = id(categories)
+    with _lock:
+        entry = _category_indexes.get(key)
+        if entry is not None and entry[0]() is categories:
+            return entry[1]
+
+    index = TokenIndex(categories)
+    with _lock:
+        _category_indexes[key] = (
+            weakref.ref(categories, lambda _, key=key: _category_indexes.pop(key, None)),
+            index,
+        )
+    return index
+
+
+def multi_value_mask(series, selected_values):
+    """
+    Return a boolean array, True for rows holding any of the selected values.
+
+    Values match whole list items, case-insensitively; "US" does not match
+    "USA".
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        index = _category_index(series.cat.categories)
+        return index.row_mask(series.cat.codes.to_numpy(), selected_values)
+    codes, uniques = pd.factorize(series)
+    return TokenIndex(uniques).row_mask(codes, selected_values)
+
+
+def apply_multi_value_filter(df, column, selected_values):
+    """Keep the rows whose multi-value column holds any of the selected values."""
+    if not selected_values:
+        return df
+    return df[multi_value_mask(df[column], selected_values)]
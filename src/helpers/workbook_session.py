@@ -0,0 +1,85 @@
+"""
+Workbook session that opens each Excel workbook once per process.
+
+Several loaders read sheets from the same workbook (modules.xlsx in particular),
+and some sheets are read by more than one loader. The session keeps one open
+pd.ExcelFile per workbook and memoizes each parsed sheet, so a workbook is
+decompressed once and each sheet parsed once. Entries for a workbook are dropped
+automatically when its modification time changes.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+
+class WorkbookSession:
+    """Memoizing reader for Excel workbooks and their sheets."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._workbooks = {}  # path -> (mtime, pd.ExcelFile)
+        self._sheets = {}  # (path, sheet_name, read options) -> raw DataFrame
+
+    def _get_workbook(self, path):
+        mtime = os.path.getmtime(path)
+        cached = self._workbooks.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        # workbook is new or has changed on disk
+        self.invalidate(path)
+        workbook = pd.ExcelFile(path)
+        self._workbooks[path] = (mtime, workbook)
+        return workbook
+
+    def read_excel(self, path, sheet_name, **kwargs):
+        """
+        Read a sheet, parsing it only on first use.
+
+        Args:
+            path: Path to the workbook
+            sheet_name: Name of the sheet to read
+            **kwargs: Options passed to pd.ExcelFile.parse (skiprows, index_col, ...)
+
+        Returns:
+            A copy of the parsed sheet, so callers are free to modify it
+        """
+        path = str(Path(path).resolve())
+        key = (path, sheet_name, tuple(sorted(kwargs.items())))
+        with self._lock:
+            workbook = self._get_workbook(path)
+            if key not in self._sheets:
+                self._sheets[key] = workbook.parse(sheet_name, **kwargs)
+            return self._sheets[key].copy()
+
+    def invalidate(self, path=None):
+        """Drop cached sheets for one workbook, or for all workbooks if path is None."""
+        with self._lock:
+            if path is None:
+                paths = list(self._workbooks)
+            else:
+                paths = [str(Path(path).resolve())]
+            for p in paths:
+                cached = self._workbooks.pop(p, None)
+                if cached is not None:
+                    cached[1].close()
+            self._sheets = {
+                key: df for key, df in self._sheets.items() if key[0] not in paths
+            }
+
+
+# Session shared by all loaders in this process
+_session = WorkbookSession()
+
+
+def read_excel(path, sheet_name, **kwargs):
+    """Read a sheet through the process-wide workbook session."""
+    return _session.read_excel(path, sheet_name, **kwargs)
+
+
+def get_workbook_session():
+    """Return the process-wide workbook session."""
+    return _session
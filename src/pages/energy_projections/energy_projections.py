@@ -264,6 +264,8 @@ def create_energy_projections_page(app, energy_projections_df):
                     dbc.Container(                                            [
                             # Single chart container is updated by callback
                             html.Div(id="chart-container"),
+                            # Highlight state of the chart's traces, for restyle patches
+                            dcc.Store(id="energy-projections-highlight-store"),
                         ],
                         fluid=True,
                     ),